@@ -0,0 +1,6 @@
+"""
+Shared helpers for the strategies in this repository.
+
+Strategies stay self-contained freqtrade strategy files - this package only holds
+data preparation, indicator kernels and tooling they (or their users) can opt into.
+"""
@@ -0,0 +1,428 @@
+"""
+Static checker for pandas performance anti-patterns in strategy files.
+
+Parses every strategy file (nothing is imported or run) and flags:
+
+* ``iterrows()`` / ``itertuples()`` / ``apply(axis=1)`` / ``rolling().apply()``: Python loops
+  over candles, and plain ``for i in range(len(...))`` loops over arrays
+* ``.iat`` / ``.at`` / scalar ``.loc`` / ``.iloc`` access inside loops over candles
+* growing slices (``df.iloc[:i]``) inside loops over candles: O(n²)
+* chained assignment (``df['x'].iat[i] = v``): writes to a temporary under Copy-on-Write
+* ``.copy()`` inside loops, directly or through a called function of the same file
+* columns inserted one at a time inside loops, directly or through a called function, or
+  more than ``MAX_INSERTS`` of them in one function: fragments the dataframe's blocks
+* ``dp.get_analyzed_dataframe`` in callbacks running per trade and candle, repeated calls
+* whole-series normalisation (``(x - x.min()) / (x.max() - x.min())``, scalers'
+  ``fit_transform``): a full pass per call, and a lookahead bias
+
+Every hit has a severity and a cost class. Files are ranked by the summed severity of their
+hits, which orders the strategies to port to vectorised kernels first.
+
+Usage::
+
+    python -m freqtrade_strategies.antipatterns
+    python -m freqtrade_strategies.antipatterns user_data/strategies/futures --min-severity medium
+"""
+import argparse
+import ast
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+SEVERITIES = {'low': 1, 'medium': 2, 'high': 3}
+# rule: (severity, cost class, explanation)
+RULES: Dict[str, Tuple[str, str, str]] = {
+    'iterrows': ('high', 'O(n) Python loop', 'iterrows() builds a Series per candle'),
+    'itertuples': ('medium', 'O(n) Python loop', 'itertuples() loops over candles in Python'),
+    'apply-rows': ('high', 'O(n) Python loop', 'apply(axis=1) calls Python per candle'),
+    'rolling-apply': ('high', 'O(n·w) Python loop', 'rolling().apply() calls Python per window'),
+    'candle-loop': ('medium', 'O(n) Python loop', 'Python loop over candles on arrays'),
+    'scalar-access': ('high', 'O(n) Python loop',
+                      'scalar .iat/.at/.loc/.iloc access per candle in a Python loop'),
+    'growing-slice': ('high', 'O(n²)', 'slice from the start up to the loop index per candle'),
+    'chained-assignment': ('high', 'wrong result',
+                           'chained assignment writes to a temporary under Copy-on-Write'),
+    'copy-in-loop': ('medium', 'copy per iteration', '.copy() inside a loop'),
+    'copying-call-in-loop': ('medium', 'copy per iteration',
+                             'calls a function copying its dataframe inside a loop'),
+    'column-insert-in-loop': ('medium', 'fragmentation',
+                              'inserts dataframe columns one at a time inside a loop'),
+    'column-inserts': ('low', 'fragmentation', 'inserts many dataframe columns one at a time'),
+    'analyzed-dataframe': ('low', 'per call',
+                           'get_analyzed_dataframe in a callback run per trade and candle'),
+    'repeated-analyzed-dataframe': ('medium', 'per call',
+                                    'get_analyzed_dataframe called repeatedly in one callback'),
+    'whole-series-normalisation': ('high', 'O(n) per call, lookahead',
+                                   'normalises with statistics of the whole series'),
+}
+# Callbacks freqtrade calls per open trade or entry candidate and candle.
+CALLBACKS = {'custom_stoploss', 'custom_exit', 'custom_sell', 'custom_stake_amount', 'leverage',
+             'adjust_trade_position', 'custom_entry_price', 'custom_exit_price',
+             'confirm_trade_entry', 'confirm_trade_exit', 'check_entry_timeout',
+             'check_exit_timeout', 'order_filled', 'adjust_entry_price', 'custom_roi'}
+_SCALAR_ACCESSORS = {'iat', 'at'}
+_LABEL_ACCESSORS = {'loc', 'iloc'}
+_WINDOWS = {'rolling', 'expanding', 'ewm', 'groupby', 'resample'}
+_STATISTICS = {'min', 'max', 'mean', 'std'}
+# Column insertions per function before they are reported as fragmenting.
+MAX_INSERTS = 15
+_LENGTH_NAMES = {'length', 'size', 'n', 'candles', 'rows'}
+
+
+@dataclass
+class Hit:
+    file: str
+    line: int
+    rule: str
+    function: str = ''
+    detail: str = ''
+
+    @property
+    def severity(self) -> str:
+        return RULES[self.rule][0]
+
+    @property
+    def cost(self) -> str:
+        return RULES[self.rule][1]
+
+    @property
+    def message(self) -> str:
+        return RULES[self.rule][2] + (f' ({self.detail})' if self.detail else '')
+
+
+def _names(node: ast.AST) -> Set[str]:
+    return {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+
+
+def _calls_attribute(node: ast.AST, attribute: str) -> bool:
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and node.func.attr == attribute)
+
+
+def _over_candles(loop: ast.AST) -> bool:
+    """Whether ``loop`` iterates over the candles: ``range(..len(df)..)``, iterrows, while."""
+    if isinstance(loop, ast.While):
+        return True
+    iterator = getattr(loop, 'iter', None)
+    if iterator is None:
+        return False
+    return any((isinstance(node, ast.Call) and (
+        (isinstance(node.func, ast.Name) and node.func.id == 'len')
+        or (isinstance(node.func, ast.Attribute)
+            and node.func.attr in ('iterrows', 'itertuples', 'index'))))
+        # range(period, length) with the length computed beforehand
+        or (isinstance(node, ast.Name) and node.id.lower() in _LENGTH_NAMES)
+        for node in ast.walk(iterator))
+
+
+def _whole_series_statistic(node: ast.AST) -> bool:
+    """``x.min()`` (``max``, ``mean``, ``std``) without arguments, not of a window."""
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and node.func.attr in _STATISTICS and not node.args and not node.keywords):
+        return False
+    receiver = node.func.value
+    return not any(_calls_attribute(child, window) for child in ast.walk(receiver)
+                   for window in _WINDOWS)
+
+
+def _column_key(key: ast.AST, loop_names: Set[str]) -> bool:
+    """Whether ``df[key] = ...`` sets a column: a string key, not an element ``array[i]``."""
+    if isinstance(key, (ast.Slice, ast.Tuple)):
+        return False
+    if any(isinstance(node, ast.JoinedStr)
+           or (isinstance(node, ast.Constant) and isinstance(node.value, str))
+           for node in ast.walk(key)):
+        return True
+    return not _names(key) & loop_names and not isinstance(key, (ast.BinOp, ast.UnaryOp,
+                                                                  ast.Constant))
+
+
+def _called_function(node: ast.Call) -> Optional[str]:
+    """Name of the function or ``self`` method called by ``node``."""
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+            and func.value.id == 'self'):
+        return func.attr
+    return None
+
+
+class _FunctionFacts(ast.NodeVisitor):
+    """Whether a function copies a dataframe and how many columns it inserts."""
+
+    def __init__(self) -> None:
+        self.copies = False
+        self.inserts = 0
+        self.calls: List[str] = []
+        self.loop_names: Set[str] = set()
+
+    def visit_For(self, node: ast.For) -> None:
+        self.loop_names |= _names(node.target)
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if _calls_attribute(node, 'copy'):
+            self.copies = True
+        name = _called_function(node)
+        if name:
+            self.calls.append(name)
+        self.generic_visit(node)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        for target in node.targets:
+            if (isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name)
+                    and _column_key(target.slice, self.loop_names)):
+                self.inserts += 1
+        self.generic_visit(node)
+
+
+class _Checker(ast.NodeVisitor):
+
+    def __init__(self, filename: str, facts: Dict[str, _FunctionFacts]) -> None:
+        self.filename = filename
+        self.facts = facts
+        self.hits: List[Hit] = []
+        self.loops: List[ast.AST] = []
+        self.loop_targets: List[Set[str]] = []
+        self.function = ''
+        self._reported: Set[Tuple[int, str]] = set()
+        self._analyzed_calls: Dict[str, List[int]] = defaultdict(list)
+        # Column insertions of the current function, including those of called functions.
+        self._inserts: List[int] = []
+
+    def _hit(self, node: ast.AST, rule: str, detail: str = '', once_per_loop: bool = False):
+        anchor = self.loops[-1] if once_per_loop and self.loops else node
+        key = (anchor.lineno, rule)
+        if key in self._reported:
+            return
+        self._reported.add(key)
+        self.hits.append(Hit(self.filename, anchor.lineno, rule, self.function, detail))
+
+    @property
+    def _in_candle_loop(self) -> bool:
+        return any(_over_candles(loop) for loop in self.loops)
+
+    def _visit_loop(self, node: ast.AST, iterators: Iterable[ast.AST], targets: Set[str],
+                    body: Iterable[ast.AST]) -> None:
+        for iterator in iterators:
+            self.visit(iterator)
+        self.loops.append(node)
+        self.loop_targets.append(targets)
+        for child in body:
+            self.visit(child)
+        self.loops.pop()
+        self.loop_targets.pop()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        outer, self.function = self.function, node.name
+        loops, targets = self.loops, self.loop_targets
+        # Loops around a definition do not run its body.
+        self.loops, self.loop_targets = [], []
+        self._inserts.append(0)
+        self.generic_visit(node)
+        inserts = self._inserts.pop()
+        if inserts > MAX_INSERTS:
+            self._hit(node, 'column-inserts', f'{inserts} columns')
+        self.loops, self.loop_targets = loops, targets
+        self.function = outer
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_For(self, node: ast.For) -> None:
+        hits = len(self.hits)
+        self._visit_loop(node, [node.iter], _names(node.target), node.body + node.orelse)
+        # Loops over candles without dataframe access still run per candle in Python.
+        if _over_candles(node) and not any(
+                hit.line == node.lineno and RULES[hit.rule][1] == RULES['candle-loop'][1]
+                for hit in self.hits[hits:]) and not _calls_attribute(node.iter, 'iterrows'):
+            self._hit(node, 'candle-loop')
+
+    def visit_While(self, node: ast.While) -> None:
+        self._visit_loop(node, [], set(), [node.test] + node.body + node.orelse)
+
+    def _visit_comprehension(self, node) -> None:
+        targets = set().union(*(_names(generator.target) for generator in node.generators))
+        elements = [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+        conditions = [condition for generator in node.generators for condition in generator.ifs]
+        self._visit_loop(node, [generator.iter for generator in node.generators], targets,
+                         conditions + elements)
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _visit_comprehension
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            if func.attr in ('iterrows', 'itertuples'):
+                self._hit(node, func.attr)
+            elif func.attr == 'apply':
+                if any(_calls_attribute(func.value, window) for window in _WINDOWS - {'groupby'}):
+                    self._hit(node, 'rolling-apply')
+                elif any(keyword.arg == 'axis' and isinstance(keyword.value, ast.Constant)
+                         and keyword.value.value in (1, 'columns') for keyword in node.keywords):
+                    self._hit(node, 'apply-rows')
+            elif func.attr == 'copy' and self.loops:
+                self._hit(node, 'copy-in-loop')
+            elif func.attr == 'fit_transform':
+                self._hit(node, 'whole-series-normalisation', 'scaler fitted on the whole series')
+            elif func.attr == 'get_analyzed_dataframe' and self.function in CALLBACKS:
+                self._analyzed_calls[self.function].append(node.lineno)
+        self._check_called_function(node)
+        self.generic_visit(node)
+
+    def _check_called_function(self, node: ast.Call) -> None:
+        name = _called_function(node)
+        facts = self.facts.get(name)
+        if facts is None or name == self.function:
+            return
+        if self._inserts:
+            self._inserts[-1] += facts.inserts
+        if not self.loops:
+            return
+        if facts.copies:
+            self._hit(node, 'copying-call-in-loop', f'{name}()', once_per_loop=True)
+        if facts.inserts:
+            self._hit(node, 'column-insert-in-loop', f'through {name}()', once_per_loop=True)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        value = node.value
+        if self.loops and isinstance(value, ast.Attribute):
+            loop_names = set().union(*self.loop_targets)
+            index = node.slice
+            if value.attr in _SCALAR_ACCESSORS and self._in_candle_loop:
+                self._hit(node, 'scalar-access', f'.{value.attr}', once_per_loop=True)
+            elif (value.attr in _LABEL_ACCESSORS and self._in_candle_loop
+                  and not isinstance(index, ast.Slice) and _names(index) & loop_names
+                  and not any(isinstance(child, ast.Compare) for child in ast.walk(index))):
+                self._hit(node, 'scalar-access', f'.{value.attr}', once_per_loop=True)
+        if (self.loops and self._in_candle_loop and isinstance(node.slice, ast.Slice)
+                and node.slice.lower is None and node.slice.upper is not None
+                and _names(node.slice.upper) & set().union(*self.loop_targets)):
+            self._hit(node, 'growing-slice')
+        self.generic_visit(node)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        for target in node.targets:
+            if not isinstance(target, ast.Subscript):
+                continue
+            accessor = target.value
+            if (isinstance(accessor, ast.Attribute)
+                    and accessor.attr in _SCALAR_ACCESSORS | _LABEL_ACCESSORS
+                    and isinstance(accessor.value, ast.Subscript)):
+                self._hit(target, 'chained-assignment', f'.{accessor.attr}', once_per_loop=True)
+            elif (isinstance(accessor, ast.Name)
+                  and _column_key(target.slice, set().union(*self.loop_targets))):
+                if self._inserts:
+                    self._inserts[-1] += 1
+                if self.loops:
+                    self._hit(target, 'column-insert-in-loop', once_per_loop=True)
+        self.generic_visit(node)
+
+    def visit_BinOp(self, node: ast.BinOp) -> None:
+        if isinstance(node.op, ast.Div):
+            numerator = any(_whole_series_statistic(child) for child in ast.walk(node.left))
+            denominator = any(_whole_series_statistic(child) for child in ast.walk(node.right))
+            if numerator and denominator:
+                self._hit(node, 'whole-series-normalisation')
+        self.generic_visit(node)
+
+    def finish(self) -> List[Hit]:
+        for function, lines in self._analyzed_calls.items():
+            rule = 'repeated-analyzed-dataframe' if len(lines) > 1 else 'analyzed-dataframe'
+            self.hits.append(Hit(self.filename, lines[0], rule, function,
+                                 f'{len(lines)} calls' if len(lines) > 1 else ''))
+        return sorted(self.hits, key=lambda hit: hit.line)
+
+
+def _propagate(facts: Dict[str, _FunctionFacts]) -> None:
+    """Add the copies and insertions of called functions to their callers."""
+    totals: Dict[str, Tuple[bool, int]] = {}
+
+    def total(name: str, active: Set[str]) -> Tuple[bool, int]:
+        if name in totals:
+            return totals[name]
+        function = facts[name]
+        copies, inserts = function.copies, function.inserts
+        for callee in function.calls:
+            if callee in facts and callee not in active:
+                callee_copies, callee_inserts = total(callee, active | {callee})
+                copies, inserts = copies or callee_copies, inserts + callee_inserts
+        totals[name] = copies, inserts
+        return totals[name]
+
+    for name in facts:
+        total(name, {name})
+    for name, (copies, inserts) in totals.items():
+        facts[name].copies, facts[name].inserts = copies, inserts
+
+
+def check_source(source: str, filename: str = '<string>') -> List[Hit]:
+    """Anti-pattern hits of one python source."""
+    tree = ast.parse(source, filename)
+    facts: Dict[str, _FunctionFacts] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            function = _FunctionFacts()
+            function.visit(node)
+            facts[node.name] = function
+    _propagate(facts)
+    checker = _Checker(filename, facts)
+    checker.visit(tree)
+    return checker.finish()
+
+
+def check_paths(paths: Iterable[Path]) -> List[Hit]:
+    """Anti-pattern hits of the python files in ``paths`` (files or directories)."""
+    hits = []
+    for path in paths:
+        path = Path(path)
+        for filename in sorted(path.rglob('*.py')) if path.is_dir() else [path]:
+            try:
+                hits.extend(check_source(filename.read_text(encoding='utf-8'), str(filename)))
+            except SyntaxError as e:
+                logger.warning(f'Cannot parse {filename}: {e}')
+    return hits
+
+
+def rank_files(hits: List[Hit]) -> List[Tuple[str, int, List[Hit]]]:
+    """(file, score, hits) ordered by the summed severity of their hits, worst first."""
+    by_file: Dict[str, List[Hit]] = defaultdict(list)
+    for hit in hits:
+        by_file[hit.file].append(hit)
+    ranked = [(filename, sum(SEVERITIES[hit.severity] for hit in file_hits),
+               sorted(file_hits, key=lambda hit: (-SEVERITIES[hit.severity], hit.line)))
+              for filename, file_hits in by_file.items()]
+    return sorted(ranked, key=lambda item: (-item[1], item[0]))
+
+
+def format_ranking(ranked: List[Tuple[str, int, List[Hit]]], min_severity: str = 'low') -> str:
+    lines = []
+    for filename, score, hits in ranked:
+        shown = [hit for hit in hits if SEVERITIES[hit.severity] >= SEVERITIES[min_severity]]
+        if not shown:
+            continue
+        lines.append(f'{score:>4}  {filename}')
+        for hit in shown:
+            where = f'{hit.line}' + (f' {hit.function}()' if hit.function else '')
+            lines.append(f'      {hit.severity:<6} {hit.cost:<26} {where:<32} {hit.message}')
+    return '\n'.join(lines)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Rank strategies by the pandas performance anti-patterns they contain.')
+    parser.add_argument('paths', nargs='*', type=Path, default=[Path('user_data/strategies')])
+    parser.add_argument('--min-severity', choices=list(SEVERITIES), default='low')
+    parsed = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    print(format_ranking(rank_files(check_paths(parsed.paths)), parsed.min_severity))
+
+
+if __name__ == '__main__':
+    main()
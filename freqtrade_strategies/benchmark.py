@@ -0,0 +1,291 @@
+"""
+Performance benchmark of every strategy under ``user_data/strategies``.
+
+Each ``IStrategy`` subclass runs ``populate_indicators``, ``populate_entry_trend`` and
+``populate_exit_trend`` (through freqtrade's ``advise_*`` wrappers, so ``@informative``
+pairs are included) on one futures pair at several history lengths. Candles come from the
+bundled 5m / 1h futures data at the strategy's timeframe and are chained synthetically
+beyond the real history. Every case runs in a spawned process, which isolates its peak
+memory and lets a timeout stop quadratic indicators. (A forked child would inherit the
+parent's ``ru_maxrss`` and share its pages - the candle cache among them.)
+
+Results are written as JSON; with ``--baseline`` they are compared against an earlier run
+and regressions beyond ``--threshold`` are reported (exit code 1).
+
+Usage::
+
+    python -m freqtrade_strategies.benchmark --output user_data/benchmarks/baseline.json
+    python -m freqtrade_strategies.benchmark --baseline user_data/benchmarks/baseline.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import sys
+import time
+import traceback
+import warnings
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from freqtrade.exchange import timeframe_to_seconds
+
+from freqtrade_strategies.offline import (discover_strategies, load_candles, load_strategy,
+                                          offline_config, quiet_stdout)
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+STAGES = ('populate_indicators', 'populate_entry_trend', 'populate_exit_trend')
+
+
+def extend_candles(candles: DataFrame, timeframe: str, length: int) -> DataFrame:
+    """
+    ``length`` candles: the last ``length`` real candles, or - if there are fewer - the real
+    candles repeated back to back, each copy rescaled to continue from the previous close.
+    Dates continue on the ``timeframe`` grid and end at the last real candle.
+    """
+    if len(candles) >= length:
+        return candles.iloc[-length:].reset_index(drop=True)
+    values = candles[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=float)
+    copies = -(-length // len(values))
+    # Scale every copy so its first open equals the previous copy's last close.
+    step = values[-1, 3] / values[0, 0]
+    scale = step ** np.arange(copies)
+    prices = np.concatenate([values[:, :4] * factor for factor in scale])[-length:]
+    volume = np.tile(values[:, 4], copies)[-length:]
+    # Rebase so the series ends at the real last close.
+    prices *= values[-1, 3] / prices[-1, 3]
+    end = candles['date'].iloc[-1]
+    dates = pd.date_range(end=end, periods=length, freq=pd.Timedelta(
+        seconds=timeframe_to_seconds(timeframe)))
+    result = DataFrame(prices, columns=['open', 'high', 'low', 'close'])
+    result['volume'] = volume
+    result.insert(0, 'date', dates)
+    return result
+
+
+def _current_rss_kb() -> int:
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _peak_rss_kb() -> int:
+    # VmHWM starts over with the process image, ru_maxrss is kept across fork and exec.
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes.
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _run_case(filename: Path, class_name: str, candles: DataFrame, config: Dict[str, Any],
+              pair: str, repeats: int, results) -> None:
+    """Child process: time the three populate stages on ``candles``."""
+    result: Dict[str, Any] = {}
+    # Deprecation warnings would flood the output.
+    warnings.simplefilter('ignore')
+    with quiet_stdout():
+        try:
+            strategy = load_strategy(filename, class_name, config)
+            metadata = {'pair': pair}
+
+            rss_start = _current_rss_kb()
+            timings = {stage: [] for stage in STAGES}
+            for _ in range(repeats):
+                df = candles.copy()
+                start = time.perf_counter()
+                df = strategy.advise_indicators(df, metadata)
+                indicators = time.perf_counter()
+                df = strategy.advise_entry(df, metadata)
+                entry = time.perf_counter()
+                df = strategy.advise_exit(df, metadata)
+                end = time.perf_counter()
+                for stage, seconds in zip(STAGES, (indicators - start, entry - indicators,
+                                                   end - entry)):
+                    timings[stage].append(seconds)
+
+            result.update({stage: min(values) for stage, values in timings.items()})
+            result['total'] = sum(result[stage] for stage in STAGES)
+            result['peak_rss_mb'] = round(_peak_rss_kb() / 1024, 1)
+            result['rss_growth_mb'] = round(max(_peak_rss_kb() - rss_start, 0) / 1024, 1)
+            result['columns'] = len(df.columns)
+            result['added_columns'] = len(df.columns) - len(candles.columns)
+            result['status'] = 'ok'
+        except Exception as e:
+            result = {'status': 'error', 'error': f'{e.__class__.__name__}: {e}',
+                      'traceback': traceback.format_exc(limit=-3)}
+    results.put(result)
+
+
+def _wait_for_result(process, results, timeout: float, poll: float = 1.0) -> Dict[str, Any]:
+    """
+    Result of a case, or a ``timeout`` / ``crashed`` record. A child that died is reported
+    right away instead of after the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return results.get(timeout=min(poll, max(deadline - time.monotonic(), 0.01)))
+        except queue.Empty:
+            if not process.is_alive():
+                # The result may have been flushed just before the child exited.
+                try:
+                    return results.get(timeout=poll)
+                except queue.Empty:
+                    return {'status': 'crashed',
+                            'error': f'Process exited with code {process.exitcode}'}
+    process.terminate()
+    return {'status': 'timeout', 'error': f'No result after {timeout}s'}
+
+
+def run_benchmark(strategy_dir: Path, datadir: Path, pair: str = 'BTC/USDT:USDT',
+                  sizes: Sequence[int] = DEFAULT_SIZES, timeout: float = 300,
+                  strategies: Optional[Sequence[str]] = None,
+                  user_data_dir: Path = Path('user_data'),
+                  default_timeframe: str = '5m') -> List[Dict[str, Any]]:
+    """
+    Benchmark every strategy below ``strategy_dir`` at every size.
+    :param strategies: Only benchmark these class names
+    :param default_timeframe: Timeframe of strategies that do not define one
+    :param timeout: Seconds per case before it is stopped and reported as ``timeout``
+    :return: One record per (strategy, size)
+    """
+    config = offline_config(datadir, pair, user_data_dir)
+    context = multiprocessing.get_context('spawn')
+    candle_cache: Dict[str, Tuple[DataFrame, str]] = {}
+    results = []
+    for filename, class_name in discover_strategies(strategy_dir):
+        if strategies and class_name not in strategies:
+            continue
+        # Strategies without a timeframe take it from the config, like in freqtrade.
+        timeframe = getattr(getattr(sys.modules[filename.stem], class_name), 'timeframe',
+                            None) or default_timeframe
+        if timeframe not in candle_cache:
+            candle_cache[timeframe] = load_candles(datadir, pair, timeframe)
+        candles, data_timeframe = candle_cache[timeframe]
+
+        for size in sizes:
+            record = {'strategy': class_name, 'file': str(filename), 'timeframe': timeframe,
+                      'data_timeframe': data_timeframe, 'candles': size,
+                      'synthetic': size > len(candles)}
+            # Small sizes are cheap - take the best of several runs to cut noise.
+            repeats = 5 if size <= 1_000 else 3 if size <= 10_000 else 1
+            results_queue = context.Queue()
+            process = context.Process(target=_run_case, args=(
+                filename, class_name, extend_candles(candles, data_timeframe, size),
+                {**config, 'timeframe': timeframe}, pair, repeats, results_queue))
+            process.start()
+            record.update(_wait_for_result(process, results_queue, timeout))
+            process.join()
+            results.append(record)
+            logger.info(_format_record(record))
+            if record['status'] != 'ok':
+                # Larger sizes will not do better.
+                break
+    return results
+
+
+def _format_record(record: Dict[str, Any]) -> str:
+    label = f"{record['strategy']:<36} {record['candles']:>7}"
+    if record['status'] != 'ok':
+        return f"{label}  {record['status'].upper()}: {record.get('error', '')}"
+    return (f"{label}  {record['total'] * 1000:9.1f} ms  "
+            f"(ind {record['populate_indicators'] * 1000:.1f}, "
+            f"entry {record['populate_entry_trend'] * 1000:.1f}, "
+            f"exit {record['populate_exit_trend'] * 1000:.1f})  "
+            f"+{record['rss_growth_mb']:.0f} MB  {record['columns']} cols")
+
+
+def compare_to_baseline(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                        threshold: float = 0.25, min_seconds: float = 0.005,
+                        min_mb: float = 16) -> List[str]:
+    """
+    Regressions of ``results`` against ``baseline``.
+    A case regresses when it no longer finishes, or when its total time or memory growth
+    exceed the baseline by more than ``threshold`` (relative) and ``min_seconds`` /
+    ``min_mb`` (absolute - tiny values are noise).
+    :return: One message per regression
+    """
+    previous = {(record['strategy'], record['candles']): record for record in baseline}
+    regressions = []
+    for record in results:
+        before = previous.get((record['strategy'], record['candles']))
+        if before is None or before['status'] != 'ok':
+            continue
+        label = f"{record['strategy']} @ {record['candles']} candles"
+        if record['status'] != 'ok':
+            regressions.append(f"{label}: {record['status']} (was ok)")
+            continue
+        for key, unit, scale, minimum in (('total', 'ms', 1000, min_seconds),
+                                          ('rss_growth_mb', 'MB', 1, min_mb)):
+            now, then = record[key], before[key]
+            if now > then * (1 + threshold) and now - then > minimum:
+                regressions.append(f'{label}: {key} {then * scale:.1f} -> {now * scale:.1f} '
+                                   f'{unit} (+{(now / then - 1) * 100 if then else 100:.0f}%)')
+        if record['columns'] != before['columns']:
+            regressions.append(f"{label}: columns {before['columns']} -> {record['columns']}")
+    return regressions
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Benchmark the populate methods of all strategies.')
+    parser.add_argument('--strategy-dir', type=Path, default=Path('user_data/strategies'))
+    parser.add_argument('--datadir', type=Path, default=Path('user_data/data/gateio/futures'))
+    parser.add_argument('--pair', default='BTC/USDT:USDT')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--strategies', nargs='+', help='Class names to benchmark. Default: all.')
+    parser.add_argument('--timeout', type=float, default=300, help='Seconds per case.')
+    parser.add_argument('--output', type=Path, help='Write the results to this JSON file.')
+    parser.add_argument('--baseline', type=Path, help='Compare against this earlier output.')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Relative slowdown counted as regression (default: 0.25).')
+    parsed = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    # Strategies log a lot while computing - keep the benchmark output readable.
+    logging.getLogger('freqtrade').setLevel(logging.WARNING)
+    results = run_benchmark(parsed.strategy_dir, parsed.datadir, parsed.pair, parsed.sizes,
+                            parsed.timeout, parsed.strategies)
+
+    if parsed.output:
+        parsed.output.parent.mkdir(parents=True, exist_ok=True)
+        parsed.output.write_text(json.dumps({
+            'created': datetime.now(UTC).isoformat(timespec='seconds'),
+            'machine': platform.node(), 'python': platform.python_version(),
+            'pandas': pd.__version__, 'numpy': np.__version__,
+            'pair': parsed.pair, 'results': results,
+        }, indent=2))
+        logger.info(f'Results written to {parsed.output}.')
+
+    if parsed.baseline:
+        baseline = json.loads(parsed.baseline.read_text())['results']
+        regressions = compare_to_baseline(results, baseline, parsed.threshold)
+        for message in regressions:
+            logger.warning(f'REGRESSION {message}')
+        if regressions:
+            sys.exit(1)
+        logger.info(f'No regressions against {parsed.baseline}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,430 @@
+"""
+Column memory audit and dtype compaction of analysed dataframes.
+
+Strategies keep every intermediate column of ``populate_*`` in the analysed dataframe, which
+freqtrade holds for every pair: ``"up"`` / ``"down"`` object columns (``FSupertrendStrategy``),
+a float64 column per gene (``DevilStra``), 0/1 flags as int64. ``audit_columns`` reports
+the memory of each column and compacts it:
+
+* string columns with at most 127 values -> ``category`` (int8 codes, compares like strings)
+* object columns holding only booleans -> ``bool``, -1/0/1 integer flags -> ``int8``
+* float64 -> float32 for columns neither the signals nor the callbacks read, where every
+  value fits the float32 range
+* scratch columns nobody reads afterwards are dropped
+
+Candle and signal columns are never touched. ``ColumnCompactionMixin`` applies this after
+``populate_indicators`` (keeping the columns ``populate_entry_trend`` / ``populate_exit_trend``
+read, recorded by running them once) and after ``populate_exit_trend`` (keeping the columns
+the strategy's callbacks and ``plot_config`` name). Columns the signals or callbacks read stay
+float64: rounding them to float32 flips comparisons near a threshold on some pairs and not on
+others, which no check on one pair can rule out. The remaining conversions are lossless;
+they are verified on the first pair (the signals of the compacted dataframe must equal those
+of the original one), else compaction is switched off.
+
+Usage::
+
+    python -m freqtrade_strategies.columns DevilStra --strategy-dir user_data/strategies
+
+or in the config of a strategy using ``ColumnCompactionMixin``::
+
+    "column_compaction": {"enabled": true, "compact": true, "float32": true, "keep": []}
+
+Compaction is off unless the config enables it.
+
+With ``compact`` false only the audit of the first pair is logged. Column names built at
+runtime in callbacks (``last_candle[f'rsi_{period}']``) cannot be found statically - list
+them in ``keep``.
+"""
+import argparse
+import ast
+import inspect
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from freqtrade.strategy import IStrategy
+
+
+logger = logging.getLogger(__name__)
+
+CANDLE_COLUMNS = ('date', 'open', 'high', 'low', 'close', 'volume')
+SIGNAL_COLUMNS = ('enter_long', 'enter_short', 'exit_long', 'exit_short', 'enter_tag',
+                  'exit_tag')
+POPULATE_METHODS = ('populate_indicators', 'populate_entry_trend', 'populate_exit_trend')
+# Categories beyond this no longer fit int8 codes.
+MAX_CATEGORIES = 127
+
+
+@dataclass
+class ColumnAudit:
+    column: str
+    dtype: str
+    nbytes: int
+    action: str = 'keep'
+    compact_dtype: str = ''
+    compact_nbytes: int = 0
+
+
+def _column_bytes(series: pd.Series) -> int:
+    return int(series.memory_usage(index=False, deep=True))
+
+
+def _compact_series(series: pd.Series, float32: bool) -> Optional[pd.Series]:
+    """Smaller version of ``series``, None if none. Only float32 is lossy."""
+    dtype = series.dtype
+    if dtype == np.float64:
+        if not float32:
+            return None
+        values = series.to_numpy()
+        with np.errstate(over='ignore'):
+            compact = values.astype(np.float32)
+        # Values beyond the float32 range would become infinite.
+        if not np.array_equal(np.isfinite(compact), np.isfinite(values)):
+            return None
+        return pd.Series(compact, index=series.index, name=series.name)
+    if pd.api.types.is_integer_dtype(dtype) and dtype != np.int8:
+        if len(series) and series.min() >= -1 and series.max() <= 1:
+            return series.astype(np.int8)
+        return None
+    if dtype == object or pd.api.types.is_string_dtype(dtype):
+        kind = pd.api.types.infer_dtype(series, skipna=True)
+        if kind == 'boolean' and not series.isna().any():
+            return series.astype(bool)
+        if kind == 'integer' and series.min() >= -1 and series.max() <= 1:
+            return series.astype(np.int8)
+        if kind == 'string' and series.nunique() <= MAX_CATEGORIES:
+            return series.astype('category')
+    return None
+
+
+def audit_columns(dataframe: DataFrame, keep: Optional[Set[str]] = None,
+                  protect: Iterable[str] = (), no_float32: Iterable[str] = (),
+                  float32: bool = True,
+                  compact: bool = True) -> Tuple[List[ColumnAudit], DataFrame]:
+    """
+    Audit (and compact) every column of ``dataframe``.
+    :param keep: Columns to keep - all others are dropped. None keeps every column
+    :param protect: Columns left untouched
+    :param no_float32: Columns kept at float64 - every column anything reads later
+    :param compact: Return the compacted dataframe - else ``dataframe`` itself
+    :return: Tuple of (audit per column, compacted dataframe)
+    """
+    protect = set(protect) | set(CANDLE_COLUMNS) | set(SIGNAL_COLUMNS)
+    no_float32 = set(no_float32)
+    audits = []
+    replaced: Dict[str, pd.Series] = {}
+    dropped = []
+    for column in dataframe.columns:
+        series = dataframe[column]
+        audit = ColumnAudit(str(column), str(series.dtype), _column_bytes(series))
+        audits.append(audit)
+        if column in protect:
+            continue
+        if keep is not None and column not in keep:
+            audit.action = 'drop'
+            dropped.append(column)
+            continue
+        result = _compact_series(series, float32 and column not in no_float32)
+        if result is not None:
+            audit.action = str(result.dtype)
+            audit.compact_dtype = str(result.dtype)
+            audit.compact_nbytes = _column_bytes(result)
+            replaced[column] = result
+    for audit in audits:
+        if audit.action == 'keep':
+            audit.compact_dtype, audit.compact_nbytes = audit.dtype, audit.nbytes
+    if not compact or not (replaced or dropped):
+        return audits, dataframe
+    result = dataframe.drop(columns=dropped) if dropped else dataframe.copy(deep=False)
+    for column, series in replaced.items():
+        result[column] = series
+    return audits, result
+
+
+def format_audit(audits: List[ColumnAudit], top: int = 30) -> str:
+    """Audit table: totals, then the ``top`` largest columns."""
+    before = sum(audit.nbytes for audit in audits)
+    after = sum(audit.compact_nbytes for audit in audits)
+    actions: Dict[str, int] = {}
+    for audit in audits:
+        actions[audit.action] = actions.get(audit.action, 0) + 1
+    lines = [f'{len(audits)} columns, {before / 2**20:.2f} MB -> {after / 2**20:.2f} MB '
+             f'({before / max(after, 1):.1f}x): '
+             + ', '.join(f'{count} {action}' for action, count in sorted(actions.items())),
+             '', f'{"MB":>8} {"dtype":>10} {"MB after":>9} {"action":>9}  column']
+    for audit in sorted(audits, key=lambda audit: -audit.nbytes)[:top]:
+        lines.append(f'{audit.nbytes / 2**20:8.3f} {audit.dtype:>10} '
+                     f'{audit.compact_nbytes / 2**20:9.3f} {audit.action:>9}  {audit.column}')
+    return '\n'.join(lines)
+
+
+class _ReadRecorder(DataFrame):
+    """DataFrame recording the column names read through ``df[...]`` / ``df.column``."""
+    _metadata = ['reads']
+
+    @property
+    def _constructor(self):
+        return _ReadRecorder
+
+    def __getitem__(self, key):
+        reads = getattr(self, 'reads', None)
+        if reads is not None:
+            if isinstance(key, str):
+                reads.add(key)
+            elif isinstance(key, (list, tuple, pd.Index)):
+                reads.update(item for item in key if isinstance(item, str))
+        return super().__getitem__(key)
+
+
+def signal_reads(strategy: IStrategy, dataframe: DataFrame,
+                 metadata: dict) -> Tuple[Set[str], DataFrame]:
+    """
+    Columns of ``dataframe`` read while computing entry and exit signals (plus the string
+    constants of the signal methods, for ``.loc`` reads).
+    :return: Tuple of (columns read, dataframe with signals)
+    """
+    recorder = _ReadRecorder(dataframe)
+    recorder.reads = set()
+    result = IStrategy.advise_exit(strategy, IStrategy.advise_entry(strategy, recorder, metadata),
+                                   metadata)
+    reads = set(recorder.reads)
+    for tree in _source_trees(strategy) or []:
+        for node in ast.walk(tree):
+            if isinstance(node, ast.FunctionDef) and node.name in POPULATE_METHODS[1:]:
+                reads |= _string_constants(node)
+    return reads & set(dataframe.columns), DataFrame(result)
+
+
+def _source_trees(strategy: IStrategy) -> Optional[List[ast.Module]]:
+    """Parsed source files of the strategy class and its strategy bases, None if unreadable."""
+    trees = []
+    for cls in type(strategy).__mro__:
+        if not issubclass(cls, IStrategy) or cls.__module__.startswith('freqtrade'):
+            continue
+        try:
+            # freqtrade's resolver sets ``__file__`` - its strategy modules are not in
+            # sys.modules, which ``inspect.getfile`` relies on.
+            filename = cls.__dict__.get('__file__') or inspect.getfile(cls)
+            trees.append(ast.parse(Path(filename).read_text(encoding='utf-8')))
+        except (OSError, TypeError, SyntaxError) as e:
+            logger.warning(f'Cannot parse the source of {cls.__name__}: {e}')
+            return None
+    return trees
+
+
+def _string_constants(node: ast.AST) -> Set[str]:
+    return {child.value for child in ast.walk(node)
+            if isinstance(child, ast.Constant) and isinstance(child.value, str)}
+
+
+class _FunctionStrings(ast.NodeVisitor):
+    """String constants in the functions of a module, except the populate methods."""
+
+    def __init__(self) -> None:
+        self.strings: Set[str] = set()
+        self._depth = 0
+
+    def visit_FunctionDef(self, node) -> None:
+        if node.name not in POPULATE_METHODS:
+            self._depth += 1
+            self.generic_visit(node)
+            self._depth -= 1
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        if self._depth and isinstance(node.value, str):
+            self.strings.add(node.value)
+
+
+def callback_reads(strategy: IStrategy) -> Optional[Set[str]]:
+    """
+    Column names the strategy may read from its analysed dataframe outside the populate
+    methods: string constants in the functions of its source files (callbacks, helpers) and
+    the ``plot_config`` columns. Module and class level constants are data, not reads.
+    :return: Column names, None if the source cannot be read
+    """
+    trees = _source_trees(strategy)
+    if trees is None:
+        return None
+    collector = _FunctionStrings()
+    for tree in trees:
+        collector.visit(tree)
+    strings = collector.strings
+    plot_config = getattr(strategy, 'plot_config', None) or {}
+    strings |= set(plot_config.get('main_plot') or {})
+    for subplot in (plot_config.get('subplots') or {}).values():
+        strings |= set(subplot)
+    return strings
+
+
+def _signals_equal(left: DataFrame, right: DataFrame) -> bool:
+    for column in SIGNAL_COLUMNS:
+        if (column in left) != (column in right):
+            return False
+        if column in left and not np.array_equal(left[column].fillna(0).to_numpy(dtype=object),
+                                                 right[column].fillna(0).to_numpy(dtype=object)):
+            return False
+    return True
+
+
+class ColumnCompactor:
+    """
+    Compaction state of one strategy: columns to keep after each stage, decided and verified
+    on the first pair, then applied to every pair. Columns the signals or callbacks read are
+    never converted to float32. When the strategy's source cannot be read, the columns its
+    callbacks read are unknown: nothing is dropped and floats stay float64.
+    :param drop_unused: Drop columns nobody reads (never under hyperopt: the columns read
+        depend on the parameters of each epoch)
+    """
+
+    def __init__(self, compact: bool = True, float32: bool = True,
+                 drop_unused: bool = True, keep: Iterable[str] = ()) -> None:
+        self.compact = compact
+        self.float32 = float32
+        self.drop_unused = drop_unused
+        self.keep = set(keep)
+        self.enabled = True
+        self.indicator_audits: List[ColumnAudit] = []
+        self.signal_audits: List[ColumnAudit] = []
+        self._decided = False
+        self._indicator_keep: Optional[Set[str]] = None
+        self._signal_keep: Optional[Set[str]] = None
+        self._no_float32: Set[str] = set()
+        self._callback_reads: Set[str] = set()
+
+    def _first_pair(self, strategy: IStrategy, dataframe: DataFrame,
+                    metadata: dict) -> DataFrame:
+        name = type(strategy).__name__
+        reads, reference = signal_reads(strategy, dataframe.copy(), metadata)
+        callbacks = callback_reads(strategy)
+        if callbacks is None:
+            self.drop_unused = self.float32 = False
+            callbacks = set()
+        self._callback_reads = callbacks | self.keep
+        if self.drop_unused:
+            self._indicator_keep = reads | self._callback_reads
+            self._signal_keep = self._callback_reads
+        self._decided = True
+        # Everything read later stays exact - float32 would only be verified for this pair.
+        self._no_float32 = self._callback_reads | reads
+        audits, compacted = audit_columns(dataframe, self._indicator_keep,
+                                          no_float32=self._no_float32, float32=self.float32,
+                                          compact=self.compact)
+        if self.compact:
+            try:
+                _, signals = signal_reads(strategy, compacted.copy(), metadata)
+                changed = not _signals_equal(reference, signals)
+            except Exception as e:
+                logger.warning(f'Signals of {name} fail on compacted columns ({e}).')
+                changed = True
+            if changed:
+                logger.warning(f'Column compaction changes the signals of {name}, disabling it.')
+                self.enabled = False
+                return dataframe
+        self.indicator_audits = audits
+        logger.info(f'Columns of {name} after populate_indicators ({metadata.get("pair")}): '
+                    f'{format_audit(audits)}')
+        return compacted
+
+    def after_indicators(self, strategy: IStrategy, dataframe: DataFrame,
+                         metadata: dict) -> DataFrame:
+        if not self.enabled:
+            return dataframe
+        if not self._decided:
+            return self._first_pair(strategy, dataframe, metadata)
+        if not self.compact:
+            return dataframe
+        return audit_columns(dataframe, self._indicator_keep, no_float32=self._no_float32,
+                             float32=self.float32)[1]
+
+    def after_signals(self, strategy: IStrategy, dataframe: DataFrame,
+                      metadata: dict) -> DataFrame:
+        if not self.enabled or not self.compact or not self._decided:
+            return dataframe
+        self.signal_audits, dataframe = audit_columns(dataframe, self._signal_keep,
+                                                      no_float32=self._callback_reads,
+                                                      float32=self.float32)
+        return dataframe
+
+
+class ColumnCompactionMixin:
+    """
+    Strategy mixin compacting the analysed dataframe, configured by ``column_compaction``
+    (see the module docstring). Without ``enabled`` the mixin does nothing.
+    """
+    column_compactor: Optional[ColumnCompactor] = None
+
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        settings = config.get('column_compaction') or {}
+        if settings.get('enabled'):
+            hyperopt = config.get('runmode') == 'hyperopt'
+            self.column_compactor = ColumnCompactor(
+                compact=settings.get('compact', True),
+                # Float32 and dropped columns are only verified for the current parameters.
+                float32=settings.get('float32', True) and not hyperopt,
+                drop_unused=settings.get('drop_unused', True) and not hyperopt,
+                keep=settings.get('keep', ()))
+
+    def advise_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        dataframe = super().advise_indicators(dataframe, metadata)
+        if self.column_compactor is None:
+            return dataframe
+        return self.column_compactor.after_indicators(self, dataframe, metadata)
+
+    def advise_exit(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        dataframe = super().advise_exit(dataframe, metadata)
+        if self.column_compactor is None:
+            return dataframe
+        return self.column_compactor.after_signals(self, dataframe, metadata)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    from freqtrade_strategies.offline import (find_strategy, load_candles, load_strategy,
+                                              offline_config)
+
+    parser = argparse.ArgumentParser(
+        description='Audit the analysed dataframe of a strategy and show its compaction.')
+    parser.add_argument('strategy')
+    parser.add_argument('--strategy-dir', type=Path, default=Path('user_data/strategies'))
+    parser.add_argument('--datadir', type=Path, default=Path('user_data/data/gateio/futures'))
+    parser.add_argument('--pair', default='BTC/USDT:USDT')
+    parser.add_argument('--no-float32', action='store_true')
+    parser.add_argument('--top', type=int, default=30)
+    parsed = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    filename, class_name = find_strategy(parsed.strategy_dir, parsed.strategy)
+    config = offline_config(parsed.datadir, parsed.pair)
+    strategy = load_strategy(filename, class_name, config)
+    candles, _ = load_candles(parsed.datadir, parsed.pair, strategy.timeframe)
+    metadata: Dict[str, Any] = {'pair': parsed.pair}
+
+    indicators = IStrategy.advise_indicators(strategy, candles.copy(), metadata)
+    analysed = IStrategy.advise_exit(strategy, IStrategy.advise_entry(
+        strategy, indicators.copy(), metadata), metadata)
+    compactor = ColumnCompactor(float32=not parsed.no_float32)
+    compacted = compactor.after_indicators(strategy, indicators, metadata)
+    if not compactor.enabled:
+        print('Compaction changes the signals - showing the audit only.\n')
+        print(format_audit(audit_columns(analysed, compact=False)[0], parsed.top))
+        return
+
+    print(f'After populate_indicators: {format_audit(compactor.indicator_audits, parsed.top)}\n')
+    compacted = compactor.after_signals(strategy, IStrategy.advise_exit(
+        strategy, IStrategy.advise_entry(strategy, compacted, metadata), metadata), metadata)
+    before = analysed.memory_usage(index=False, deep=True).sum()
+    after = compacted.memory_usage(index=False, deep=True).sum()
+    print(f'Analysed dataframe: {before / 2**20:.2f} MB -> {after / 2**20:.2f} MB '
+          f'({before / max(after, 1):.1f}x), signals verified identical.\n')
+    print(f'After populate_exit_trend: {format_audit(compactor.signal_audits, parsed.top)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+"""
+Data preparation on top of the feather files under ``user_data/data``.
+"""
@@ -0,0 +1,209 @@
+"""
+Pre-joined futures bundle: trade candles, mark price and funding rate on one timestamp axis.
+
+freqtrade stores these as three feather files per pair
+(``<pair>-1h-futures``, ``<pair>-1h-mark`` and ``<pair>-1h-funding_rate``).
+Merging them - including forward-filling the funding rate - is done once here and the
+result is written as ``bundles/<pair>-<timeframe>-bundle.feather`` below the source files,
+so strategies and simulators can load everything with a single read. The subdirectory
+keeps the bundles out of freqtrade's data scan, which would parse ``bundle`` as a candle
+type.
+
+Usage::
+
+    python -m freqtrade_strategies.data.bundle --datadir user_data/data/gateio/futures
+"""
+import argparse
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from freqtrade.exceptions import OperationalException
+from freqtrade.exchange import timeframe_to_resample_freq
+from freqtrade.misc import pair_to_filename
+
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+MARK_COLUMNS = ['mark_open', 'mark_high', 'mark_low', 'mark_close']
+BUNDLE_COLUMNS = (
+    ['date'] + OHLCV_COLUMNS + MARK_COLUMNS
+    + ['funding_rate', 'funding_event', 'candle_gap', 'mark_gap', 'funding_gap']
+)
+
+
+def bundle_filename(datadir: Path, pair: str, timeframe: str) -> Path:
+    return Path(datadir) / 'bundles' / f'{pair_to_filename(pair)}-{timeframe}-bundle.feather'
+
+
+def _source_filename(datadir: Path, pair: str, timeframe: str, suffix: str) -> Path:
+    return Path(datadir) / f'{pair_to_filename(pair)}-{timeframe}-{suffix}.feather'
+
+
+def _read_source(datadir: Path, pair: str, timeframe: str, suffix: str,
+                 required: bool = True) -> Optional[DataFrame]:
+    filename = _source_filename(datadir, pair, timeframe, suffix)
+    if not filename.is_file():
+        if required:
+            raise OperationalException(f'No {suffix} data for {pair} found at {filename}.')
+        logger.warning(f'No {suffix} data for {pair} at {filename}, leaving columns empty.')
+        return None
+    df = pd.read_feather(filename)
+    return df.drop_duplicates(subset='date', keep='last').sort_values('date')
+
+
+def build_futures_bundle(datadir: Path, pair: str, timeframe: str = '1h') -> DataFrame:
+    """
+    Align futures candles, mark candles and funding rates for one pair.
+
+    The timestamp axis is the complete candle grid between the first and last futures
+    candle. Missing candles are filled the way freqtrade does it (previous close, 0 volume),
+    the mark price is forward-filled and the funding rate - published only every few
+    hours - is forward-filled onto every candle.
+    Flags record where data was filled in:
+
+    * ``candle_gap`` - the futures candle was missing
+    * ``mark_gap`` - the mark candle was missing
+    * ``funding_event`` - a funding rate was published at this candle (payments happen here)
+    * ``funding_gap`` - no funding rate was published within the expected funding interval
+
+    :param datadir: Directory holding the futures feather files
+    :param pair: Pair in freqtrade notation, e.g. ``BTC/USDT:USDT``
+    :param timeframe: Candle timeframe of the source files
+    :return: DataFrame with the columns from ``BUNDLE_COLUMNS``
+    """
+    candles = _read_source(datadir, pair, timeframe, 'futures')
+    if candles.empty:
+        raise OperationalException(f'Futures data for {pair} is empty.')
+    mark = _read_source(datadir, pair, timeframe, 'mark', required=False)
+    funding = _read_source(datadir, pair, timeframe, 'funding_rate', required=False)
+
+    grid = pd.date_range(candles['date'].iloc[0], candles['date'].iloc[-1],
+                         freq=timeframe_to_resample_freq(timeframe), name='date')
+    bundle = candles.set_index('date')[OHLCV_COLUMNS].reindex(grid)
+
+    candle_gap = bundle['close'].isna().to_numpy()
+    bundle['close'] = bundle['close'].ffill()
+    for col in ['open', 'high', 'low']:
+        bundle[col] = bundle[col].fillna(bundle['close'])
+    bundle['volume'] = bundle['volume'].fillna(0.0)
+
+    if mark is not None:
+        mark = mark.set_index('date')[['open', 'high', 'low', 'close']].reindex(grid)
+        mark_gap = mark['close'].isna().to_numpy()
+        mark = mark.ffill()
+    else:
+        mark = DataFrame(np.nan, index=grid, columns=['open', 'high', 'low', 'close'])
+        mark_gap = np.ones(len(grid), dtype=bool)
+    mark.columns = MARK_COLUMNS
+
+    funding_rate = np.full(len(grid), np.nan)
+    funding_event = np.zeros(len(grid), dtype=bool)
+    funding_gap = np.ones(len(grid), dtype=bool)
+    if funding is not None and not funding.empty:
+        # Funding rates are stored in the "open" column of the funding_rate candles
+        rates = funding.set_index('date')['open']
+        rates = rates[(rates.index >= grid[0]) & (rates.index <= grid[-1])]
+        positions = grid.get_indexer(rates.index)
+        rates = rates[positions >= 0]
+        positions = positions[positions >= 0]
+        funding_event[positions] = True
+        funding_rate = pd.Series(np.nan, index=grid)
+        funding_rate.iloc[positions] = rates.to_numpy()
+        funding_rate = funding_rate.ffill().to_numpy()
+
+        if len(positions) > 1:
+            # Funding is expected every `interval` candles; anything longer is a gap.
+            interval = int(np.median(np.diff(positions)))
+            last_event = np.where(funding_event, np.arange(len(grid)), -1)
+            last_event = np.maximum.accumulate(last_event)
+            since_event = np.arange(len(grid)) - last_event
+            funding_gap = (last_event < 0) | (since_event >= interval)
+        else:
+            funding_gap = np.isnan(funding_rate)
+
+    bundle = pd.concat([bundle, mark], axis=1)
+    bundle['funding_rate'] = funding_rate
+    bundle['funding_event'] = funding_event
+    bundle['candle_gap'] = candle_gap
+    bundle['mark_gap'] = mark_gap
+    bundle['funding_gap'] = funding_gap
+
+    if candle_gap.any():
+        logger.info(f'{pair}: filled {candle_gap.sum()} missing {timeframe} candles.')
+    return bundle.reset_index()[BUNDLE_COLUMNS]
+
+
+def write_futures_bundle(datadir: Path, pair: str, timeframe: str = '1h') -> Path:
+    """
+    Build the bundle for ``pair`` and store it in the ``bundles`` subdirectory.
+    :return: Path of the written bundle
+    """
+    bundle = build_futures_bundle(datadir, pair, timeframe)
+    filename = bundle_filename(datadir, pair, timeframe)
+    filename.parent.mkdir(exist_ok=True)
+    bundle.to_feather(filename, compression_level=9, compression='lz4')
+    return filename
+
+
+def load_futures_bundle(datadir: Path, pair: str, timeframe: str = '1h',
+                        rebuild: bool = False) -> DataFrame:
+    """
+    Load the bundle for ``pair``, building it first if it is missing or stale.
+    A bundle is stale once any of its source files is newer than the bundle.
+    """
+    filename = bundle_filename(datadir, pair, timeframe)
+    if rebuild or _is_stale(datadir, pair, timeframe, filename):
+        write_futures_bundle(datadir, pair, timeframe)
+    return pd.read_feather(filename)
+
+
+def _is_stale(datadir: Path, pair: str, timeframe: str, filename: Path) -> bool:
+    if not filename.is_file():
+        return True
+    built = filename.stat().st_mtime
+    for suffix in ('futures', 'mark', 'funding_rate'):
+        source = _source_filename(datadir, pair, timeframe, suffix)
+        if source.is_file() and source.stat().st_mtime > built:
+            return True
+    return False
+
+
+def available_pairs(datadir: Path, timeframe: str = '1h') -> List[str]:
+    """
+    Pairs with ``<pair>-<timeframe>-futures.feather`` files in ``datadir``.
+    Filenames only keep underscores, so pairs are returned as ``BASE/QUOTE:SETTLE``.
+    """
+    pairs = []
+    for filename in sorted(Path(datadir).glob(f'*-{timeframe}-futures.feather')):
+        parts = filename.name[:-len(f'-{timeframe}-futures.feather')].split('_')
+        if len(parts) == 3:
+            pairs.append(f'{parts[0]}/{parts[1]}:{parts[2]}')
+        else:
+            logger.warning(f'Cannot derive pair from {filename.name}, skipping.')
+    return pairs
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Build pre-joined futures bundles.')
+    parser.add_argument('--datadir', type=Path, default=Path('user_data/data/gateio/futures'))
+    parser.add_argument('--timeframe', default='1h')
+    parser.add_argument('--pairs', nargs='+', help='Pairs to build. Defaults to all pairs found.')
+    parsed = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    pairs = parsed.pairs or available_pairs(parsed.datadir, parsed.timeframe)
+    if not pairs:
+        raise OperationalException(f'No {parsed.timeframe} futures data in {parsed.datadir}.')
+    for pair in pairs:
+        filename = write_futures_bundle(parsed.datadir, pair, parsed.timeframe)
+        logger.info(f'{pair}: wrote {filename}')
+
+
+if __name__ == '__main__':
+    main()
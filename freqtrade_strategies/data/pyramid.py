@@ -0,0 +1,407 @@
+"""
+Timeframe pyramid: OHLCV for every higher timeframe, derived once from 5m candles.
+
+Strategies in this repository run on (or pull informative data from) 5m, 15m, 30m, 1h,
+3h, 4h, 12h and 1d candles. Instead of resampling with pandas on every run, each level is
+aggregated from the level below it with numpy ``reduceat`` and kept as plain arrays (volume
+is summed from the base candles as pandas sums it, so every level equals a pandas resample).
+New 5m candles are appended incrementally: only the last (possibly incomplete) bucket of
+each level is recomputed.
+
+Strategies resampling their own dataframe with ``technical.util.resample_to_interval`` use
+``PyramidResampleMixin.resample_to_interval`` instead: one pyramid per pair, appended to as
+candles arrive. The offline tools (``freqtrade_strategies.offline.load_candles``) build
+their higher timeframes from a pyramid too. Informative pairs are not resampled at all -
+freqtrade reads them from their own data files.
+
+Usage::
+
+    python -m freqtrade_strategies.data.pyramid --datadir user_data/data/gateio/futures
+"""
+import argparse
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from freqtrade.exceptions import OperationalException
+from freqtrade.exchange import timeframe_to_seconds
+from freqtrade.misc import pair_to_filename
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEFRAMES = ('5m', '15m', '30m', '1h', '3h', '4h', '12h', '1d')
+FIELDS = ('date', 'open', 'high', 'low', 'close', 'volume', 'count')
+_DAY_SECONDS = 86400
+
+
+class OhlcvPyramid:
+    """
+    OHLCV arrays for a base timeframe and all requested higher timeframes of one pair.
+
+    Every level is stored as a dict of 1-d numpy arrays (``FIELDS``); ``date`` holds the
+    candle open time in nanoseconds since epoch and ``count`` the number of base candles
+    that went into the candle. Only the last candle of a level can be incomplete.
+    """
+
+    def __init__(self, base_timeframe: str = '5m',
+                 timeframes: Sequence[str] = DEFAULT_TIMEFRAMES) -> None:
+        self.base_timeframe = base_timeframe
+        self._base_seconds = timeframe_to_seconds(base_timeframe)
+        self.timeframes = self._sorted_timeframes(timeframes)
+        self._sources = {tf: self._source_timeframe(tf) for tf in self.timeframes}
+        self._levels: Dict[str, Dict[str, np.ndarray]] = {
+            tf: {field: np.empty(0, dtype=np.int64 if field in ('date', 'count') else float)
+                 for field in FIELDS}
+            for tf in self.timeframes
+        }
+
+    def _sorted_timeframes(self, timeframes: Sequence[str]) -> List[str]:
+        result = sorted(set(timeframes) | {self.base_timeframe}, key=timeframe_to_seconds)
+        for tf in result:
+            seconds = timeframe_to_seconds(tf)
+            if seconds > _DAY_SECONDS:
+                # Weekly and monthly candles are not aligned to epoch.
+                raise OperationalException(f'Timeframes above 1d are not supported, got {tf}.')
+            if seconds % self._base_seconds or _DAY_SECONDS % seconds:
+                raise OperationalException(
+                    f'Timeframe {tf} cannot be built from {self.base_timeframe} candles.')
+        return result
+
+    def _source_timeframe(self, timeframe: str) -> Optional[str]:
+        """Largest lower level that evenly divides ``timeframe`` - None for the base level."""
+        seconds = timeframe_to_seconds(timeframe)
+        candidates = [tf for tf in self.timeframes
+                      if timeframe_to_seconds(tf) < seconds
+                      and seconds % timeframe_to_seconds(tf) == 0]
+        return candidates[-1] if candidates else None
+
+    @classmethod
+    def from_dataframe(cls, dataframe: DataFrame, base_timeframe: str = '5m',
+                       timeframes: Sequence[str] = DEFAULT_TIMEFRAMES) -> 'OhlcvPyramid':
+        pyramid = cls(base_timeframe, timeframes)
+        pyramid.append(dataframe)
+        return pyramid
+
+    @property
+    def last_date(self) -> Optional[pd.Timestamp]:
+        dates = self._levels[self.base_timeframe]['date']
+        return pd.Timestamp(dates[-1], tz='UTC') if len(dates) else None
+
+    def append(self, dataframe: DataFrame) -> int:
+        """
+        Append base candles. Candles not newer than the last stored candle are ignored.
+        :param dataframe: Base timeframe OHLCV in freqtrade format (``date`` column)
+        :return: Number of base candles added
+        """
+        dates = _nanoseconds(dataframe['date'])
+        base = self._levels[self.base_timeframe]
+        new = dates > base['date'][-1] if len(base['date']) else np.ones(len(dates), dtype=bool)
+        if not new.any():
+            return 0
+        order = np.argsort(dates[new], kind='stable')
+        added = {'date': dates[new][order], 'count': np.ones(int(new.sum()), dtype=np.int64)}
+        for field in ('open', 'high', 'low', 'close', 'volume'):
+            added[field] = dataframe[field].to_numpy(dtype=float)[new][order]
+        for field in FIELDS:
+            base[field] = np.concatenate([base[field], added[field]])
+
+        for tf in self.timeframes[1:]:
+            self._rebuild_tail(tf, int(added['date'][0]))
+        return len(added['date'])
+
+    def _rebuild_tail(self, timeframe: str, since: int) -> None:
+        """Re-aggregate every bucket of ``timeframe`` that starts at or after ``since``'s bucket."""
+        width = timeframe_to_seconds(timeframe) * 1_000_000_000
+        start = since // width * width
+        level = self._levels[timeframe]
+        source = self._levels[self._sources[timeframe]]
+        keep = np.searchsorted(level['date'], start, side='left')
+        first = np.searchsorted(source['date'], start, side='left')
+        tail = _aggregate({field: values[first:] for field, values in source.items()}, width)
+        if self._sources[timeframe] != self.base_timeframe:
+            # Sums of sums round differently: volume is always summed from the base candles.
+            base = self._levels[self.base_timeframe]
+            first = np.searchsorted(base['date'], start, side='left')
+            tail['volume'] = _aggregate({field: values[first:]
+                                         for field, values in base.items()}, width)['volume']
+        for field in FIELDS:
+            level[field] = np.concatenate([level[field][:keep], tail[field]])
+
+    def locate(self, dataframe: DataFrame) -> Optional[int]:
+        """
+        Position of ``dataframe``'s first candle among the base candles, if the candles both
+        hold are identical and the rest of ``dataframe`` is newer (ready to ``append``).
+        :return: Index of the first candle, None if ``dataframe`` does not continue the pyramid
+        """
+        base = self._levels[self.base_timeframe]
+        dates = _nanoseconds(dataframe['date'])
+        if not len(dates) or not len(base['date']):
+            return None
+        start = int(np.searchsorted(base['date'], dates[0]))
+        overlap = min(len(dates), len(base['date']) - start)
+        if overlap <= 0 or base['date'][start] != dates[0]:
+            return None
+        if not np.array_equal(base['date'][start:start + overlap], dates[:overlap]):
+            return None
+        for field in ('open', 'high', 'low', 'close', 'volume'):
+            if not np.array_equal(base[field][start:start + overlap],
+                                  dataframe[field].to_numpy(dtype=float)[:overlap],
+                                  equal_nan=True):
+                return None
+        return start
+
+    def resample(self, timeframe: str, start: int, stop: int) -> DataFrame:
+        """
+        ``timeframe`` candles of the base candles ``start:stop`` alone - what resampling just
+        those candles gives. Inner buckets come from the level; the first and last bucket,
+        which may hold candles outside the range, are aggregated from the base candles.
+        :return: OHLCV in freqtrade format, like ``technical.util.resample_to_interval``
+        """
+        if timeframe not in self._levels:
+            raise OperationalException(
+                f'Timeframe {timeframe} is not part of this pyramid ({self.timeframes}).')
+        base = self._levels[self.base_timeframe]
+        width = timeframe_to_seconds(timeframe) * 1_000_000_000
+        parts = []
+        if start < stop:
+            head_end = (base['date'][start] // width + 1) * width
+            tail_start = base['date'][stop - 1] // width * width
+            head_stop = min(int(np.searchsorted(base['date'], head_end)), stop)
+            parts.append(_aggregate({field: values[start:head_stop]
+                                     for field, values in base.items()}, width))
+            if tail_start >= head_end:
+                level = self._levels[timeframe]
+                inner = slice(int(np.searchsorted(level['date'], head_end)),
+                              int(np.searchsorted(level['date'], tail_start)))
+                tail = int(np.searchsorted(base['date'], tail_start))
+                parts.append({field: values[inner] for field, values in level.items()})
+                parts.append(_aggregate({field: values[tail:stop]
+                                         for field, values in base.items()}, width))
+        if not parts:
+            return _frame({field: values[:0] for field, values in base.items()})
+        return _frame({field: np.concatenate([part[field] for part in parts])
+                       for field in FIELDS})
+
+    def _complete_length(self, timeframe: str) -> int:
+        level = self._levels[timeframe]
+        if not len(level['date']):
+            return 0
+        base_dates = self._levels[self.base_timeframe]['date']
+        data_end = base_dates[-1] + self._base_seconds * 1_000_000_000
+        width = timeframe_to_seconds(timeframe) * 1_000_000_000
+        return len(level['date']) - int(level['date'][-1] + width > data_end)
+
+    def arrays(self, timeframe: str, complete_only: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Ready arrays for ``timeframe``. The returned arrays are views - do not modify them.
+        :param complete_only: Drop the trailing candle if not all of its base candles exist yet
+        """
+        if timeframe not in self._levels:
+            raise OperationalException(
+                f'Timeframe {timeframe} is not part of this pyramid ({self.timeframes}).')
+        level = self._levels[timeframe]
+        end = self._complete_length(timeframe) if complete_only else len(level['date'])
+        return {field: values[:end] for field, values in level.items()}
+
+    def dataframe(self, timeframe: str, complete_only: bool = True) -> DataFrame:
+        """OHLCV for ``timeframe`` in freqtrade format."""
+        return _frame(self.arrays(timeframe, complete_only))
+
+    def save(self, filename: Path) -> None:
+        np.savez(filename, base_timeframe=self.base_timeframe,
+                 timeframes=np.array(self.timeframes),
+                 **{f'{tf}.{field}': values
+                    for tf, level in self._levels.items() for field, values in level.items()})
+
+    @classmethod
+    def load(cls, filename: Path) -> 'OhlcvPyramid':
+        with np.load(filename) as data:
+            pyramid = cls(str(data['base_timeframe']), [str(tf) for tf in data['timeframes']])
+            for tf in pyramid.timeframes:
+                pyramid._levels[tf] = {field: data[f'{tf}.{field}'] for field in FIELDS}
+        return pyramid
+
+
+def _nanoseconds(dates: pd.Series) -> np.ndarray:
+    """Candle dates as int64 nanoseconds since epoch (UTC)."""
+    if isinstance(dates.dtype, pd.DatetimeTZDtype):
+        dates = dates.dt.tz_convert('UTC').dt.tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+def _frame(arrays: Dict[str, np.ndarray]) -> DataFrame:
+    df = DataFrame({field: arrays[field] for field in ('open', 'high', 'low', 'close', 'volume')})
+    df.insert(0, 'date', pd.to_datetime(arrays['date'], unit='ns', utc=True))
+    return df
+
+
+def _bucket_sums(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Sum of every bucket of ``values`` (buckets begin at ``starts``), skipping NaN, with the
+    Kahan summation of pandas' groupby sum - so that volumes equal a pandas resample's.
+    """
+    lengths = np.diff(np.r_[starts, len(values)])
+    total = np.zeros(len(starts))
+    if not len(values):
+        return total
+    if len(starts) <= 4:
+        # The partial first and last bucket of a resample: a plain loop beats numpy's
+        # per-call overhead on long buckets.
+        for bucket, (start, length) in enumerate(zip(starts, lengths)):
+            subtotal = compensation = 0.0
+            for value in values[start:start + length].tolist():
+                if value == value:
+                    y = value - compensation
+                    t = subtotal + y
+                    compensation = t - subtotal - y
+                    if compensation != compensation:
+                        compensation = 0.0
+                    subtotal = t
+            total[bucket] = subtotal
+        return total
+    # One row per position in the bucket, one column per bucket; positions past the end of
+    # a bucket and NaN are skipped.
+    offsets = np.arange(int(lengths.max()))[:, np.newaxis]
+    rows = values[np.minimum(starts + offsets, len(values) - 1)]
+    valid = (offsets < lengths) & ~np.isnan(rows)
+    compensation = np.zeros(len(starts))
+    for value, use in zip(rows, valid):
+        y = value - compensation
+        t = total + y
+        error = t - total - y
+        compensation = np.where(use, np.where(np.isnan(error), 0.0, error), compensation)
+        total = np.where(use, t, total)
+    return total
+
+
+def _aggregate(source: Dict[str, np.ndarray], width: int) -> Dict[str, np.ndarray]:
+    """Aggregate sorted candles into epoch-aligned buckets of ``width`` nanoseconds."""
+    if not len(source['date']):
+        return {field: values[:0].copy() for field, values in source.items()}
+    buckets = source['date'] // width * width
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    return {
+        'date': buckets[starts],
+        'open': source['open'][starts],
+        'high': np.maximum.reduceat(source['high'], starts),
+        'low': np.minimum.reduceat(source['low'], starts),
+        'close': source['close'][ends],
+        'volume': _bucket_sums(source['volume'], starts),
+        'count': np.add.reduceat(source['count'], starts),
+    }
+
+
+class PyramidResampleMixin:
+    """
+    Strategy mixin serving ``technical.util.resample_to_interval`` from per pair pyramids::
+
+        class MyStrategy(PyramidResampleMixin, IStrategy):
+            def populate_indicators(self, dataframe, metadata):
+                resampled = self.resample_to_interval(dataframe, 180, metadata)
+                ...
+                dataframe = resampled_merge(dataframe, resampled, fill_na=True)
+
+    The result is identical to the pandas resample. The pyramid of a pair is kept between
+    calls: a dataframe that continues it (same candles where both have them, newer candles
+    after) only appends its new candles - one candle per call in dry / live runs. Any other
+    dataframe (another history, a shorter prefix, changed candles) is located or the pyramid
+    is rebuilt from it, so a call never sees candles outside its dataframe. Intervals above
+    a day, or not dividing it, fall back to the pandas resample.
+    """
+    _pyramids: Optional[Dict[str, OhlcvPyramid]] = None
+    # Every interval the strategy resamples to: a pyramid holds them all.
+    _pyramid_timeframes: Optional[Set[str]] = None
+
+    def resample_to_interval(self, dataframe: DataFrame, interval: int,
+                             metadata: dict) -> DataFrame:
+        """
+        :param interval: Target candle length in minutes
+        :return: OHLCV at ``interval``, like ``technical.util.resample_to_interval``
+        """
+        timeframe = f'{interval}m'
+        seconds, base_seconds = interval * 60, timeframe_to_seconds(self.timeframe)
+        if seconds > _DAY_SECONDS or _DAY_SECONDS % seconds or seconds % base_seconds:
+            # Not epoch-aligned (pandas aligns to the first day) or not built from whole
+            # candles - left to pandas.
+            from technical.util import resample_to_interval
+            return resample_to_interval(dataframe, interval)
+        if self._pyramids is None:
+            self._pyramids, self._pyramid_timeframes = {}, set()
+        self._pyramid_timeframes.add(timeframe)
+        pyramid = self._pyramids.get(metadata['pair'])
+        start = None
+        if pyramid is not None and timeframe in pyramid.timeframes:
+            start = pyramid.locate(dataframe)
+        if start is None:
+            pyramid = OhlcvPyramid(self.timeframe, sorted(self._pyramid_timeframes))
+            self._pyramids[metadata['pair']] = pyramid
+            start = 0
+        pyramid.append(dataframe)
+        resampled = pyramid.resample(timeframe, start, start + len(dataframe))
+        # Keep the date resolution of the dataframe, as pandas does.
+        resampled['date'] = resampled['date'].astype(dataframe['date'].dtype)
+        return resampled
+
+
+def pyramid_filename(datadir: Path, pair: str, base_timeframe: str = '5m') -> Path:
+    return Path(datadir) / f'{pair_to_filename(pair)}-{base_timeframe}-pyramid.npz'
+
+
+def load_pyramid(datadir: Path, pair: str, base_timeframe: str = '5m',
+                 timeframes: Sequence[str] = DEFAULT_TIMEFRAMES,
+                 candle_type: str = 'futures') -> OhlcvPyramid:
+    """
+    Load the cached pyramid of ``pair`` and append candles the base feather file gained since.
+    The cache is (re)built when missing or when it does not cover ``timeframes``.
+    """
+    source = Path(datadir) / f'{pair_to_filename(pair)}-{base_timeframe}-{candle_type}.feather'
+    if not source.is_file():
+        raise OperationalException(f'No {base_timeframe} data for {pair} found at {source}.')
+    filename = pyramid_filename(datadir, pair, base_timeframe)
+
+    pyramid = None
+    if filename.is_file():
+        pyramid = OhlcvPyramid.load(filename)
+        if not set(timeframes) <= set(pyramid.timeframes):
+            pyramid = None
+    if pyramid is None:
+        pyramid = OhlcvPyramid(base_timeframe, timeframes)
+
+    if pyramid.last_date is None or source.stat().st_mtime > filename.stat().st_mtime:
+        added = pyramid.append(pd.read_feather(source))
+        if added:
+            logger.info(f'{pair}: added {added} {base_timeframe} candles to the pyramid.')
+            pyramid.save(filename)
+        elif filename.is_file():
+            # The source was rewritten without new candles: mark the cache as up to date, or
+            # every later call would read the source again.
+            filename.touch()
+    return pyramid
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    from freqtrade_strategies.data.bundle import available_pairs
+
+    parser = argparse.ArgumentParser(description='Build or update timeframe pyramids.')
+    parser.add_argument('--datadir', type=Path, default=Path('user_data/data/gateio/futures'))
+    parser.add_argument('--base-timeframe', default='5m')
+    parser.add_argument('--timeframes', nargs='+', default=list(DEFAULT_TIMEFRAMES))
+    parser.add_argument('--pairs', nargs='+', help='Pairs to build. Defaults to all pairs found.')
+    parsed = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    pairs = parsed.pairs or available_pairs(parsed.datadir, parsed.base_timeframe)
+    for pair in pairs:
+        pyramid = load_pyramid(parsed.datadir, pair, parsed.base_timeframe, parsed.timeframes)
+        logger.info(f'{pair}: pyramid up to {pyramid.last_date} '
+                    f'for {", ".join(pyramid.timeframes)}')
+
+
+if __name__ == '__main__':
+    main()
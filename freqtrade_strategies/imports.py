@@ -0,0 +1,180 @@
+"""
+Import cost of strategy files, and lazy imports of heavy libraries.
+
+freqtrade imports every file of the strategy directory to find a strategy, and every
+hyperopt worker imports the strategy again. Libraries imported at module level are paid
+for on each of these imports, even when the strategy barely uses them - ``pandas_ta`` is
+imported by several strategies that never call it, ``sklearn`` costs more than a second.
+
+``lazy_import`` returns a stand-in module that imports the real one on first attribute
+access, ``lazy_function`` a stand-in function importing its module on first call::
+
+    pta = lazy_import('pandas_ta')
+    preprocessing = lazy_import('sklearn.preprocessing')
+    add_all_ta_features = lazy_function('ta', 'add_all_ta_features')
+
+``import_costs`` imports each strategy file in a fresh interpreter with ``-X importtime``,
+after freqtrade, pandas, numpy and TA-Lib (which the bot has loaded anyway), and reports the
+time the file adds, the heaviest modules it pulls in and what it prints while being
+imported.
+
+Usage::
+
+    python -m freqtrade_strategies.imports --strategy-dir user_data/strategies
+    python -m freqtrade_strategies.imports user_data/strategies/GodStra.py --top 10
+"""
+import argparse
+import importlib
+import logging
+import subprocess
+import sys
+import types
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Imported by every bot before any strategy file.
+BASELINE_MODULES = ('freqtrade.strategy', 'freqtrade.vendor.qtpylib.indicators',
+                    'talib.abstract', 'pandas', 'numpy')
+_MARKER = '--- strategy import ---'
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in importing ``name`` on first attribute access."""
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f'<lazy module {self.__name__!r} ({state})>'
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """``name`` itself when already imported, else a ``LazyModule`` importing it on use."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def lazy_function(module: str, name: str) -> Callable:
+    """Stand-in for ``from module import name`` importing ``module`` on first call."""
+    lazy = lazy_import(module)
+
+    def function(*args, **kwargs):
+        return getattr(lazy, name)(*args, **kwargs)
+
+    function.__name__ = function.__qualname__ = name
+    function.__module__ = module
+    return function
+
+
+@dataclass
+class ImportCost:
+    file: str
+    # Milliseconds the file adds to an interpreter that already loaded the baseline modules.
+    milliseconds: float = 0.0
+    # (module, cumulative milliseconds) of the top-level imports of the file, heaviest first.
+    modules: List[Tuple[str, float]] = field(default_factory=list)
+    # Output printed while importing (module or class level ``print``).
+    printed: str = ''
+    error: str = ''
+
+
+def parse_importtime(stderr: str) -> Tuple[float, List[Tuple[str, float]], str]:
+    """
+    Split ``-X importtime`` output after the marker into imports and other output.
+    :return: Tuple of (total ms, [(top-level module, cumulative ms)], remaining stderr)
+    """
+    modules, other, started = [], [], False
+    for line in stderr.splitlines():
+        if line.strip() == _MARKER:
+            started = True
+            continue
+        if not started:
+            continue
+        if not line.startswith('import time:'):
+            other.append(line)
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2]
+        # Nested imports are indented by two spaces per level below the top-level import.
+        if len(name) - len(name.lstrip()) == 1:
+            modules.append((name.strip(), int(parts[1]) / 1000))
+    return sum(ms for _, ms in modules), sorted(modules, key=lambda item: -item[1]), \
+        '\n'.join(other)
+
+
+def import_cost(filename: Path, python: str = sys.executable) -> ImportCost:
+    """Import ``filename`` in a fresh interpreter and measure what it adds."""
+    code = '\n'.join([
+        *(f'import {module}' for module in BASELINE_MODULES),
+        'import sys',
+        'from pathlib import Path',
+        'from freqtrade_strategies.offline import import_strategy_file',
+        f'sys.stderr.write({_MARKER!r} + "\\n"); sys.stderr.flush()',
+        f'import_strategy_file(Path({str(filename)!r}))',
+    ])
+    process = subprocess.run([python, '-X', 'importtime', '-c', code], capture_output=True,
+                             text=True)
+    cost = ImportCost(str(filename))
+    cost.milliseconds, cost.modules, other = parse_importtime(process.stderr)
+    cost.printed = process.stdout.strip()
+    if process.returncode:
+        cost.error = other.strip().splitlines()[-1] if other.strip() else 'import failed'
+    return cost
+
+
+def import_costs(files: Sequence[Path], jobs: int = 4) -> List[ImportCost]:
+    """``import_cost`` of every file, ``jobs`` interpreters at a time, most expensive first."""
+    with ThreadPoolExecutor(jobs) as executor:
+        costs = list(executor.map(import_cost, files))
+    return sorted(costs, key=lambda cost: -cost.milliseconds)
+
+
+def format_costs(costs: List[ImportCost], top: int = 3) -> str:
+    lines = [f'{"file":<60} {"ms":>8}  heaviest imports']
+    for cost in costs:
+        if cost.error:
+            lines.append(f'{cost.file:<60} {"ERROR":>8}  {cost.error}')
+            continue
+        heaviest = ', '.join(f'{name} {ms:.0f}' for name, ms in cost.modules[:top])
+        lines.append(f'{cost.file:<60} {cost.milliseconds:>8.1f}  {heaviest}')
+        if cost.printed:
+            lines.append(f'{"":<60} {"":>8}  PRINTS at import: {cost.printed[:60]!r}')
+    lines.append(f'{"total":<60} {sum(cost.milliseconds for cost in costs):>8.1f}')
+    return '\n'.join(lines)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Measure the import cost of strategy files.')
+    parser.add_argument('files', nargs='*', type=Path)
+    parser.add_argument('--strategy-dir', type=Path, default=Path('user_data/strategies'))
+    parser.add_argument('--top', type=int, default=3, help='Heaviest imports shown per file.')
+    parser.add_argument('--jobs', type=int, default=4, help='Files measured in parallel.')
+    parsed = parser.parse_args(args)
+
+    files = parsed.files or sorted(parsed.strategy_dir.rglob('*.py'))
+    print(format_costs(import_costs(files, parsed.jobs), parsed.top))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+"""
+Array indicator kernels.
+
+All kernels take 1-d arrays (one series) or 2-d arrays (one series per row, e.g. the pairs
+of a ``Panel``) with time on the last axis, and return arrays of the same shape.
+Warmup candles are NaN, matching the TA-Lib / qtpylib function each kernel replaces.
+"""
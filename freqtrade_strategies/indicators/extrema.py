@@ -0,0 +1,181 @@
+"""
+Rolling minimum / maximum kernels and the channel indicators built on them.
+
+``rolling_max`` / ``rolling_min`` use the van Herk / Gil-Werman scheme: the candles are cut
+into blocks of ``window`` candles, and the running extreme from each block's start
+(prefix) and to each block's end (suffix) is one ``np.fmax.accumulate`` each. Every window
+spans at most two blocks, so its extreme is one ``fmax`` of a suffix and a prefix - three
+comparisons per candle whatever the window, on all rows of a panel at once.
+``RollingExtrema`` is the streaming form: a monotonic deque updated one candle at a time
+(amortised O(1)), for callbacks that see candles one by one.
+
+NaN values are skipped and a window needs ``min_periods`` valid values, as with pandas'
+``rolling(window, min_periods).max()``; on NaN-free data the output also equals
+``talib.MAX`` / ``talib.MIN``. Donchian channels, Ichimoku lines, Williams %R and the
+channel position are built on top, with the output of the ``ta`` library's functions.
+"""
+from collections import deque
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from freqtrade_strategies.indicators.utils import ArrayLike, Bank, as_periods, as_rows
+
+
+def _rolling_extreme(values: ArrayLike, window: int, min_periods: Optional[int],
+                     accumulate: np.ufunc) -> np.ndarray:
+    rows, squeeze = as_rows(values)
+    if window < 1:
+        raise ValueError(f'Window must be at least 1, got {window}.')
+    min_periods = window if min_periods is None else max(min_periods, 1)
+    count, length = rows.shape
+    blocks = -(-length // window)
+    padded = np.full((count, blocks * window), np.nan)
+    padded[:, :length] = rows
+    padded = padded.reshape(count, blocks, window)
+    prefix = accumulate.accumulate(padded, axis=-1).reshape(count, -1)[:, :length]
+    suffix = accumulate.accumulate(padded[..., ::-1], axis=-1)[..., ::-1]
+    suffix = suffix.reshape(count, -1)[:, :length]
+
+    # Partial windows at the start lie in the first block: its prefix. A full window ending
+    # at candle i starts at i - window + 1: the suffix of that candle's block joined with
+    # the prefix of the block holding i.
+    result = prefix.copy()
+    if length >= window:
+        accumulate(suffix[:, :length - window + 1], prefix[:, window - 1:],
+                   out=result[:, window - 1:])
+
+    missing = np.isnan(rows)
+    if not missing.any():
+        result[:, :min_periods - 1] = np.nan
+    else:
+        valid = np.cumsum(~missing, axis=1)
+        valid[:, window:] -= valid[:, :-window].copy()
+        result[valid < min_periods] = np.nan
+    return result[0] if squeeze else result
+
+
+def rolling_max(values: ArrayLike, window: int, min_periods: Optional[int] = None
+                ) -> np.ndarray:
+    """
+    Rolling maximum, same output as ``Series.rolling(window, min_periods).max()``.
+    :param values: 1-d series or 2-d array of series (rows)
+    :param window: Window length in candles
+    :param min_periods: Valid values a window needs (default ``window``)
+    :return: Array shaped like ``values``
+    """
+    return _rolling_extreme(values, window, min_periods, np.fmax)
+
+
+def rolling_min(values: ArrayLike, window: int, min_periods: Optional[int] = None
+                ) -> np.ndarray:
+    """Rolling minimum, same output as ``Series.rolling(window, min_periods).min()``."""
+    return _rolling_extreme(values, window, min_periods, np.fmin)
+
+
+def rolling_max_bank(values: ArrayLike, windows: Iterable[int]) -> Bank:
+    """
+    Rolling maxima of one series for many windows, e.g. a hyperopt range.
+    :param values: 1-d series
+    :param windows: Window lengths
+    :return: ``Bank`` of the windows' rows
+    """
+    windows = as_periods(windows)
+    return Bank(windows, np.array([rolling_max(values, window) for window in windows]))
+
+
+def rolling_min_bank(values: ArrayLike, windows: Iterable[int]) -> Bank:
+    """Rolling minima of one series for many windows, see ``rolling_max_bank``."""
+    windows = as_periods(windows)
+    return Bank(windows, np.array([rolling_min(values, window) for window in windows]))
+
+
+class RollingExtrema:
+    """
+    Streaming rolling minimum and maximum over the last ``window`` values.
+
+    Two monotonic deques hold the candidates for the minimum and the maximum; each value is
+    pushed and popped at most once, so an update is amortised O(1). NaN values count towards
+    the window but are never an extreme, as in ``rolling_min`` / ``rolling_max``.
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        if window < 1:
+            raise ValueError(f'Window must be at least 1, got {window}.')
+        self.window = window
+        self.min_periods = window if min_periods is None else max(min_periods, 1)
+        self.index = -1
+        self._lows: deque = deque()
+        self._highs: deque = deque()
+        self._valid: deque = deque()
+
+    def update(self, value: float) -> Tuple[float, float]:
+        """
+        Add the next value.
+        :return: Tuple of (minimum, maximum) of the window ending at it, NaN while the
+            window holds fewer than ``min_periods`` valid values
+        """
+        self.index += 1
+        expired = self.index - self.window
+        if not np.isnan(value):
+            while self._lows and self._lows[-1][1] >= value:
+                self._lows.pop()
+            self._lows.append((self.index, value))
+            while self._highs and self._highs[-1][1] <= value:
+                self._highs.pop()
+            self._highs.append((self.index, value))
+            self._valid.append(self.index)
+        while self._lows and self._lows[0][0] <= expired:
+            self._lows.popleft()
+        while self._highs and self._highs[0][0] <= expired:
+            self._highs.popleft()
+        while self._valid and self._valid[0] <= expired:
+            self._valid.popleft()
+        if len(self._valid) < self.min_periods:
+            return np.nan, np.nan
+        return self._lows[0][1], self._highs[0][1]
+
+
+def donchian_channel(high: ArrayLike, low: ArrayLike, window: int = 20,
+                     min_periods: Optional[int] = None
+                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Donchian channel, same output as ``ta.volatility.DonchianChannel`` (``fillna=False``).
+    :return: Tuple of (upper, middle, lower)
+    """
+    upper = rolling_max(high, window, min_periods)
+    lower = rolling_min(low, window, min_periods)
+    return upper, ((upper - lower) / 2.0) + lower, lower
+
+
+def channel_position(high: ArrayLike, low: ArrayLike, close: ArrayLike, window: int = 20,
+                     min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Position of the close in the Donchian channel, 0 at the lower and 1 at the upper band;
+    same output as ``ta.volatility.donchian_channel_pband`` (``fillna=False``).
+    """
+    upper = rolling_max(high, window, min_periods)
+    lower = rolling_min(low, window, min_periods)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (np.asarray(close, dtype=float) - lower) / (upper - lower)
+
+
+def williams_r(high: ArrayLike, low: ArrayLike, close: ArrayLike, lbp: int = 14
+               ) -> np.ndarray:
+    """Williams %R, same output as ``ta.momentum.williams_r`` (``fillna=False``)."""
+    highest = rolling_max(high, lbp)
+    lowest = rolling_min(low, lbp)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -100 * (highest - np.asarray(close, dtype=float)) / (highest - lowest)
+
+
+def ichimoku_lines(high: ArrayLike, low: ArrayLike, window1: int = 9, window2: int = 26
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ichimoku conversion (Tenkan-sen) and base (Kijun-sen) lines, same output as
+    ``ta.trend.ichimoku_conversion_line`` / ``ichimoku_base_line`` (``fillna=False``).
+    :return: Tuple of (conversion, base)
+    """
+    conversion = 0.5 * (rolling_max(high, window1) + rolling_min(low, window1))
+    base = 0.5 * (rolling_max(high, window2) + rolling_min(low, window2))
+    return conversion, base
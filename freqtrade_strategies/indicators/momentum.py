@@ -0,0 +1,294 @@
+"""
+Momentum kernels, same output as ``talib.RSI``, ``talib.CCI`` and the directional movement
+family (``talib.PLUS_DI``, ``talib.MINUS_DI``, ``talib.DX``, ``talib.ADX``).
+
+The ``*_bank`` functions compute one indicator of one series for any set of periods (a
+strategy's hyperopt ranges), sharing the per-candle work between periods.
+"""
+from dataclasses import dataclass
+from typing import Iterable, Tuple
+
+import numpy as np
+import talib
+
+from freqtrade_strategies.indicators.moving_averages import prefix_sum
+from freqtrade_strategies.indicators.utils import ArrayLike, Bank, DecayScan, as_periods, rowwise
+
+# Relative size below which TA-Lib's CCI treats the price's distance to its average, or the
+# mean deviation, as 0 (measured against ``talib.CCI``; a flat window is all rounding).
+_CCI_TOLERANCE = 1e-14
+
+
+def rsi(values: ArrayLike, period: int = 14) -> np.ndarray:
+    """Relative strength index of every row."""
+    return rowwise(talib.RSI, values, timeperiod=period)
+
+
+def rsi_bank(values: ArrayLike, periods: Iterable[int]) -> Bank:
+    """
+    ``talib.RSI`` of one series for many periods at once.
+
+    Gains and losses are computed once; Wilder's averages of them (seeded with the mean of
+    the first ``period`` changes) are solved for all periods together by ``DecayScan``, one
+    cache-sized block of candles at a time. Warmup, leading-NaN skipping and TA-Lib's zero
+    guard (RSI = 0 while there was no change, and from an interior NaN on) are reproduced;
+    values agree with TA-Lib within 1.3e-13 (measured on ten futures pairs, 1h and 5m).
+    :param values: 1-d series, e.g. ``dataframe['close']``
+    :param periods: Periods to compute (at least 2), e.g. ``self.buy_rsiTime.range``
+    :return: ``Bank`` of the periods' rows
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 1:
+        raise ValueError(f'Expected a 1-d array, got {values.ndim} dimensions.')
+    periods = as_periods(periods)
+    if periods.size and periods[0] < 2:
+        raise ValueError(f'Periods must be at least 2, got {periods[0]}.')
+    result = np.full((len(periods), len(values)), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    start = valid[0] if valid.size else len(values)
+    candles = len(values) - start
+    rows = int(np.searchsorted(periods, candles - 1, side='right'))
+    if not rows:
+        return Bank(periods, result)
+
+    # A NaN change is a gain to TA-Lib, which makes the averages NaN from there on.
+    change = np.diff(values[start:], prepend=values[start])
+    changes = (change * ~(change < 0), -change * (change < 0))
+    window = periods[:rows]
+    scans = [DecayScan((window - 1.0) / window, 1.0 / window, window) for _ in changes]
+    seeds = [np.cumsum(values[:window[-1] + 1])[window] / window for values in changes]
+    buffers = [np.empty((rows, scans[0].length)) for _ in changes]
+    out = result[:rows, start:]
+    for begin, end in scans[0].blocks(candles):
+        gain, loss = (scan.step(values[begin:end], begin, buffer[:, :end - begin], seed)
+                      for scan, values, buffer, seed in zip(scans, changes, buffers, seeds))
+        block = out[:, begin:end]
+        total = gain + loss
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(gain, total, out=block)
+        block *= 100.0
+        block[~(total != 0.0) | np.isnan(total)] = 0.0
+        if begin < window[-1]:
+            block[np.arange(begin, end) < window[:, np.newaxis]] = np.nan
+    return Bank(periods, result)
+
+
+def cci_bank(high: ArrayLike, low: ArrayLike, close: ArrayLike,
+             periods: Iterable[int]) -> Bank:
+    """
+    ``talib.CCI`` of one series for many periods at once.
+
+    The typical price and its compensated prefix sum are computed once, giving every
+    period's moving average in two subtractions. The mean deviation depends on each
+    window's own average and is accumulated lag by lag over cache-resident vectors, which
+    is as cheap as numpy gets for it. Warmup, leading-NaN skipping, NaN windows and the
+    zero guard (CCI = 0 when the price equals its average or the deviation is 0) follow
+    TA-Lib, whose guard is relative: below 1e-14 of the average either term counts as 0,
+    which also makes flat windows 0 whatever the rounding. Values agree with TA-Lib within
+    2e-10 on random walks; dividing by the small deviation of a nearly flat window
+    amplifies the rounding, up to 9.8e-8 (1e-8 relative) measured on ten futures pairs.
+    :param high: 1-d high prices
+    :param low: 1-d low prices
+    :param close: 1-d close prices
+    :param periods: Periods to compute (at least 2), e.g. ``self.buy_cciTime.range``
+    :return: ``Bank`` of the periods' rows
+    """
+    high, low, close = (np.asarray(values, dtype=float) for values in (high, low, close))
+    if high.ndim != 1:
+        raise ValueError(f'Expected 1-d arrays, got {high.ndim} dimensions.')
+    periods = as_periods(periods)
+    if periods.size and periods[0] < 2:
+        raise ValueError(f'Periods must be at least 2, got {periods[0]}.')
+    result = np.full((len(periods), len(high)), np.nan)
+    typical = (high + low + close) / 3
+    valid = np.flatnonzero(~np.isnan(typical))
+    start = valid[0] if valid.size else len(high)
+    typical = typical[start:]
+    candles = len(typical)
+    # NaNs are summed as 0 here; the deviation below turns their windows NaN.
+    total, error = prefix_sum(np.nan_to_num(typical), compensated=True)
+
+    deviation = np.empty(candles)
+    difference = np.empty(candles)
+    for row, period in enumerate(periods):
+        if period > candles:
+            break
+        size = candles - period + 1
+        average = ((total[period:] - total[:-period]) + (error[period:] - error[:-period]))
+        average /= period
+        summed, part = deviation[:size], difference[:size]
+        summed[:] = 0.0
+        for lag in range(period):
+            np.subtract(typical[period - 1 - lag:candles - lag], average, out=part)
+            np.abs(part, out=part)
+            summed += part
+        summed /= period
+
+        target = result[row, start + period - 1:]
+        np.subtract(typical[period - 1:], average, out=target)
+        tolerance = _CCI_TOLERANCE * np.abs(average)
+        zero = (np.abs(target) < tolerance) | (summed < tolerance)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            target /= 0.015 * summed
+        target[zero] = 0.0
+    return Bank(periods, result)
+
+
+def plus_di(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    """Plus directional indicator of every row."""
+    return rowwise(talib.PLUS_DI, high, low, close, timeperiod=period)
+
+
+def minus_di(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    """Minus directional indicator of every row."""
+    return rowwise(talib.MINUS_DI, high, low, close, timeperiod=period)
+
+
+def adx(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    """Average directional movement index of every row."""
+    return rowwise(talib.ADX, high, low, close, timeperiod=period)
+
+
+@dataclass
+class DirectionalBank:
+    """The directional movement family of one series for many periods, one ``Bank`` each."""
+    plus_di: Bank
+    minus_di: Bank
+    dx: Bank
+    adx: Bank
+
+
+def directional_movement(high: np.ndarray, low: np.ndarray,
+                         close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    True range, plus and minus directional movement of every candle, as TA-Lib defines them.
+
+    NaNs propagate as with TA-Lib where it matters: a NaN high or low makes the true range
+    (and so every smoothed value after it) NaN, a NaN previous close is ignored by the true
+    range. The first candle has no predecessor and gets zeros.
+    :return: Tuple of (true_range, plus_dm, minus_dm), each as long as the inputs
+    """
+    true_range, plus_dm, minus_dm = (np.zeros(len(high)) for _ in range(3))
+    up, down, ranges = plus_dm[1:], minus_dm[1:], true_range[1:]
+    np.subtract(high[1:], high[:-1], out=up)
+    np.subtract(low[:-1], low[1:], out=down)
+    lower = (down > 0) & (up < down)
+    higher = (up > 0) & (up > down)
+    up *= higher
+    down *= lower
+
+    # ``fmax`` keeps the range when a gap is NaN, as TA-Lib's comparisons do; a NaN range
+    # itself stays NaN in TA-Lib and is restored afterwards.
+    np.subtract(high[1:], low[1:], out=ranges)
+    missing = np.isnan(ranges)
+    gap = np.empty(len(ranges))
+    for extreme in (high[1:], low[1:]):
+        np.subtract(extreme, close[:-1], out=gap)
+        np.abs(gap, out=gap)
+        np.fmax(ranges, gap, out=ranges)
+    if missing.any():
+        ranges[missing] = np.nan
+    return true_range, plus_dm, minus_dm
+
+
+def directional_bank(high: ArrayLike, low: ArrayLike, close: ArrayLike,
+                     periods: Iterable[int]) -> DirectionalBank:
+    """
+    ``talib.PLUS_DI``, ``talib.MINUS_DI``, ``talib.DX`` and ``talib.ADX`` of one series for
+    many periods at once.
+
+    True range and directional movement are computed once; each period then only costs
+    Wilder's smoothing of them (seeded with the sum of the first ``period - 1`` candles)
+    and of DX (seeded with the mean of the first ``period`` values), solved for all periods
+    together by ``DecayScan`` in one pass over cache-sized blocks of candles.
+
+    Warmup (``period`` candles for the DIs and DX, ``2 * period - 1`` for ADX), leading-NaN
+    skipping and the zero guards (DI = 0 while the smoothed true range is 0, DX = 0 while
+    both DIs are, DX and ADX frozen after a NaN high or low) follow TA-Lib. Values agree
+    with TA-Lib within 2.2e-13 on the 0-100 scale (measured on ten futures pairs, 1h and
+    5m, periods 2-200); ``tests/test_momentum.py`` holds them to 1e-12.
+    :param high: 1-d high prices
+    :param low: 1-d low prices
+    :param close: 1-d close prices
+    :param periods: Periods to compute (at least 2), e.g. ``self.adx_period.range``
+    :return: ``DirectionalBank`` with one ``Bank`` per indicator
+    """
+    high, low, close = (np.asarray(values, dtype=float) for values in (high, low, close))
+    if high.ndim != 1:
+        raise ValueError(f'Expected 1-d arrays, got {high.ndim} dimensions.')
+    periods = as_periods(periods)
+    if periods.size and periods[0] < 2:
+        raise ValueError(f'Periods must be at least 2, got {periods[0]}.')
+    results = [np.full((len(periods), len(high)), np.nan) for _ in range(4)]
+    bank = DirectionalBank(*(Bank(periods, values) for values in results))
+    valid = np.flatnonzero(~(np.isnan(high) | np.isnan(low) | np.isnan(close)))
+    start = valid[0] if valid.size else len(high)
+    movement = directional_movement(high[start:], low[start:], close[start:])
+    candles = len(high) - start
+
+    # DIs and DX need ``period + 1`` candles, ADX ``2 * period``.
+    rows = int(np.searchsorted(periods, candles - 1, side='right'))
+    averaged = int(np.searchsorted(periods, candles // 2, side='right'))
+    if not rows:
+        return bank
+    window = periods[:rows]
+    decay = 1.0 - 1.0 / window
+    smoothing = [DecayScan(decay, np.ones(rows), window - 1) for _ in movement]
+    seeds = [np.cumsum(values[:window[-1]])[window - 1] for values in movement]
+    averaging = DecayScan(decay[:averaged], 1.0 / window[:averaged],
+                          2 * window[:averaged] - 1) if averaged else None
+    averaging_seeds = np.zeros(averaged)
+    dx_sums = np.zeros((averaged, 1))
+    buffers = [np.empty((rows, smoothing[0].length)) for _ in movement]
+    plus_di, minus_di, dx, adx = (values[:rows, start:] for values in results)
+
+    # One pass over cache-sized blocks of candles, each going through every step at once.
+    for begin, end in smoothing[0].blocks(candles):
+        true_range, plus_dm, minus_dm = (
+            scan.step(values[begin:end], begin, buffer[:, :end - begin], seed)
+            for scan, values, buffer, seed in zip(smoothing, movement, buffers, seeds))
+        block = slice(begin, end)
+        warmup = np.arange(begin, end) < window[:, np.newaxis] if begin < window[-1] else None
+        flat = None if true_range.all() else true_range == 0.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for target, smoothed in ((plus_di[:, block], plus_dm), (minus_di[:, block], minus_dm)):
+                np.divide(smoothed, true_range, out=target)
+                target *= 100.0
+                if flat is not None:
+                    target[flat] = 0.0
+            total = minus_di[:, block] + plus_di[:, block]
+            movement_index = dx[:, block]
+            np.subtract(minus_di[:, block], plus_di[:, block], out=movement_index)
+            np.abs(movement_index, out=movement_index)
+            movement_index /= total
+            movement_index *= 100.0
+            if not total.all():
+                movement_index[total == 0.0] = 0.0
+        if warmup is not None:
+            for target in (plus_di, minus_di, dx):
+                target[:, block][warmup] = np.nan
+
+        if averaging is not None:
+            if begin <= averaging.seed.max():
+                # ADX starts with the mean of the first ``period`` DX values.
+                sums = dx_sums + np.cumsum(np.nan_to_num(dx[:averaged, block]), axis=1)
+                dx_sums = sums[:, -1:]
+                seeding = np.flatnonzero((averaging.seed >= begin) & (averaging.seed < end))
+                averaging_seeds[seeding] = (sums[seeding, averaging.seed[seeding] - begin]
+                                            / window[seeding])
+            averaging.step(dx[:averaged, block], begin, adx[:averaged, block], averaging_seeds)
+
+    missing = np.isnan(movement[0])
+    if missing.any():
+        # TA-Lib's zero guards also catch the NaN smoothed true range that follows a NaN high
+        # or low: from there on the DIs are 0 and DX and ADX keep their last value.
+        frozen = int(missing.argmax())
+        for row, period in enumerate(window):
+            begin = max(frozen, period)
+            plus_di[row, begin:] = minus_di[row, begin:] = 0.0
+            dx[row, begin:] = dx[row, frozen - 1] if frozen > period else 0.0
+            if row < averaged:
+                begin = max(frozen, 2 * period - 1)
+                adx[row, begin:] = (adx[row, frozen - 1] if frozen > 2 * period - 1
+                                    else averaging_seeds[row])
+    return bank
@@ -0,0 +1,192 @@
+"""
+Panel of aligned candles (pairs x candles x OHLCV) for computing indicators of all pairs
+in one vectorized call.
+
+Every kernel in ``freqtrade_strategies.indicators`` accepts 2-d arrays with one pair per
+row, so ``ema(panel.close, 20)`` computes the EMA of every pair in one call - without the
+per-pair ``talib.abstract`` wrapping and column inserts of a ``populate_indicators`` loop.
+``PanelIndicatorsMixin`` wires this into a strategy: indicators are computed once for the
+whole whitelist and ``populate_indicators`` only slices out the rows of its pair.
+"""
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+logger = logging.getLogger(__name__)
+
+OHLCV_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class Panel:
+    """
+    Candles of several pairs on one date axis, stored as a float array of shape
+    (pairs, candles, fields). Pairs without data for a date hold NaN there - the kernels
+    skip leading NaNs per pair, so pairs listed later than others are handled.
+    """
+
+    def __init__(self, pairs: Sequence[str], dates: pd.DatetimeIndex, values: np.ndarray,
+                 fields: Sequence[str] = OHLCV_FIELDS) -> None:
+        if values.shape != (len(pairs), len(dates), len(fields)):
+            raise ValueError(f'Panel values have shape {values.shape}, expected '
+                             f'{(len(pairs), len(dates), len(fields))}.')
+        self.pairs: List[str] = list(pairs)
+        self.dates = dates
+        self.values = values
+        self.fields: List[str] = list(fields)
+        self._pair_index = {pair: i for i, pair in enumerate(self.pairs)}
+
+    @classmethod
+    def from_dataframes(cls, data: Dict[str, DataFrame],
+                        fields: Sequence[str] = OHLCV_FIELDS) -> 'Panel':
+        """
+        Align the dataframes of ``data`` (pair -> freqtrade OHLCV dataframe) on the union
+        of their dates.
+        """
+        pairs = list(data)
+        frames = [data[pair] for pair in pairs]
+        dates = pd.DatetimeIndex(frames[0]['date']) if frames else pd.DatetimeIndex([])
+        if any(not dates.equals(pd.DatetimeIndex(df['date'])) for df in frames[1:]):
+            for df in frames[1:]:
+                dates = dates.union(pd.DatetimeIndex(df['date']))
+
+        # Field-major memory layout: every field is one contiguous (pairs x candles) block.
+        values = np.full((len(fields), len(pairs), len(dates)), np.nan).transpose(1, 2, 0)
+        for row, df in enumerate(frames):
+            positions = slice(None) if len(df) == len(dates) else dates.get_indexer(df['date'])
+            for i, field in enumerate(fields):
+                values[row, positions, i] = df[field].to_numpy(dtype=float)
+        return cls(pairs, dates, values, fields)
+
+    def __contains__(self, pair: str) -> bool:
+        return pair in self._pair_index
+
+    def field(self, name: str) -> np.ndarray:
+        """(pairs x candles) view of one field."""
+        return self.values[:, :, self.fields.index(name)]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.field('open')
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.field('high')
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.field('low')
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.field('close')
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.field('volume')
+
+    def pair_columns(self, pair: str, indicators: Dict[str, np.ndarray],
+                     dates: Optional[pd.Series] = None) -> Optional[DataFrame]:
+        """
+        Rows of ``pair`` from panel-shaped ``indicators``, as a DataFrame.
+        :param dates: Dates to select (the ``date`` column of the pair's dataframe).
+            Defaults to all panel dates.
+        :return: DataFrame with one column per indicator, or None if the panel does not
+            cover ``pair`` on all ``dates``.
+        """
+        row = self._pair_index.get(pair)
+        if row is None:
+            return None
+        if dates is None:
+            selected = slice(None)
+        else:
+            positions = self.dates.get_indexer(pd.DatetimeIndex(dates))
+            if len(positions) == 0 or (positions < 0).any():
+                return None
+            start = positions[0]
+            contiguous = positions[-1] - start + 1 == len(positions)
+            # Contiguous dates (the usual case) select a view instead of a copy.
+            selected = slice(start, positions[-1] + 1) if contiguous else positions
+        return DataFrame({name: values[row, selected] for name, values in indicators.items()})
+
+
+def _fingerprint(dataframe: DataFrame) -> Tuple:
+    dates = dataframe['date']
+    return (len(dates), dates.iloc[0], dates.iloc[-1]) if len(dates) else (0,)
+
+
+class PanelIndicatorsMixin:
+    """
+    Strategy mixin computing indicators for all pairs at once.
+
+    Implement ``populate_panel_indicators`` and call ``merge_panel_indicators`` from
+    ``populate_indicators``::
+
+        class MyStrategy(PanelIndicatorsMixin, IStrategy):
+            def populate_panel_indicators(self, panel: Panel) -> Dict[str, np.ndarray]:
+                return {'ema_20': ema(panel.close, 20), 'atr': atr(panel.high, panel.low,
+                                                                   panel.close, 14)}
+
+            def populate_indicators(self, dataframe, metadata):
+                dataframe = self.merge_panel_indicators(dataframe, metadata)
+                ...
+
+    Backtesting and hyperopt hand all pairs to ``advise_all_indicators`` - the panel is built
+    from that data. Every other dataframe - a new candle in dry / live runs, or the shorter
+    histories of the warmup and lookahead tools - does not match the dataframe the panel
+    holds for its pair (same length, first and last date), and the panel is rebuilt from
+    it and the whitelist via the dataprovider. Indicators are therefore never served from a
+    longer history than the dataframe's own.
+    """
+    _panel: Optional[Panel] = None
+    _panel_indicators: Dict[str, np.ndarray] = {}
+    # Fingerprint of the dataframe each pair of the panel was built from.
+    _panel_sources: Dict[str, Tuple] = {}
+
+    def populate_panel_indicators(self, panel: Panel) -> Dict[str, np.ndarray]:
+        """
+        Compute indicators for every pair of ``panel``.
+        :return: Mapping of column name to (pairs x candles) array
+        """
+        raise NotImplementedError('populate_panel_indicators must be implemented.')
+
+    def _build_panel(self, data: Dict[str, DataFrame]) -> None:
+        self._panel = Panel.from_dataframes(data)
+        self._panel_sources = {pair: _fingerprint(df) for pair, df in data.items()}
+        self._panel_indicators = self.populate_panel_indicators(self._panel)
+
+    def advise_all_indicators(self, data: Dict[str, DataFrame]) -> Dict[str, DataFrame]:
+        self._build_panel(data)
+        return super().advise_all_indicators(data)
+
+    def merge_panel_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """Attach the panel indicator columns of ``metadata['pair']`` to ``dataframe``."""
+        pair = metadata['pair']
+        columns = None
+        if self._panel_sources.get(pair) == _fingerprint(dataframe):
+            columns = self._panel_columns(pair, dataframe)
+        if columns is None:
+            self._refresh_panel(pair, dataframe)
+            columns = self._panel_columns(pair, dataframe)
+        columns.index = dataframe.index
+        return pd.concat([dataframe, columns], axis=1)
+
+    def _panel_columns(self, pair: str, dataframe: DataFrame) -> Optional[DataFrame]:
+        if self._panel is None:
+            return None
+        return self._panel.pair_columns(pair, self._panel_indicators, dataframe['date'])
+
+    def _refresh_panel(self, pair: str, dataframe: DataFrame) -> None:
+        data = {}
+        if getattr(self, 'dp', None) is not None:
+            for whitelisted in self.dp.current_whitelist():
+                if whitelisted != pair:
+                    pair_data = self.dp.get_pair_dataframe(whitelisted, self.timeframe)
+                    if not pair_data.empty:
+                        data[whitelisted] = pair_data
+        data[pair] = dataframe
+        logger.debug(f'Building indicator panel for {len(data)} pairs.')
+        self._build_panel(data)
@@ -0,0 +1,58 @@
+"""
+Candlestick patterns from TA-Lib's ``CDL*`` functions, computed as one block.
+
+Calling the patterns through ``talib.abstract`` converts the dataframe to arrays on every
+call, and adding their results column by column fragments the dataframe. ``pattern_matrix``
+converts the OHLC series to float64 arrays once, calls every ``talib.CDL*`` function on them
+and writes the outputs into one integer matrix; ``add_patterns`` attaches that matrix to a
+dataframe with a single ``pd.concat``.
+"""
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import talib
+from pandas import DataFrame
+
+from freqtrade_strategies.indicators.utils import ArrayLike
+
+
+def all_patterns() -> Tuple[str, ...]:
+    """:return: Names of all TA-Lib pattern functions, in TA-Lib's order"""
+    return tuple(talib.get_function_groups()['Pattern Recognition'])
+
+
+def pattern_matrix(open_: ArrayLike, high: ArrayLike, low: ArrayLike, close: ArrayLike,
+                   patterns: Optional[Iterable[str]] = None) -> np.ndarray:
+    """
+    Evaluate many candlestick patterns of one OHLC series at once.
+
+    Outputs are TA-Lib's: 0, +-100 and, for a few patterns, +-80 (weaker engulfing/harami)
+    or +-200 (confirmed hikkake), so the matrix is int16 rather than TA-Lib's int32.
+    :param open_: Open prices
+    :param high: High prices
+    :param low: Low prices
+    :param close: Close prices
+    :param patterns: TA-Lib function names, e.g. ``['CDLDOJI', 'CDLHAMMER']`` (default all)
+    :return: int16 array of shape (patterns, candles), one row per pattern in order
+    """
+    patterns = all_patterns() if patterns is None else tuple(patterns)
+    arrays = [np.asarray(series, dtype=np.float64) for series in (open_, high, low, close)]
+    result = np.empty((len(patterns), len(arrays[3])), dtype=np.int16)
+    for row, name in enumerate(patterns):
+        result[row] = getattr(talib, name)(*arrays)
+    return result
+
+
+def add_patterns(dataframe: DataFrame, patterns: Optional[Iterable[str]] = None) -> DataFrame:
+    """
+    Add one column per candlestick pattern (named like the TA-Lib function) in one block.
+    :param dataframe: Candle dataframe with open, high, low and close
+    :param patterns: TA-Lib function names (default all)
+    :return: New dataframe; existing columns of the same names are replaced
+    """
+    patterns = all_patterns() if patterns is None else tuple(patterns)
+    values = pattern_matrix(dataframe['open'], dataframe['high'], dataframe['low'],
+                            dataframe['close'], patterns)
+    block = DataFrame(values.T, index=dataframe.index, columns=list(patterns), copy=False)
+    return pd.concat([dataframe.drop(columns=block.columns, errors='ignore'), block], axis=1)
@@ -0,0 +1,76 @@
+"""
+Run-length counters of candle sequences.
+
+Sequence patterns are commonly written as chains of ``shift()`` comparisons - eight green
+candles as nine ``open.shift(k) < close.shift(k)`` terms, a V bottom as five chained
+``average.shift(k)`` comparisons - each term allocating shifted copies of its columns.
+``run_length`` instead counts, in one pass, how many consecutive candles up to each candle
+met a condition, so that "N green candles in a row" is ``green_run(open, close) >= N`` and
+"N falling, then one rising" is ``run_before(falling(x), rising(x)) >= N``, whatever N.
+
+Comparisons with NaN are false, as with the shift chains: a NaN candle ends every run.
+"""
+import numpy as np
+
+from freqtrade_strategies.indicators.utils import ArrayLike
+
+
+def run_length(condition: ArrayLike) -> np.ndarray:
+    """
+    Number of consecutive candles, up to and including each candle, where ``condition`` holds.
+    :param condition: Boolean array, e.g. ``dataframe['close'] > dataframe['open']``
+    :return: int array, 0 where ``condition`` is false
+    """
+    condition = np.asarray(condition, dtype=bool)
+    index = np.arange(condition.shape[-1])
+    last_break = np.maximum.accumulate(np.where(condition, -1, index), axis=-1)
+    return index - last_break
+
+
+def run_before(condition: ArrayLike, then: ArrayLike) -> np.ndarray:
+    """
+    Length of the ``condition`` run that ended on the previous candle, where ``then`` holds.
+    :param condition: Boolean array of the run, e.g. ``falling(values)``
+    :param then: Boolean array of the candle after the run, e.g. ``rising(values)``
+    :return: int array, 0 where ``then`` is false (and on the first candle)
+    """
+    run = run_length(condition)
+    result = np.zeros_like(run)
+    result[..., 1:] = np.where(np.asarray(then, dtype=bool)[..., 1:], run[..., :-1], 0)
+    return result
+
+
+def rising(values: ArrayLike) -> np.ndarray:
+    """:return: Boolean array, true where the value is above the previous candle's"""
+    values = np.asarray(values, dtype=float)
+    result = np.zeros(values.shape, dtype=bool)
+    np.greater(values[..., 1:], values[..., :-1], out=result[..., 1:])
+    return result
+
+
+def falling(values: ArrayLike) -> np.ndarray:
+    """:return: Boolean array, true where the value is below the previous candle's"""
+    values = np.asarray(values, dtype=float)
+    result = np.zeros(values.shape, dtype=bool)
+    np.less(values[..., 1:], values[..., :-1], out=result[..., 1:])
+    return result
+
+
+def rising_run(values: ArrayLike) -> np.ndarray:
+    """:return: Number of consecutive rises of ``values`` up to each candle"""
+    return run_length(rising(values))
+
+
+def falling_run(values: ArrayLike) -> np.ndarray:
+    """:return: Number of consecutive falls of ``values`` up to each candle"""
+    return run_length(falling(values))
+
+
+def green_run(open_: ArrayLike, close: ArrayLike) -> np.ndarray:
+    """:return: Number of consecutive green candles (close above open) up to each candle"""
+    return run_length(np.asarray(open_, dtype=float) < np.asarray(close, dtype=float))
+
+
+def red_run(open_: ArrayLike, close: ArrayLike) -> np.ndarray:
+    """:return: Number of consecutive red candles (close below open) up to each candle"""
+    return run_length(np.asarray(open_, dtype=float) > np.asarray(close, dtype=float))
@@ -0,0 +1,276 @@
+"""
+Shape handling shared by the indicator kernels.
+"""
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Index, Series
+
+
+ArrayLike = Union[np.ndarray, Series]
+
+
+def as_rows(values: ArrayLike) -> Tuple[np.ndarray, bool]:
+    """
+    Convert ``values`` to a 2-d float array with one series per row.
+    :return: Tuple of (rows, was_1d)
+    """
+    rows = np.asarray(values, dtype=float)
+    if rows.ndim == 1:
+        return rows[np.newaxis, :], True
+    if rows.ndim != 2:
+        raise ValueError(f'Expected a 1-d or 2-d array, got {rows.ndim} dimensions.')
+    return rows, False
+
+
+def rowwise(function: Callable[..., Union[np.ndarray, Tuple[np.ndarray, ...]]],
+            *inputs: ArrayLike, outputs: int = 1, **kwargs):
+    """
+    Apply a TA-Lib function (or any function of 1-d arrays) to every row of the inputs.
+
+    TA-Lib's function API is far cheaper per call than ``talib.abstract`` on a DataFrame,
+    so looping it over rows keeps indicator cost close to the bare C computation.
+    :param function: Function taking one 1-d array per input and returning ``outputs`` arrays
+    :param inputs: Input series, 1-d or 2-d, all of the same shape
+    :param outputs: Number of arrays ``function`` returns
+    :param kwargs: Passed to ``function``, e.g. ``timeperiod``
+    :return: Array(s) shaped like the inputs
+    """
+    converted = [as_rows(values) for values in inputs]
+    rows = [values for values, _ in converted]
+    squeeze = converted[0][1]
+
+    results = [np.empty(rows[0].shape) for _ in range(outputs)]
+    for i in range(rows[0].shape[0]):
+        result = function(*[np.ascontiguousarray(values[i]) for values in rows], **kwargs)
+        if outputs == 1:
+            result = (result, )
+        for target, values in zip(results, result):
+            target[i] = values
+
+    if squeeze:
+        results = [values[0] for values in results]
+    return results[0] if outputs == 1 else tuple(results)
+
+
+def first_valid(*rows: np.ndarray) -> np.ndarray:
+    """Index of the first candle where all inputs are non-NaN, per row (``n`` if none)."""
+    valid = ~np.isnan(rows[0])
+    for other in rows[1:]:
+        valid &= ~np.isnan(other)
+    if valid.shape[1] == 0:
+        return np.zeros(valid.shape[0], dtype=int)
+    start = valid.argmax(axis=1)
+    start[~valid.any(axis=1)] = valid.shape[1]
+    return start
+
+
+def by_start(kernel: Callable[..., Union[np.ndarray, Tuple[np.ndarray, ...]]],
+             *inputs: ArrayLike, outputs: int = 1):
+    """
+    Run a vectorized ``kernel`` on 2-d inputs, skipping leading NaNs the way TA-Lib does.
+
+    Rows are grouped by their first valid candle so the kernel always sees NaN-free
+    starts; for aligned data (the usual case) this is a single call over all rows.
+    :param kernel: Function of 2-d arrays returning one (or ``outputs``) 2-d arrays
+    :param inputs: Input series, 1-d or 2-d, all of the same shape
+    :param outputs: Number of arrays ``kernel`` returns
+    :return: Array(s) shaped like the inputs
+    """
+    converted = [as_rows(values) for values in inputs]
+    rows = [values for values, _ in converted]
+    squeeze = converted[0][1]
+    start = first_valid(*rows)
+
+    if not start.any():
+        # Aligned, NaN-free starts: no regrouping or copying needed.
+        results = kernel(*rows)
+        results = [results] if outputs == 1 else list(results)
+    else:
+        results = [np.full(rows[0].shape, np.nan) for _ in range(outputs)]
+        for offset in np.unique(start):
+            if offset >= rows[0].shape[1]:
+                continue
+            selected = np.flatnonzero(start == offset)
+            result = kernel(*[values[selected, offset:] for values in rows])
+            if outputs == 1:
+                result = (result, )
+            for target, values in zip(results, result):
+                target[selected, offset:] = values
+
+    if squeeze:
+        results = [values[0] for values in results]
+    return results[0] if outputs == 1 else tuple(results)
+
+
+# Largest factor the in-block rescaling of ``decay_scan`` may reach; keeps the block scan far
+# from overflow while allowing blocks of a few hundred candles even for decay 1/3.
+_MAX_SCALE = 1e150
+
+
+class DecayScan:
+    """
+    Block-wise solver of ``y[t] = decay * y[t-1] + scale * x[t]`` for many rows at once.
+
+    Row ``k`` starts at ``y[seed[k]] = seed value`` and is NaN before. This is the
+    recurrence of EMAs and of Wilder's smoothing; inside a block of ``length`` candles it is
+    ``y = d**j * cumsum(s * x / d**j) + d**(j+1) * y_before``, so each block is one cumsum
+    over a (rows x length) array, with ``length`` short enough that ``d**-length`` cannot
+    overflow. Blocks are fed in order with ``step``, which lets callers fuse further work
+    on each block while it is in cache; ``decay_scan`` runs all blocks at once.
+    """
+
+    def __init__(self, decay: np.ndarray, scale: np.ndarray, seed: np.ndarray):
+        """
+        :param decay: Decay per row, in (0, 1)
+        :param scale: Input factor per row
+        :param seed: Candle at which each row starts
+        """
+        self.decay = np.asarray(decay, dtype=float)[:, np.newaxis]
+        self.seed = np.asarray(seed, dtype=int)
+        self.length = int(np.log(_MAX_SCALE) / -np.log(self.decay.min())) + 1
+        steps = np.arange(self.length)
+        self.growth = np.asarray(scale, dtype=float)[:, np.newaxis] * self.decay ** -steps
+        self.shrink = self.decay ** steps
+        self.carried = self.shrink * self.decay
+        self.carry = np.zeros((len(self.decay), 1))
+
+    def blocks(self, total: int, begin: int = 0) -> Iterator[Tuple[int, int]]:
+        """(begin, end) of the blocks covering candles ``begin`` to ``total``."""
+        for start in range(begin, total, self.length):
+            yield start, min(start + self.length, total)
+
+    def step(self, inputs: np.ndarray, begin: int, out: np.ndarray,
+             seed_values: np.ndarray) -> np.ndarray:
+        """
+        Solve the next block, starting at candle ``begin`` (blocks must be consecutive).
+        :param inputs: Block of a NaN-free series shared by all rows, or one per row
+        :param begin: First candle of the block
+        :param out: (rows x block) array to write to
+        :param seed_values: Value of each row at its seed; only read for rows seeded here
+        :return: ``out``
+        """
+        size = out.shape[1]
+        end = begin + size
+        np.multiply(self.growth[:, :size], inputs, out=out)
+        seeding = begin <= self.seed.max()
+        if seeding:
+            # Seeding block(s): nothing before the seed, the seed value itself at the seed.
+            warmup = np.arange(begin, end) < self.seed[:, np.newaxis]
+            out[warmup] = 0.0
+            rows = np.flatnonzero((self.seed >= begin) & (self.seed < end))
+            offset = self.seed[rows] - begin
+            out[rows, offset] = seed_values[rows] * self.decay[rows, 0] ** -offset
+        np.cumsum(out, axis=1, out=out)
+        out *= self.shrink[:, :size]
+        out += self.carried[:, :size] * self.carry
+        self.carry = out[:, -1:].copy()
+        if seeding:
+            out[warmup] = np.nan
+        return out
+
+
+def decay_scan(inputs: np.ndarray, decay: np.ndarray, scale: np.ndarray, seed: np.ndarray,
+               seed_values: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Solve ``y[t] = decay * y[t-1] + scale * x[t]`` for many rows at once, see ``DecayScan``.
+    :param inputs: NaN-free 1-d series shared by all rows, or a 2-d array with one per row
+    :param decay: Decay per row, in (0, 1)
+    :param scale: Input factor per row
+    :param seed: Candle at which each row starts
+    :param seed_values: Value of each row at its seed
+    :param out: (rows x candles) array to write to
+    :return: ``out``
+    """
+    scan = DecayScan(decay, scale, seed)
+    seed_values = np.asarray(seed_values, dtype=float)
+    first = int(scan.seed.min())
+    out[:, :first] = np.nan
+    for begin, end in scan.blocks(out.shape[1], first):
+        scan.step(inputs[..., begin:end], begin, out[:, begin:end], seed_values)
+    return out
+
+
+def as_periods(periods: Iterable[int]) -> np.ndarray:
+    """Sorted, de-duplicated periods (``IntParameter.range`` or any iterable) as an int array."""
+    result = np.unique(np.fromiter((int(period) for period in periods), dtype=int))
+    if result.size and result[0] < 1:
+        raise ValueError(f'Periods must be at least 1, got {result[0]}.')
+    return result
+
+
+class Bank:
+    """
+    One indicator for many periods: a (periods x candles) array whose rows are addressed
+    by period.
+
+    ``bank[21]`` is a view of the row for period 21. ``bank.assign(dataframe, 'EMA_{}')``
+    adds one column per period in a single concat instead of one insertion per period,
+    which is what makes filling a strategy's hyperopt ranges cheap.
+    """
+
+    def __init__(self, periods: Sequence[int], values: np.ndarray):
+        self.periods = np.asarray(periods, dtype=int)
+        self.values = values
+        self._rows = {int(period): i for i, period in enumerate(self.periods)}
+        if len(self._rows) != len(self.periods) or values.shape[0] != len(self.periods):
+            raise ValueError('Expected one row per distinct period.')
+
+    def __getitem__(self, period: int) -> np.ndarray:
+        return self.values[self._rows[int(period)]]
+
+    def __contains__(self, period: int) -> bool:
+        return int(period) in self._rows
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _named(self, name: Union[str, Dict[str, int]],
+               periods: Optional[Iterable[int]]) -> List[Tuple[str, int]]:
+        """(column, period) pairs from a name template or an explicit column -> period dict."""
+        if isinstance(name, dict):
+            return [(column, int(period)) for column, period in name.items()]
+        periods = self._rows if periods is None else periods
+        return [(name.format(period), int(period)) for period in periods]
+
+    def columns(self, name: Union[str, Dict[str, int]],
+                periods: Optional[Iterable[int]] = None) -> Dict[str, np.ndarray]:
+        """
+        Row views keyed by column name.
+        :param name: Column name template, formatted with the period, e.g. ``'ema_{}'``,
+            or a dict of column name to period, e.g. ``{'resample_sma': 100}``
+        :param periods: Subset of the bank's periods (default all; ignored for a dict)
+        :return: Dict of column name to 1-d view
+        """
+        return {column: self[period] for column, period in self._named(name, periods)}
+
+    def frame(self, name: Union[str, Dict[str, int]], periods: Optional[Iterable[int]] = None,
+              index: Optional[Index] = None) -> DataFrame:
+        """
+        The bank as a DataFrame with one column per period, sharing the bank's memory
+        when all periods are taken in order.
+        :param name: Column name template or dict of column name to period, see ``columns``
+        :param periods: Subset of the bank's periods (default all; ignored for a dict)
+        :param index: Index of the frame, e.g. the strategy dataframe's
+        """
+        named = self._named(name, periods)
+        rows = [self._rows[period] for _, period in named]
+        values = self.values if rows == list(range(len(self))) else self.values[rows]
+        return DataFrame(values.T, index=index, copy=False,
+                         columns=[column for column, _ in named])
+
+    def assign(self, dataframe: DataFrame, name: Union[str, Dict[str, int]],
+               periods: Optional[Iterable[int]] = None) -> DataFrame:
+        """
+        Add the bank's columns to ``dataframe`` (replacing existing ones of the same name).
+        :param dataframe: Candle dataframe, with the bank's candles as rows
+        :param name: Column name template or dict of column name to period, see ``columns``
+        :param periods: Subset of the bank's periods (default all; ignored for a dict)
+        :return: New dataframe; assign it back as with ``merge_informative_pair``
+        """
+        block = self.frame(name, periods, dataframe.index)
+        return pd.concat([dataframe.drop(columns=block.columns, errors='ignore'), block], axis=1)
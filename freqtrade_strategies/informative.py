@@ -0,0 +1,178 @@
+"""
+Market context: informative pairs computed once and shared by every traded pair.
+
+Informative data of a fixed asset (``BTC/USDT`` 15m with an SMA, ``BTC/{stake}`` 1h RSI, ...)
+is identical for every pair in the whitelist, yet ``populate_indicators`` recomputes and
+re-merges it once per pair. ``MarketContext`` computes each (asset, timeframe, candle type,
+populate function) once per new informative candle, aligns the result to the strategy's
+candle dates once per date axis, and hands the same read-only columns to every pair.
+
+Usage in a strategy::
+
+    class MyStrategy(MarketContextMixin, IStrategy):
+        def populate_indicators(self, dataframe, metadata):
+            dataframe = self.market_context.merge(dataframe, 'BTC/USDT', '15m', self.btc_15m)
+            ...
+
+        @staticmethod
+        def btc_15m(informative: DataFrame) -> DataFrame:
+            informative['sma20'] = informative['close'].rolling(20).mean()
+            return informative
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from freqtrade.exchange import timeframe_to_minutes
+
+
+try:
+    from freqtrade.strategy.informative_decorator import InformativeCache
+except ImportError:
+    InformativeCache = None
+
+
+logger = logging.getLogger(__name__)
+
+PopulateInformative = Callable[[DataFrame], DataFrame]
+
+
+@dataclass
+class _ContextEntry:
+    fingerprint: Tuple[Any, ...]
+    informative: DataFrame
+    date_merge: np.ndarray
+    aligned: Dict[Tuple[Any, ...], DataFrame] = field(default_factory=dict)
+
+
+class MarketContext:
+    """
+    Cache of populated informative dataframes and their alignments to the base timeframe.
+
+    Entries are keyed by (asset, timeframe, candle type, populate function) and recomputed
+    when the informative dataframe gains a candle. Alignments are keyed by the date axis
+    of the base dataframe - pairs sharing the same candles share one aligned block.
+    """
+
+    def __init__(self, dp, timeframe: str, max_alignments: int = 8) -> None:
+        self.dp = dp
+        self.timeframe = timeframe
+        self.max_alignments = max_alignments
+        self._entries: Dict[Hashable, _ContextEntry] = {}
+
+    def informative(self, asset: str, timeframe: str, populate: Optional[PopulateInformative],
+                    candle_type: str = '') -> DataFrame:
+        """
+        Populated informative dataframe of ``asset`` - computed at most once per candle.
+        The returned dataframe is shared: do not modify it.
+        """
+        return self._entry(asset, timeframe, populate, candle_type).informative
+
+    def _entry(self, asset: str, timeframe: str, populate: Optional[PopulateInformative],
+               candle_type: str) -> _ContextEntry:
+        source = self.dp.get_pair_dataframe(pair=asset, timeframe=timeframe,
+                                            candle_type=candle_type)
+        fingerprint = (len(source), source['date'].iloc[-1] if len(source) else None)
+        key = (asset, timeframe, candle_type, populate)
+        entry = self._entries.get(key)
+        if entry is not None and entry.fingerprint == fingerprint:
+            return entry
+
+        # The dataprovider caches its dataframes - never populate them in place.
+        informative = source.copy()
+        if populate is not None:
+            informative = populate(informative)
+
+        # Empty dataframes from the dataprovider carry an object dtype ``date`` column.
+        dates = pd.to_datetime(informative['date'], utc=True)
+        if timeframe_to_minutes(timeframe) > timeframe_to_minutes(self.timeframe):
+            # Same shift as merge_informative_pair: a candle is usable once it is closed.
+            dates = (dates + pd.Timedelta(minutes=timeframe_to_minutes(timeframe))
+                     - pd.Timedelta(minutes=timeframe_to_minutes(self.timeframe)))
+        entry = _ContextEntry(fingerprint, informative, _to_ns(dates))
+        self._entries[key] = entry
+        logger.debug(f'Populated informative {asset} {timeframe} ({len(informative)} candles).')
+        return entry
+
+    def aligned(self, dates: pd.Series, asset: str, timeframe: str,
+                populate: Optional[PopulateInformative] = None, *, candle_type: str = '',
+                ffill: bool = True, suffix: Optional[str] = None) -> DataFrame:
+        """
+        Informative columns aligned to ``dates`` (the base dataframe's ``date`` column),
+        named ``<column>_<suffix>`` like ``merge_informative_pair`` does.
+        Pairs with the same candle dates receive the same (read-only) dataframe.
+        :param suffix: Column suffix, defaults to ``timeframe``
+        """
+        entry = self._entry(asset, timeframe, populate, candle_type)
+        suffix = suffix or timeframe
+        base = _to_ns(dates)
+        axis_key = (len(base), base[0] if len(base) else None,
+                    base[-1] if len(base) else None, ffill, suffix)
+        aligned = entry.aligned.get(axis_key)
+        if aligned is None:
+            aligned = self._align(entry, base, ffill)
+            aligned.columns = [f'{column}_{suffix}' for column in aligned.columns]
+            if len(entry.aligned) >= self.max_alignments:
+                entry.aligned.clear()
+            entry.aligned[axis_key] = aligned
+        return aligned
+
+    @staticmethod
+    def _align(entry: _ContextEntry, base: np.ndarray, ffill: bool) -> DataFrame:
+        """Rows of the informative dataframe in effect at every date of ``base``."""
+        if entry.informative.empty:
+            return DataFrame(np.nan, index=pd.RangeIndex(len(base)),
+                             columns=entry.informative.columns)
+        positions = np.searchsorted(entry.date_merge, base, side='right') - 1
+        valid = positions >= 0
+        if not ffill:
+            valid &= entry.date_merge[np.maximum(positions, 0)] == base
+        aligned = entry.informative.iloc[np.maximum(positions, 0)].reset_index(drop=True)
+        if not valid.all():
+            aligned = aligned.where(np.broadcast_to(valid[:, np.newaxis], aligned.shape))
+        return aligned
+
+    def merge(self, dataframe: DataFrame, asset: str, timeframe: str,
+              populate: Optional[PopulateInformative] = None, *, candle_type: str = '',
+              ffill: bool = True, suffix: Optional[str] = None) -> DataFrame:
+        """
+        Drop-in replacement for ``dp.get_pair_dataframe`` + indicators +
+        ``merge_informative_pair`` - with the indicators and alignment shared across pairs.
+        """
+        aligned = self.aligned(dataframe['date'], asset, timeframe, populate,
+                               candle_type=candle_type, ffill=ffill, suffix=suffix)
+        return pd.concat([dataframe, aligned.set_axis(dataframe.index)], axis=1)
+
+
+def _to_ns(dates: pd.Series) -> np.ndarray:
+    if isinstance(dates.dtype, pd.DatetimeTZDtype):
+        dates = dates.dt.tz_convert('UTC').dt.tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+class MarketContextMixin:
+    """
+    Strategy mixin sharing informative computations across pairs.
+
+    * ``self.market_context`` - a ``MarketContext`` for explicitly merged informative pairs.
+    * ``@informative`` decorated methods use freqtrade's informative cache in every run mode
+      (freqtrade only enables it for dry / live runs), so informative pairs of a fixed asset
+      are populated once instead of once per traded pair in backtesting and hyperopt, too.
+    """
+    _market_context: Optional[MarketContext] = None
+
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        if (InformativeCache is not None and getattr(self, '_ft_informative', None)
+                and getattr(self, '_ft_informative_cache', None) is None):
+            self._ft_informative_cache = InformativeCache(maxsize=500)
+
+    @property
+    def market_context(self) -> MarketContext:
+        if self._market_context is None:
+            self._market_context = MarketContext(self.dp, self.timeframe)
+        return self._market_context
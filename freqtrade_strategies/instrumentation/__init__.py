@@ -0,0 +1,3 @@
+"""
+Opt-in runtime instrumentation of strategies: nothing is patched or timed unless enabled.
+"""
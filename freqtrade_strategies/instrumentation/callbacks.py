@@ -0,0 +1,311 @@
+"""
+Latency histograms of the per-trade strategy callbacks.
+
+``custom_stake_amount``, ``leverage``, ``custom_stoploss`` and ``adjust_trade_position`` run
+per open trade (or per entry) on every bot iteration. ``@timed_callback`` records their
+duration per callback and pair into HDR-style histograms: buckets keep the top 8 bits of
+the duration in nanoseconds, so every recorded value is resolved to better than 1%
+whatever its magnitude, and memory only grows with the number of distinct buckets hit.
+
+Usage in a strategy::
+
+    class MyStrategy(CallbackLatencyMixin, IStrategy):
+        @timed_callback
+        def leverage(self, pair, current_time, current_rate, proposed_leverage,
+                     max_leverage, side, **kwargs):
+            ...
+
+and in the config::
+
+    "callback_latency": {
+        "enabled": true,
+        "listen_ip_address": "127.0.0.1",
+        "metrics_port": 8091,
+        "budget_ratio": 0.05,
+        "check_interval": 60
+    }
+
+p50 / p99 / max per callback and pair are logged at the end of a backtest and on bot
+shutdown. Dry / live bots serve them at ``http://<listen_ip_address>:<metrics_port>/metrics``
+(Prometheus text format) and ``/`` (the text report), and send a warning when the p99 of
+a callback exceeds ``budget_ratio * process_throttle_secs``. Without ``enabled`` (and in
+hyperopt) the decorated callbacks are called directly and nothing is recorded.
+"""
+import atexit
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+SIGNIFICANT_BITS = 8
+QUANTILES = (50, 99)
+_ALL_PAIRS = '*'
+
+
+class LatencyHistogram:
+    """
+    Sparse log-linear histogram of durations in nanoseconds. Each bucket is keyed by its
+    lowest value: the duration with all but its ``SIGNIFICANT_BITS`` highest bits cleared.
+    """
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, nanoseconds: int) -> None:
+        shift = nanoseconds.bit_length() - SIGNIFICANT_BITS
+        self.counts[nanoseconds >> shift << shift if shift > 0 else nanoseconds] += 1
+        self.count += 1
+        self.total_ns += nanoseconds
+        if nanoseconds > self.max_ns:
+            self.max_ns = nanoseconds
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        for bucket, count in other.counts.items():
+            self.counts[bucket] += count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, percent: float) -> int:
+        """Highest duration equivalent to the ``percent`` percentile, in nanoseconds."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                shift = bucket.bit_length() - SIGNIFICANT_BITS
+                return min(bucket + (1 << shift) - 1 if shift > 0 else bucket, self.max_ns)
+        return self.max_ns
+
+
+class CallbackLatencies:
+    """
+    Latency histograms per (callback, pair). Thread safe - the dry-run metrics endpoint
+    reads while the bot records.
+    :param budget_seconds: p99 budget per callback call - flagged in the report
+    :param check_interval: Seconds between budget checks while recording, None to not check
+    :param on_alert: Called with the warning message of a budget violation
+    """
+
+    def __init__(self, budget_seconds: Optional[float] = None,
+                 check_interval: Optional[float] = None,
+                 on_alert: Optional[Callable[[str], None]] = None) -> None:
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.budget_ns = int(budget_seconds * 1e9) if budget_seconds else None
+        self.check_interval_ns = int(check_interval * 1e9) if check_interval is not None else None
+        self.on_alert = on_alert
+        self._last_check = time.perf_counter_ns()
+        self._alerted: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def record(self, callback: str, pair: str, nanoseconds: int, now: int = 0) -> None:
+        with self._lock:
+            self.histograms[(callback, pair)].record(nanoseconds)
+        if (self.budget_ns and self.check_interval_ns is not None
+                and now - self._last_check >= self.check_interval_ns):
+            self._last_check = now
+            self.check_budget()
+
+    def by_callback(self) -> Dict[str, LatencyHistogram]:
+        """Histograms over all pairs, per callback."""
+        merged: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        with self._lock:
+            for (callback, _), histogram in self.histograms.items():
+                merged[callback].merge(histogram)
+        return merged
+
+    def summary(self) -> List[Dict]:
+        """One row per callback (pair ``*``) followed by its pairs: count, p50, p99, max."""
+        with self._lock:
+            snapshot = {key: histogram for key, histogram in self.histograms.items()}
+        rows = []
+        for callback, merged in sorted(self.by_callback().items()):
+            pairs = sorted((pair, histogram) for (name, pair), histogram in snapshot.items()
+                           if name == callback)
+            for pair, histogram in [(_ALL_PAIRS, merged)] + pairs:
+                rows.append({
+                    'callback': callback, 'pair': pair, 'count': histogram.count,
+                    'sum_ns': histogram.total_ns, 'max_ns': histogram.max_ns,
+                    **{f'p{q}_ns': histogram.percentile(q) for q in QUANTILES},
+                })
+        return rows
+
+    def check_budget(self) -> List[str]:
+        """Warn once for every callback whose p99 crossed the budget since the last check."""
+        alerts = []
+        for callback, histogram in self.by_callback().items():
+            p99 = histogram.percentile(99)
+            over = p99 > self.budget_ns
+            if over and not self._alerted.get(callback):
+                message = (f'Callback {callback} p99 latency {p99 / 1e6:.1f} ms exceeds the '
+                           f'budget of {self.budget_ns / 1e6:.1f} ms '
+                           f'({histogram.count} calls, max {histogram.max_ns / 1e6:.1f} ms).')
+                logger.warning(message)
+                if self.on_alert is not None:
+                    self.on_alert(message)
+                alerts.append(message)
+            self._alerted[callback] = over
+        return alerts
+
+    def report(self) -> str:
+        """Text table of ``summary()``, in milliseconds."""
+        lines = [f'{"calls":>9} {"p50 ms":>9} {"p99 ms":>9} {"max ms":>9}  callback / pair']
+        for row in self.summary():
+            over = self.budget_ns and row['pair'] == _ALL_PAIRS and row['p99_ns'] > self.budget_ns
+            name = row['callback'] if row['pair'] == _ALL_PAIRS else f'    {row["pair"]}'
+            lines.append(f'{row["count"]:9d} {row["p50_ns"] / 1e6:9.3f} '
+                         f'{row["p99_ns"] / 1e6:9.3f} {row["max_ns"] / 1e6:9.3f}  {name}'
+                         + ('  OVER BUDGET' if over else ''))
+        return '\n'.join(lines)
+
+    def metrics(self, prefix: str = 'freqtrade_callback') -> str:
+        """Prometheus text exposition of ``summary()`` - per pair rows only."""
+        rows = [row for row in self.summary() if row['pair'] != _ALL_PAIRS]
+        lines = [f'# TYPE {prefix}_latency_seconds summary']
+        for row in rows:
+            labels = f'callback="{row["callback"]}",pair="{row["pair"]}"'
+            for q in QUANTILES:
+                lines.append(f'{prefix}_latency_seconds{{{labels},quantile="{q / 100}"}} '
+                             f'{row[f"p{q}_ns"] / 1e9:.9f}')
+            lines.append(f'{prefix}_latency_seconds_sum{{{labels}}} {row["sum_ns"] / 1e9:.9f}')
+            lines.append(f'{prefix}_latency_seconds_count{{{labels}}} {row["count"]}')
+        lines.append(f'# TYPE {prefix}_latency_max_seconds gauge')
+        for row in rows:
+            labels = f'callback="{row["callback"]}",pair="{row["pair"]}"'
+            lines.append(f'{prefix}_latency_max_seconds{{{labels}}} {row["max_ns"] / 1e9:.9f}')
+        if self.budget_ns:
+            lines.append(f'# TYPE {prefix}_latency_budget_seconds gauge')
+            lines.append(f'{prefix}_latency_budget_seconds {self.budget_ns / 1e9:.9f}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+        self._alerted.clear()
+
+
+def timed_callback(function: Callable) -> Callable:
+    """
+    Record the duration of a strategy callback into ``self.callback_latencies``, keyed by
+    the callback's ``pair`` (or ``trade.pair``) argument. A plain call when the strategy
+    has no ``callback_latencies``.
+    """
+    name = function.__name__
+    parameters = list(inspect.signature(function).parameters)[1:]
+    pair_index = parameters.index('pair') if 'pair' in parameters else None
+    trade_index = parameters.index('trade') if 'trade' in parameters else None
+
+    def _pair(args, kwargs) -> str:
+        if 'pair' in kwargs:
+            return kwargs['pair']
+        if pair_index is not None and pair_index < len(args):
+            return args[pair_index]
+        trade = kwargs.get('trade')
+        if trade is None and trade_index is not None and trade_index < len(args):
+            trade = args[trade_index]
+        return getattr(trade, 'pair', '')
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        latencies = self.callback_latencies
+        if latencies is None:
+            return function(self, *args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            end = time.perf_counter_ns()
+            latencies.record(name, _pair(args, kwargs), end - start, end)
+
+    return wrapper
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    latencies: CallbackLatencies
+
+    def do_GET(self) -> None:
+        if self.path == '/metrics':
+            body, content_type = self.latencies.metrics(), 'text/plain; version=0.0.4'
+        elif self.path == '/':
+            body, content_type = self.latencies.report() + '\n', 'text/plain'
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def serve_metrics(latencies: CallbackLatencies, host: str = '127.0.0.1',
+                  port: int = 8091) -> ThreadingHTTPServer:
+    """Serve ``latencies`` over HTTP from a daemon thread. Stop with ``server.shutdown()``."""
+    handler = type('MetricsHandler', (_MetricsHandler,), {'latencies': latencies})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name='callback-metrics', daemon=True).start()
+    logger.info(f'Callback latency metrics served on http://{host}:{port}/metrics.')
+    return server
+
+
+class CallbackLatencyMixin:
+    """
+    Strategy mixin enabling ``@timed_callback`` from the ``callback_latency`` config section
+    (see the module docstring). Backtests log the report at the end, dry / live runs serve
+    the metrics endpoint and alert on budget violations.
+    """
+    callback_latencies: Optional[CallbackLatencies] = None
+    _metrics_server: Optional[ThreadingHTTPServer] = None
+
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        self._latency_settings = config.get('callback_latency') or {}
+        if not self._latency_settings.get('enabled') or config.get('runmode') == 'hyperopt':
+            return
+        throttle = config.get('internals', {}).get('process_throttle_secs', 5)
+        trading = config.get('runmode') in ('dry_run', 'live')
+        self.callback_latencies = CallbackLatencies(
+            self._latency_settings.get('budget_ratio', 0.05) * throttle,
+            self._latency_settings.get('check_interval', 60) if trading else None)
+        if not trading:
+            atexit.register(self._log_callback_latencies)
+
+    def ft_bot_start(self, **kwargs) -> None:
+        super().ft_bot_start(**kwargs)
+        latencies = self.callback_latencies
+        if latencies is None or latencies.check_interval_ns is None:
+            return
+        if self.dp is not None:
+            latencies.on_alert = self.dp.send_msg
+        port = self._latency_settings.get('metrics_port')
+        if port:
+            host = self._latency_settings.get('listen_ip_address', '127.0.0.1')
+            self._metrics_server = serve_metrics(latencies, host, port)
+
+    def ft_bot_cleanup(self) -> None:
+        if self._metrics_server is not None:
+            self._metrics_server.shutdown()
+            self._metrics_server = None
+        self._log_callback_latencies()
+        super().ft_bot_cleanup()
+
+    def _log_callback_latencies(self) -> None:
+        if self.callback_latencies is not None and self.callback_latencies.histograms:
+            logger.info(f'Callback latencies of {type(self).__name__}:\n'
+                        f'{self.callback_latencies.report()}')
@@ -0,0 +1,469 @@
+"""
+Per-indicator profiling of ``populate_indicators`` / ``populate_entry_trend`` /
+``populate_exit_trend``.
+
+When enabled, the functions of the indicator libraries used by the strategies
+(``talib``, ``talib.abstract``, ``qtpylib``, ``technical``, ``ta``, ``pandas_ta``) are
+replaced by timing wrappers. Every call is recorded per strategy, pair and call site
+(``talib.abstract.ADX @ VolatilitySystem.py:63``) with its wall time, self time and the
+size of its result. Optionally, peak memory is traced (``trace_memory``) and functions
+defined in the strategy files themselves - including nested helpers - are recorded too
+(``local_functions``). Time not spent in any recorded call is reported as the self time
+of the populate method: inline pandas code and loops.
+
+Reports are written as text and as folded stacks (``<strategy>-<time>.folded``), which
+``flamegraph.pl`` or https://www.speedscope.app render as flame graphs.
+
+Disabled, nothing is patched and no code of this module runs while populating, so it can
+stay enabled in the configuration of a dry-run bot's strategy and be switched on when
+needed. Two ways to enable it:
+
+* strategies using ``IndicatorProfilingMixin``, with ``"indicator_profiling": {"enabled":
+  true}`` in the config (see ``IndicatorProfilingMixin``)
+* any strategy, through the launcher::
+
+    python -m freqtrade_strategies.instrumentation.indicators -- \\
+        backtesting --config user_data/config_backtest_futures.json --strategy VolatilitySystem
+"""
+import argparse
+import atexit
+import functools
+import importlib
+import inspect
+import logging
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+SURFACES = (
+    'talib', 'talib.abstract',
+    'freqtrade.vendor.qtpylib.indicators', 'technical.vendor.qtpylib.indicators',
+    'technical.qtpylib', 'technical.util', 'technical.indicators',
+    'ta', 'ta.trend', 'ta.momentum', 'ta.volatility', 'ta.volume', 'ta.others', 'ta.utils',
+    'pandas_ta',
+)
+_LABELS = {
+    'freqtrade.vendor.qtpylib.indicators': 'qtpylib',
+    'technical.vendor.qtpylib.indicators': 'qtpylib',
+    'technical.qtpylib': 'qtpylib',
+}
+STAGES = ('populate_indicators', 'populate_entry_trend', 'populate_exit_trend')
+_OUTSIDE = '(outside populate)'
+
+# Library code lives here - only references in user code (strategies) are re-pointed.
+_LIBRARY_PATHS = tuple(str(Path(sysconfig.get_paths()[key]).resolve())
+                       for key in ('stdlib', 'platstdlib', 'purelib', 'platlib'))
+
+
+@dataclass
+class CallStats:
+    calls: int = 0
+    total_ns: int = 0
+    self_ns: int = 0
+    result_bytes: int = 0
+    peak_bytes: int = 0
+
+
+class _Frame:
+    __slots__ = ('label', 'start', 'children', 'memory', 'peak')
+
+    def __init__(self, label: str, memory: int) -> None:
+        self.label = label
+        self.start = time.perf_counter_ns()
+        self.children = 0
+        self.memory = memory
+        self.peak = memory
+
+
+class IndicatorProfiler:
+    """
+    Records indicator calls while installed. Use ``get_profiler()`` - patching is global,
+    so there is one profiler per process.
+    :param trace_memory: Record peak memory per call with ``tracemalloc`` (slow)
+    :param local_functions: Also record functions defined in the attached strategies' files
+    """
+
+    def __init__(self, trace_memory: bool = False, local_functions: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.local_functions = local_functions
+        self.stats: Dict[Tuple[str, str, Tuple[str, ...]], CallStats] = defaultdict(CallStats)
+        self._originals: Dict[Tuple[str, str], Any] = {}
+        self._wrappers: Dict[int, Callable] = {}
+        self._strategy_files: Dict[str, str] = {}
+        self._local = threading.local()
+        self.installed = False
+
+    # Call recording
+
+    def _context(self):
+        local = self._local
+        if not hasattr(local, 'stack'):
+            local.stack = []
+            local.strategy = ''
+            local.pair = ''
+        return local
+
+    def _enter(self, label: str) -> None:
+        stack = self._context().stack
+        memory = 0
+        if self.trace_memory:
+            memory, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Keep the parent's peak so far - the reset below starts the child's.
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+        stack.append(_Frame(label, memory))
+
+    def _exit(self, result: Any = None) -> None:
+        context = self._context()
+        frame = context.stack[-1]
+        elapsed = time.perf_counter_ns() - frame.start
+        if self.trace_memory:
+            frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+        key = (context.strategy, context.pair, tuple(f.label for f in context.stack))
+        context.stack.pop()
+
+        stats = self.stats[key]
+        stats.calls += 1
+        stats.total_ns += elapsed
+        stats.self_ns += elapsed - frame.children
+        stats.result_bytes += _nbytes(result)
+        stats.peak_bytes = max(stats.peak_bytes, frame.peak - frame.memory)
+        if context.stack:
+            parent = context.stack[-1]
+            parent.children += elapsed
+            parent.peak = max(parent.peak, frame.peak)
+
+    def _wrap(self, function: Callable, label: str) -> Callable:
+        profiler = self
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            caller = sys._getframe(1)
+            profiler._enter(f'{label} @ {Path(caller.f_code.co_filename).name}:{caller.f_lineno}')
+            result = None
+            try:
+                result = function(*args, **kwargs)
+                return result
+            finally:
+                profiler._exit(result)
+
+        wrapper.__wrapped_indicator__ = function
+        return wrapper
+
+    # Installation
+
+    def install(self, surfaces: Sequence[str] = SURFACES) -> int:
+        """
+        Replace the functions of the importable ``surfaces`` by recording wrappers, and
+        re-point references already imported into user modules (``from technical.util
+        import resample_to_interval``).
+        :return: Number of wrapped functions
+        """
+        if self.installed:
+            return len(self._originals)
+        for name in surfaces:
+            try:
+                module = importlib.import_module(name)
+            except Exception:
+                continue
+            label = _LABELS.get(name, name)
+            for attribute, function in _surface_functions(module):
+                wrapper = self._wrappers.get(id(function))
+                if wrapper is None:
+                    wrapper = self._wrap(function, f'{label}.{attribute}')
+                    self._wrappers[id(function)] = wrapper
+                self._originals[(name, attribute)] = function
+                setattr(module, attribute, wrapper)
+        self._repoint({id(self._originals[key]): self._wrappers[id(self._originals[key])]
+                       for key in self._originals})
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.installed = True
+        logger.info(f'Indicator profiling enabled for {len(self._originals)} functions.')
+        return len(self._originals)
+
+    def uninstall(self) -> None:
+        """Restore every patched function."""
+        for (name, attribute), function in self._originals.items():
+            setattr(sys.modules[name], attribute, function)
+        self._repoint({id(wrapper): wrapper.__wrapped_indicator__
+                       for wrapper in self._wrappers.values()})
+        self._originals.clear()
+        self.installed = False
+
+    @staticmethod
+    def _repoint(replacements: Dict[int, Callable]) -> None:
+        for module in list(sys.modules.values()):
+            filename = getattr(module, '__file__', None)
+            if not filename or str(Path(filename).resolve()).startswith(_LIBRARY_PATHS):
+                continue
+            for attribute, value in list(vars(module).items()):
+                replacement = replacements.get(id(value))
+                if replacement is not None:
+                    setattr(module, attribute, replacement)
+
+    def attach(self, strategy) -> None:
+        """
+        Record the populate stages of ``strategy`` (per pair). Wraps the instance's
+        ``advise_*`` methods - the strategy class is left untouched.
+        """
+        name = type(strategy).__name__
+        # freqtrade's resolver sets ``__file__`` - its strategy modules are not in sys.modules.
+        self._strategy_files[name] = (getattr(type(strategy), '__file__', None)
+                                      or inspect.getfile(type(strategy)))
+        for stage, method in zip(STAGES, ('advise_indicators', 'advise_entry', 'advise_exit')):
+            setattr(strategy, method, self._stage(getattr(strategy, method), name, stage))
+
+    def _stage(self, method: Callable, strategy: str, stage: str) -> Callable:
+        profiler = self
+
+        @functools.wraps(method)
+        def wrapper(dataframe, metadata, *args, **kwargs):
+            context = profiler._context()
+            outer = (context.strategy, context.pair)
+            context.strategy, context.pair = strategy, metadata.get('pair', '')
+            if profiler.local_functions:
+                previous = sys.getprofile()
+                sys.setprofile(profiler._local_hook(profiler._strategy_files[strategy]))
+            profiler._enter(stage)
+            result = None
+            try:
+                result = method(dataframe, metadata, *args, **kwargs)
+                return result
+            finally:
+                profiler._exit(result)
+                if profiler.local_functions:
+                    # A cProfile session cannot be restored through setprofile.
+                    sys.setprofile(previous if callable(previous) else None)
+                context.strategy, context.pair = outer
+
+        return wrapper
+
+    def _local_hook(self, filename: str):
+        profiler = self
+        frames = set()
+
+        def hook(frame, event, arg):
+            code = frame.f_code
+            if code.co_filename != filename or code.co_name in STAGES:
+                return
+            if event == 'call':
+                frames.add(id(frame))
+                profiler._enter(f'{code.co_name} @ {Path(filename).name}:{code.co_firstlineno}')
+            elif event == 'return' and id(frame) in frames:
+                frames.discard(id(frame))
+                profiler._exit(arg)
+
+        return hook
+
+    # Reporting
+
+    def folded(self, strategy: str) -> List[str]:
+        """Folded stacks of ``strategy`` - ``strategy;pair;frames... self_microseconds``."""
+        lines = []
+        for (name, pair, stack), stats in sorted(self.stats.items()):
+            if name == strategy and stats.self_ns >= 1000:
+                frames = ';'.join((name, pair or '-') + stack).replace(' ', '_')
+                lines.append(f'{frames} {stats.self_ns // 1000}')
+        return lines
+
+    def report(self, strategy: str, top: int = 40) -> str:
+        """Text report of ``strategy``: slowest call sites over all pairs, then pair totals."""
+        sites: Dict[str, CallStats] = defaultdict(CallStats)
+        pairs: Dict[str, int] = defaultdict(int)
+        for (name, pair, stack), stats in self.stats.items():
+            if name != strategy:
+                continue
+            site = sites[stack[-1] if len(stack) > 1 else f'{stack[0]} (inline)']
+            site.calls += stats.calls
+            site.total_ns += stats.total_ns if len(stack) > 1 else stats.self_ns
+            site.self_ns += stats.self_ns
+            site.result_bytes += stats.result_bytes
+            site.peak_bytes = max(site.peak_bytes, stats.peak_bytes)
+            if len(stack) == 1:
+                pairs[pair] += stats.total_ns
+
+        total = sum(pairs.values())
+        lines = [f'Indicator profile of {strategy}: {len(pairs)} pairs, '
+                 f'{total / 1e6:.1f} ms in populate methods', '',
+                 f'{"self ms":>10} {"self %":>7} {"total ms":>10} {"calls":>7} '
+                 f'{"result MB":>10} {"peak MB":>8}  call site']
+        ranked = sorted(sites.items(), key=lambda item: item[1].self_ns, reverse=True)
+        for site, stats in ranked[:top]:
+            lines.append(
+                f'{stats.self_ns / 1e6:10.2f} {stats.self_ns / total * 100 if total else 0:6.1f}% '
+                f'{stats.total_ns / 1e6:10.2f} {stats.calls:7d} '
+                f'{stats.result_bytes / 2**20:10.2f} {stats.peak_bytes / 2**20:8.2f}  {site}')
+        lines += ['', f'{"total ms":>10}  pair']
+        for pair, nanoseconds in sorted(pairs.items(), key=lambda item: -item[1]):
+            lines.append(f'{nanoseconds / 1e6:10.2f}  {pair or "-"}')
+        return '\n'.join(lines)
+
+    def strategies(self) -> List[str]:
+        return sorted({name for name, _, _ in self.stats if name})
+
+    def write(self, directory: Path) -> List[Path]:
+        """Write a ``.txt`` report and a ``.folded`` stack file per profiled strategy."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(UTC).strftime('%Y%m%d-%H%M%S')
+        written = []
+        for strategy in self.strategies():
+            for suffix, content in (('txt', self.report(strategy)),
+                                    ('folded', '\n'.join(self.folded(strategy)))):
+                filename = directory / f'{strategy}-{stamp}.{suffix}'
+                filename.write_text(content + '\n')
+                written.append(filename)
+        if written:
+            logger.info(f'Indicator profiles written to {directory}.')
+        return written
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+
+def _surface_functions(module) -> List[Tuple[str, Callable]]:
+    """Public functions a surface module defines itself (not re-exported pandas / numpy)."""
+    root = module.__name__.split('.')[0]
+    if root == 'talib':
+        import talib
+        names = set(talib.get_functions())
+        return [(name, value) for name, value in vars(module).items()
+                if name in names and callable(value)]
+    return [(name, value) for name, value in vars(module).items()
+            if not name.startswith('_') and inspect.isfunction(value)
+            and (value.__module__ or '').split('.')[0] == root]
+
+
+def _nbytes(value: Any) -> int:
+    if hasattr(value, 'nbytes') and not callable(value.nbytes):
+        # numpy arrays and pandas Series
+        return int(value.nbytes)
+    if hasattr(value, 'memory_usage') and hasattr(value, 'columns'):
+        return int(value.memory_usage(index=False).sum())
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+
+_profiler: Optional[IndicatorProfiler] = None
+
+
+def get_profiler(trace_memory: bool = False, local_functions: bool = False) -> IndicatorProfiler:
+    """The process-wide profiler - created on first use with the given options."""
+    global _profiler
+    if _profiler is None:
+        _profiler = IndicatorProfiler(trace_memory, local_functions)
+    return _profiler
+
+
+class IndicatorProfilingMixin:
+    """
+    Strategy mixin enabling indicator profiling from the configuration::
+
+        "indicator_profiling": {
+            "enabled": true,
+            "output": "user_data/profiles",
+            "trace_memory": false,
+            "local_functions": false,
+            "report_interval": 3600
+        }
+
+    Reports are written every ``report_interval`` seconds (dry / live runs), on bot
+    shutdown and at process exit. Without ``enabled`` the mixin does nothing.
+    """
+
+    def __init__(self, config: dict) -> None:
+        super().__init__(config)
+        settings = config.get('indicator_profiling') or {}
+        if settings.get('enabled'):
+            _enable(self, Path(settings.get('output', 'user_data/profiles')),
+                    settings.get('trace_memory', False), settings.get('local_functions', False),
+                    settings.get('report_interval'))
+
+
+def _enable(strategy, output: Path, trace_memory: bool, local_functions: bool,
+            report_interval: Optional[float] = None) -> IndicatorProfiler:
+    profiler = get_profiler(trace_memory, local_functions)
+    first = not profiler.installed
+    profiler.install()
+    profiler.attach(strategy)
+    if first:
+        atexit.register(profiler.write, output)
+
+    cleanup = strategy.ft_bot_cleanup
+
+    @functools.wraps(cleanup)
+    def ft_bot_cleanup():
+        profiler.write(output)
+        return cleanup()
+
+    strategy.ft_bot_cleanup = ft_bot_cleanup
+
+    if report_interval:
+        advise_exit = strategy.advise_exit
+        last_write = [time.monotonic()]
+
+        @functools.wraps(advise_exit)
+        def advise_exit_with_report(dataframe, metadata, *args, **kwargs):
+            result = advise_exit(dataframe, metadata, *args, **kwargs)
+            if time.monotonic() - last_write[0] >= report_interval:
+                last_write[0] = time.monotonic()
+                profiler.write(output)
+            return result
+
+        strategy.advise_exit = advise_exit_with_report
+    return profiler
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    args = sys.argv[1:] if args is None else list(args)
+    freqtrade_args: List[str] = []
+    if '--' in args:
+        split = args.index('--')
+        args, freqtrade_args = args[:split], args[split + 1:]
+
+    parser = argparse.ArgumentParser(
+        description='Run freqtrade with per-indicator profiling of every strategy.')
+    parser.add_argument('--output', type=Path, default=Path('user_data/profiles'))
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Record peak memory per call (slow).')
+    parser.add_argument('--local-functions', action='store_true',
+                        help='Also record functions defined in the strategy files.')
+    parsed = parser.parse_args(args)
+    if not freqtrade_args:
+        parser.error('Pass the freqtrade command after "--".')
+
+    from freqtrade.main import main as freqtrade_main
+    from freqtrade.strategy import IStrategy
+
+    profiler = get_profiler(parsed.trace_memory, parsed.local_functions)
+    profiler.install()
+    bot_start = IStrategy.ft_bot_start
+
+    def ft_bot_start(strategy, **kwargs):
+        profiler.attach(strategy)
+        return bot_start(strategy, **kwargs)
+
+    IStrategy.ft_bot_start = ft_bot_start
+    try:
+        freqtrade_main(freqtrade_args)
+    finally:
+        for filename in profiler.write(parsed.output):
+            if filename.suffix == '.txt':
+                print(filename.read_text())
+
+
+if __name__ == '__main__':
+    main()
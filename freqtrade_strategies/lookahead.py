@@ -0,0 +1,270 @@
+"""
+Fast lookahead-bias detector.
+
+A column has a lookahead bias when its value on a candle changes once later candles are
+known - ``(x - x.min()) / (x.max() - x.min())`` over the whole dataframe (the strategies in
+``lookahead_bias/``), ``shift(-1)``, a scaler fitted on the full series. Recomputing the
+strategy on every prefix of the history finds them, at O(n²) cost.
+
+``detect_lookahead`` runs the populate methods once on the full history and once per cut
+point, spaced logarithmically between ``min_candles`` and the end of the history, and
+compares every column only on the candles both runs share. Both runs start at the same
+candle, so recursive indicators agree exactly on the overlap - any difference comes from
+candles behind the cut. For every diverging column the prefix length is bisected between
+the last clean and the first diverging cut, down to the shortest prefix showing the
+difference. A second bisection finds how many later candles the first divergent candle
+needs before it settles on its final value - the lookahead horizon (``shift(-2)``: 2), or
+the whole history for whole-series statistics. Runs are cached and shared by all columns:
+O(log n) populate runs instead of n.
+
+Usage::
+
+    python -m freqtrade_strategies.lookahead DevilStra Zeus --strategy-dir user_data/strategies
+    python -m freqtrade_strategies.lookahead --all --candles 2000
+"""
+import argparse
+import logging
+import sys
+import time
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from freqtrade.strategy import IStrategy
+
+from freqtrade_strategies.columns import CANDLE_COLUMNS, SIGNAL_COLUMNS
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CUTS = 8
+
+
+@dataclass
+class ColumnBias:
+    column: str
+    # Shortest prefix (in candles) whose result differs from the full run.
+    prefix: int
+    # First candle of that prefix with a different value.
+    first_candle: int
+    date: Any = None
+    # Later candles the first divergent candle needs to settle on its final value.
+    horizon: int = 0
+    # Not settled before the end of the history (whole-series statistics).
+    whole_history: bool = False
+    signal: bool = False
+
+
+@dataclass
+class LookaheadReport:
+    strategy: str
+    candles: int
+    cuts: List[int] = field(default_factory=list)
+    runs: int = 0
+    seconds: float = 0.0
+    biased: List[ColumnBias] = field(default_factory=list)
+    error: str = ''
+
+    @property
+    def has_bias(self) -> bool:
+        return bool(self.biased)
+
+
+def cut_points(candles: int, min_candles: int, count: int = DEFAULT_CUTS) -> List[int]:
+    """Prefix lengths spaced logarithmically between ``min_candles`` and ``candles``."""
+    min_candles = max(2, min(min_candles, candles - 1))
+    cuts = np.unique(np.geomspace(min_candles, candles, count + 1).astype(int))
+    return [int(cut) for cut in cuts if cut < candles]
+
+
+def diverging(full: pd.Series, prefix: pd.Series, rtol: float = 1e-9) -> np.ndarray:
+    """Mask of the candles of ``prefix`` whose value differs from ``full`` on the overlap."""
+    left = full.iloc[:len(prefix)].to_numpy()
+    right = prefix.to_numpy()
+    if left.dtype.kind in 'fiub' and right.dtype.kind in 'fiub':
+        return ~np.isclose(left.astype(float), right.astype(float), rtol=rtol, atol=0,
+                           equal_nan=True)
+    left_na, right_na = pd.isna(left), pd.isna(right)
+    different = np.asarray(left != right, dtype=bool) if len(left) else np.zeros(0, bool)
+    return (left_na != right_na) | (different & ~left_na & ~right_na)
+
+
+class _PrefixRuns:
+    """Populate runs of one strategy on prefixes of the candles, cached by length."""
+
+    def __init__(self, strategy: IStrategy, candles: DataFrame, metadata: dict) -> None:
+        self.strategy = strategy
+        self.candles = candles
+        self.metadata = metadata
+        self._results: Dict[int, DataFrame] = {}
+
+    def __call__(self, length: int) -> DataFrame:
+        if length not in self._results:
+            df = self.candles.iloc[:length].copy()
+            strategy, metadata = self.strategy, self.metadata
+            df = IStrategy.advise_indicators(strategy, df, metadata)
+            df = IStrategy.advise_exit(strategy, IStrategy.advise_entry(strategy, df, metadata),
+                                       metadata)
+            self._results[length] = df
+        return self._results[length]
+
+    @property
+    def runs(self) -> int:
+        return len(self._results)
+
+
+def _first_divergence(runs: _PrefixRuns, column: str, length: int, rtol: float) -> int:
+    """First diverging candle of ``column`` in the prefix of ``length``, -1 if none."""
+    prefix = runs(length)
+    if column not in prefix.columns:
+        return -1
+    mask = diverging(runs(len(runs.candles))[column], prefix[column], rtol)
+    return int(mask.argmax()) if mask.any() else -1
+
+
+def _settles(runs: _PrefixRuns, column: str, candle: int, length: int, rtol: float) -> bool:
+    """Whether ``candle`` of ``column`` has its final value in the prefix of ``length``."""
+    prefix = runs(length)
+    if column not in prefix.columns:
+        return False
+    full = runs(len(runs.candles))[column]
+    return not diverging(full.iloc[candle:candle + 1],
+                         prefix[column].iloc[candle:candle + 1], rtol).any()
+
+
+def detect_lookahead(strategy: IStrategy, candles: DataFrame, metadata: dict,
+                     min_candles: Optional[int] = None, cuts: int = DEFAULT_CUTS,
+                     rtol: float = 1e-9) -> LookaheadReport:
+    """
+    Columns of ``strategy`` whose values depend on later candles.
+    :param candles: History to check, oldest first
+    :param min_candles: Shortest prefix checked. Default: ``startup_candle_count`` + 30
+    :param cuts: Number of logarithmically spaced cut points
+    :param rtol: Relative tolerance of float comparisons
+    :return: Report listing the biased columns, signals first
+    """
+    started = time.perf_counter()
+    candles = candles.reset_index(drop=True)
+    report = LookaheadReport(type(strategy).__name__, len(candles))
+    if min_candles is None:
+        min_candles = (strategy.startup_candle_count or 0) + 30
+    report.cuts = cut_points(len(candles), min_candles, cuts)
+    runs = _PrefixRuns(strategy, candles, metadata)
+    full = runs(len(candles))
+    columns = [column for column in full.columns if column not in CANDLE_COLUMNS]
+
+    # First cut on which each column diverges, and the last clean cut before it.
+    clean: Dict[str, int] = {column: min_candles - 1 for column in columns}
+    dirty: Dict[str, int] = {}
+    for cut in report.cuts:
+        prefix = runs(cut)
+        for column in columns:
+            if column in dirty or column not in prefix.columns:
+                continue
+            if diverging(full[column], prefix[column], rtol).any():
+                dirty[column] = cut
+            else:
+                clean[column] = cut
+
+    for column, high in dirty.items():
+        low = clean[column]
+        # Invariant: prefix ``high`` diverges, prefix ``low`` does not (or is below the range).
+        while high - low > 1:
+            middle = (low + high) // 2
+            if _first_divergence(runs, column, middle, rtol) >= 0:
+                high = middle
+            else:
+                low = middle
+        first = _first_divergence(runs, column, high, rtol)
+        # Invariant: candle ``first`` is wrong with ``unsettled`` candles, final with ``settled``.
+        unsettled, settled = high, len(candles)
+        while settled - unsettled > 1:
+            middle = (unsettled + settled) // 2
+            if _settles(runs, column, first, middle, rtol):
+                settled = middle
+            else:
+                unsettled = middle
+        report.biased.append(ColumnBias(
+            column, prefix=high, first_candle=first,
+            date=candles['date'].iloc[first] if 'date' in candles.columns else None,
+            horizon=settled - 1 - first, whole_history=settled == len(candles),
+            signal=column in SIGNAL_COLUMNS))
+
+    report.biased.sort(key=lambda bias: (not bias.signal, bias.first_candle, bias.column))
+    report.runs = runs.runs
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def format_report(report: LookaheadReport) -> str:
+    header = (f'{report.strategy}: {report.candles} candles, {report.runs} populate runs, '
+              f'{report.seconds:.1f}s')
+    if report.error:
+        return f'{header} - ERROR {report.error}'
+    if not report.biased:
+        return f'{header} - no lookahead bias found'
+    lines = [f'{header} - LOOKAHEAD BIAS in {len(report.biased)} columns:']
+    for bias in report.biased:
+        kind = 'signal' if bias.signal else 'column'
+        lines.append(f'  {kind} {bias.column:<32} diverges at candle {bias.first_candle:>6} '
+                     f'({bias.date}) with {bias.prefix:>6} known candles, '
+                     + ('uses the whole history' if bias.whole_history
+                        else f'looks {bias.horizon} candles ahead'))
+    return '\n'.join(lines)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    from freqtrade_strategies.offline import (discover_strategies, find_strategy, load_candles,
+                                              load_strategy, offline_config, quiet_stdout)
+
+    parser = argparse.ArgumentParser(description='Find columns of strategies that look ahead.')
+    parser.add_argument('strategies', nargs='*', help='Class names to check.')
+    parser.add_argument('--all', action='store_true', help='Check every strategy found.')
+    parser.add_argument('--strategy-dir', type=Path, default=Path('user_data/strategies'))
+    parser.add_argument('--datadir', type=Path, default=Path('user_data/data/gateio/futures'))
+    parser.add_argument('--pair', default='BTC/USDT:USDT')
+    parser.add_argument('--candles', type=int, default=2000,
+                        help='Most recent candles to check (default: 2000).')
+    parser.add_argument('--cuts', type=int, default=DEFAULT_CUTS)
+    parser.add_argument('--rtol', type=float, default=1e-9)
+    parser.add_argument('--default-timeframe', default='5m',
+                        help='Timeframe of strategies that do not define one.')
+    parsed = parser.parse_args(args)
+    if not parsed.all and not parsed.strategies:
+        parser.error('Name strategies to check or pass --all.')
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    warnings.simplefilter('ignore')
+    if parsed.all:
+        found = discover_strategies(parsed.strategy_dir)
+    else:
+        found = [find_strategy(parsed.strategy_dir, name) for name in parsed.strategies]
+
+    biased = 0
+    for filename, class_name in found:
+        report = LookaheadReport(class_name, 0)
+        with quiet_stdout():
+            try:
+                strategy = getattr(sys.modules.get(filename.stem), class_name, None)
+                timeframe = getattr(strategy, 'timeframe', None) or parsed.default_timeframe
+                config = offline_config(parsed.datadir, parsed.pair, timeframe=timeframe)
+                strategy = load_strategy(filename, class_name, config)
+                candles, _ = load_candles(parsed.datadir, parsed.pair, timeframe)
+                report = detect_lookahead(strategy, candles.iloc[-parsed.candles:],
+                                          {'pair': parsed.pair}, cuts=parsed.cuts,
+                                          rtol=parsed.rtol)
+            except Exception as e:
+                report.error = f'{e.__class__.__name__}: {e}'
+        biased += report.has_bias
+        print(format_report(report))
+    if biased:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
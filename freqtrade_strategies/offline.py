@@ -0,0 +1,128 @@
+"""
+Strategies outside of a freqtrade bot: imported from their file, configured like a futures
+backtest and fed with the local futures candles. Shared by the analysis tools
+(``benchmark``, ``columns``, ...).
+
+Usage::
+
+    filename, class_name = find_strategy(Path('user_data/strategies'), 'VolatilitySystem')
+    config = offline_config(Path('user_data/data/gateio/futures'), 'BTC/USDT:USDT')
+    strategy = load_strategy(filename, class_name, config)
+    candles, timeframe = load_candles(datadir, 'BTC/USDT:USDT', strategy.timeframe)
+"""
+import importlib.util
+import inspect
+import logging
+import os
+import sys
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pandas as pd
+from pandas import DataFrame
+
+from freqtrade.enums import CandleType, RunMode
+from freqtrade.exceptions import OperationalException
+from freqtrade.exchange import timeframe_to_seconds
+from freqtrade.misc import pair_to_filename
+from freqtrade.strategy import IStrategy
+
+from freqtrade_strategies.data.pyramid import OhlcvPyramid
+
+
+logger = logging.getLogger(__name__)
+
+
+def discover_strategies(strategy_dir: Path) -> List[Tuple[Path, str]]:
+    """
+    ``IStrategy`` subclasses defined in the python files below ``strategy_dir``.
+    :return: List of (file, class name), sorted by file
+    """
+    found = []
+    for filename in sorted(Path(strategy_dir).rglob('*.py')):
+        try:
+            module = import_strategy_file(filename)
+        except Exception as e:
+            logger.warning(f'Cannot import {filename}: {e}')
+            continue
+        for name, obj in inspect.getmembers(module, inspect.isclass):
+            if (issubclass(obj, IStrategy) and obj is not IStrategy
+                    and obj.__module__ == module.__name__ and not inspect.isabstract(obj)):
+                found.append((filename, name))
+    return found
+
+
+def find_strategy(strategy_dir: Path, name: str) -> Tuple[Path, str]:
+    """(file, class name) of the strategy class ``name`` below ``strategy_dir``."""
+    # Try files named like the class first - importing every strategy is slow.
+    for filename in sorted(Path(strategy_dir).rglob(f'{name}.py')):
+        if inspect.isclass(getattr(import_strategy_file(filename), name, None)):
+            return filename, name
+    for filename, class_name in discover_strategies(strategy_dir):
+        if class_name == name:
+            return filename, class_name
+    raise OperationalException(f'Strategy {name} not found below {strategy_dir}.')
+
+
+def import_strategy_file(filename: Path):
+    # Same module naming as freqtrade's resolver, so strategies importing siblings work.
+    spec = importlib.util.spec_from_file_location(filename.stem, filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[filename.stem] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_candles(datadir: Path, pair: str, timeframe: str) -> Tuple[DataFrame, str]:
+    """
+    Real candles of ``pair`` at ``timeframe``: from the 5m futures data below 1h, from the
+    1h futures data above. Timeframes below 5m fall back to the 5m candles.
+    :return: Tuple of (candles, timeframe of the candles)
+    """
+    base = '5m' if timeframe_to_seconds(timeframe) < 3600 else '1h'
+    source = Path(datadir) / f'{pair_to_filename(pair)}-{base}-futures.feather'
+    if not source.is_file():
+        raise OperationalException(f'No {base} futures data for {pair} found at {source}.')
+    candles = pd.read_feather(source)
+    if timeframe_to_seconds(timeframe) <= timeframe_to_seconds(base):
+        return candles, base
+    return OhlcvPyramid.from_dataframe(candles, base, [timeframe]).dataframe(timeframe), timeframe
+
+
+def offline_config(datadir: Path, pair: str, user_data_dir: Path = Path('user_data'),
+                   **overrides) -> Dict[str, Any]:
+    """Minimal futures backtest configuration for strategies run on ``datadir``."""
+    config = {
+        'runmode': RunMode.BACKTEST, 'dry_run': True, 'stake_currency': 'USDT',
+        'stake_amount': 'unlimited', 'trading_mode': 'futures', 'margin_mode': 'isolated',
+        'candle_type_def': CandleType.FUTURES, 'user_data_dir': Path(user_data_dir),
+        'datadir': Path(datadir).parent, 'dataformat_ohlcv': 'feather',
+        'exchange': {'name': 'gateio', 'pair_whitelist': [pair]},
+    }
+    config.update(overrides)
+    return config
+
+
+class _StaticPairlist:
+    """The configured whitelist, for strategies calling ``dp.current_whitelist()``."""
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.whitelist = list(config['exchange']['pair_whitelist'])
+
+
+def load_strategy(filename: Path, class_name: str, config: Dict[str, Any]) -> IStrategy:
+    """Instantiate ``class_name`` from ``filename`` with a dataprovider, ready to populate."""
+    from freqtrade.data.dataprovider import DataProvider
+
+    strategy = getattr(import_strategy_file(Path(filename)), class_name)(config)
+    strategy.dp = DataProvider(config, None, _StaticPairlist(config))
+    strategy.ft_bot_start()
+    return strategy
+
+
+@contextmanager
+def quiet_stdout() -> Iterator[None]:
+    """Discard what strategies print while they compute - it would bury the tools' output."""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        yield
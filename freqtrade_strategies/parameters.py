@@ -0,0 +1,117 @@
+"""
+Mode-aware parameter ranges for indicators computed in ``populate_indicators``.
+
+Under hyperopt ``populate_indicators`` runs once, before the optimizer picks any value, so it
+has to compute an indicator for every value a parameter can take. Backtesting, dry-run and
+live only ever read the current ``.value``. freqtrade's ``parameter.range`` switches between
+the two for a single parameter; indicators keyed by several parameters
+(``supertrend(multiplier, period)``), read under several names (a buy and a sell copy), are
+easily computed once per name and per combination instead of once per distinct combination.
+
+``range_columns`` maps every column to its parameter combination for the current mode,
+``indicator_specs`` reduces that to the distinct combinations to compute, and the
+``range_indicators`` decorator applies both to ``populate_indicators``::
+
+    @range_indicators('supertrend_direction', {
+        'supertrend_1_buy_{}_{}': ('buy_m1', 'buy_p1'),
+        'supertrend_1_sell_{}_{}': ('sell_m1', 'sell_p1'),
+    })
+    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        return dataframe
+
+computes ``self.supertrend_direction(dataframe, multiplier, period)`` once per distinct
+``(multiplier, period)`` - 105 instead of 210 calls under hyperopt, one outside it when both
+parameter pairs hold the same values - and adds all columns in one block.
+"""
+from functools import wraps
+from itertools import product
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+from pandas import DataFrame
+
+from freqtrade.strategy import (CategoricalParameter, DecimalParameter, IntParameter,
+                                IStrategy)
+from freqtrade.strategy.parameters import BaseParameter
+
+
+Spec = Tuple[Any, ...]
+
+
+def parameter_values(parameter: BaseParameter, hyperopt: Optional[bool] = None) -> List[Any]:
+    """
+    Values of ``parameter`` an indicator has to be computed for.
+    :param parameter: Strategy parameter
+    :param hyperopt: None follows freqtrade (``parameter.range``: every value while hyperopt
+        computes indicators and the parameter is in an optimized space, else ``.value``),
+        True forces every value, False only the current value
+    :return: List of values
+    """
+    if hyperopt is None:
+        return list(parameter.range)
+    if not hyperopt:
+        return [parameter.value]
+    if isinstance(parameter, CategoricalParameter):
+        return list(parameter.opt_range)
+    if isinstance(parameter, DecimalParameter):
+        scale = pow(10, parameter.decimals)
+        return [round(n / scale, parameter.decimals)
+                for n in range(int(parameter.low * scale), int(parameter.high * scale) + 1)]
+    if isinstance(parameter, IntParameter):
+        return list(range(parameter.low, parameter.high + 1))
+    raise ValueError(f'{type(parameter).__name__} has no discrete range of values.')
+
+
+def range_columns(strategy: IStrategy, columns: Mapping[str, Sequence[str]],
+                  hyperopt: Optional[bool] = None) -> Dict[str, Spec]:
+    """
+    Every column of a set of parameter-keyed indicators, with the values it is computed for.
+    :param strategy: Strategy holding the parameters
+    :param columns: Column name template to the names of the parameters filling it,
+        e.g. ``{'supertrend_1_buy_{}_{}': ('buy_m1', 'buy_p1')}``
+    :param hyperopt: Mode, see ``parameter_values``
+    :return: Column name to its tuple of parameter values, templates in order and the
+        combinations of each in ``itertools.product`` order
+    """
+    result = {}
+    for template, names in columns.items():
+        values = [parameter_values(getattr(strategy, name), hyperopt) for name in names]
+        for spec in product(*values):
+            result[template.format(*spec)] = spec
+    return result
+
+
+def indicator_specs(strategy: IStrategy, columns: Mapping[str, Sequence[str]],
+                    hyperopt: Optional[bool] = None) -> List[Spec]:
+    """
+    Distinct parameter combinations to compute for ``columns``, see ``range_columns``.
+    :return: Combinations in order of first use
+    """
+    return list(dict.fromkeys(range_columns(strategy, columns, hyperopt).values()))
+
+
+def range_indicators(compute: str, columns: Mapping[str, Sequence[str]]
+                     ) -> Callable[[Callable], Callable]:
+    """
+    Decorator for ``populate_indicators`` adding parameter-keyed indicator columns.
+
+    After the decorated method ran, ``getattr(strategy, compute)(dataframe, *spec)`` is called
+    once for each distinct combination of ``indicator_specs`` and the results are added as the
+    columns of ``range_columns``, in one block (replacing columns of the same name).
+    :param compute: Name of the strategy method computing one indicator series
+    :param columns: Column name template to the names of the parameters filling it
+    :return: Decorator
+    """
+    def decorator(populate_indicators: Callable) -> Callable:
+        @wraps(populate_indicators)
+        def wrapper(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+            dataframe = populate_indicators(self, dataframe, metadata)
+            targets = range_columns(self, columns)
+            function = getattr(self, compute)
+            results = {spec: function(dataframe, *spec) for spec in dict.fromkeys(targets.values())}
+            block = DataFrame({column: results[spec] for column, spec in targets.items()},
+                              index=dataframe.index)
+            return pd.concat([dataframe.drop(columns=block.columns, errors='ignore'), block],
+                             axis=1)
+        return wrapper
+    return decorator
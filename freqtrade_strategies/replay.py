@@ -0,0 +1,592 @@
+"""
+Local exchange replay: a stand-in for the exchange of ``config_dryrun.json``.
+
+Candles, mark price and funding rates are served from the futures bundles
+(``freqtrade_strategies.data.bundle``) through a ccxt-compatible exchange class, on a
+simulated clock running ``speed`` times faster than the wall clock, with candles arriving
+the way they would live. Even at the top speed of 1000x a year of data takes about nine
+hours; with ``--skip-idle`` the clock jumps to the next candle whenever the bot sleeps, so
+the bot runs one iteration per candle: 50 days of 1h candles of two pairs replay in about two
+minutes, a year in about a quarter of an hour.
+
+* ``ReplayClock`` - simulated time, installed into freqtrade's time helpers
+* ``ReplayVenue`` - market data visible at the clock's current time. The candle in
+  progress is built from the stored candle along an open-low-high-close path (open-high-
+  low-close for bearish candles), the top of book is a synthetic spread around that price.
+* ``ReplayExchange`` / ``AsyncReplayExchange`` - ccxt exchange classes serving the venue.
+  ``register`` installs them under the configured exchange name, so freqtrade keeps using
+  its exchange specific subclass (``Gate`` for ``gateio``).
+
+Usage::
+
+    python -m freqtrade_strategies.replay --speed 500 -- \\
+        trade --config user_data/config_dryrun.json --strategy VolatilitySystem
+    python -m freqtrade_strategies.replay --skip-idle -- trade --config user_data/config_dryrun.json
+
+Arguments after ``--`` are passed to freqtrade. The bot is stopped once the clock reaches
+the end of the data.
+"""
+import argparse
+import logging
+import math
+import os
+import signal
+import sys
+import threading
+import time as _time
+import types
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import ccxt
+import ccxt.async_support as ccxt_async
+import numpy as np
+import pandas as pd
+
+from freqtrade.exceptions import OperationalException
+from freqtrade.exchange import timeframe_to_msecs
+
+from freqtrade_strategies.data.bundle import available_pairs, load_futures_bundle
+
+
+logger = logging.getLogger(__name__)
+
+_REAL_TIME = _time.time
+_REAL_SLEEP = _time.sleep
+
+
+class _DatetimeAlias(type):
+    """Keeps ``isinstance(value, datetime)`` true in modules whose ``datetime`` was replaced."""
+
+    def __instancecheck__(cls, instance):
+        return isinstance(instance, datetime)
+
+    def __subclasscheck__(cls, subclass):
+        return issubclass(subclass, datetime)
+
+
+class ReplayClock:
+    """
+    Simulated time starting at ``start_ms``, advancing ``speed`` times faster than real time.
+
+    With ``skip_to_ms`` set (a candle length), ``sleep`` does not wait: it moves the clock to
+    the requested wake-up time at once, and when that is still inside the current candle,
+    on to one second after the next candle opens - the bot skips its idle polls within a
+    candle, and the intra-candle price path is only seen at the candle's first second.
+    """
+
+    def __init__(self, start_ms: int, speed: float = 1.0,
+                 skip_to_ms: Optional[int] = None) -> None:
+        if not 1 <= speed <= 1000:
+            raise OperationalException(f'Replay speed must be between 1 and 1000, got {speed}.')
+        self.start_ms = int(start_ms)
+        self.speed = float(speed)
+        self.skip_to_ms = skip_to_ms
+        self._skipped = 0.0
+        self._wall_start = _REAL_TIME()
+
+    def time(self) -> float:
+        """Simulated seconds since epoch - drop-in for ``time.time``."""
+        return (self.start_ms / 1000 + self._skipped
+                + (_REAL_TIME() - self._wall_start) * self.speed)
+
+    def milliseconds(self) -> int:
+        return int(self.time() * 1000)
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep ``seconds`` of simulated time - drop-in for ``time.sleep``."""
+        if self.skip_to_ms is None:
+            _REAL_SLEEP(max(seconds, 0) / self.speed)
+            return
+        now = self.time()
+        candle = self.skip_to_ms / 1000
+        next_candle = (math.floor(now / candle) + 1) * candle
+        wake = now + max(seconds, 0)
+        self._skipped += (wake if wake >= next_candle else next_candle + 1) - now
+
+    def now(self, tz=None) -> datetime:
+        return datetime.fromtimestamp(self.time(), tz)
+
+    def install(self, prefixes: Sequence[str] = ('freqtrade', )) -> int:
+        """
+        Route the time lookups of already imported modules below ``prefixes`` to this clock:
+        module level ``datetime`` classes, ``time`` modules and ``time``/``sleep`` functions.
+        Import freqtrade's modules before calling this.
+        :return: Number of patched module attributes
+        """
+        clock = self
+
+        class ReplayDatetime(datetime, metaclass=_DatetimeAlias):
+            @classmethod
+            def now(cls, tz=None):
+                return clock.now(tz)
+
+            @classmethod
+            def utcnow(cls):
+                return clock.now(UTC).replace(tzinfo=None)
+
+        replay_time = types.ModuleType('time')
+        replay_time.__dict__.update(_time.__dict__)
+        replay_time.time = self.time
+        replay_time.sleep = self.sleep
+
+        replacements = {id(datetime): ReplayDatetime, id(_time): replay_time,
+                        id(_REAL_TIME): self.time, id(_REAL_SLEEP): self.sleep}
+        patched = 0
+        for name, module in list(sys.modules.items()):
+            if module is None or not name.startswith(tuple(prefixes)):
+                continue
+            for attribute, value in list(vars(module).items()):
+                replacement = replacements.get(id(value))
+                if replacement is not None:
+                    setattr(module, attribute, replacement)
+                    patched += 1
+        logger.info(f'Replay clock installed ({patched} patches), starting at '
+                    f'{self.now(UTC):%Y-%m-%d %H:%M} with {self.speed:g}x speed.')
+        return patched
+
+
+class _PairData:
+    """Numpy view of one pair's bundle."""
+
+    def __init__(self, bundle: pd.DataFrame) -> None:
+        dates = bundle['date']
+        if isinstance(dates.dtype, pd.DatetimeTZDtype):
+            dates = dates.dt.tz_convert('UTC').dt.tz_localize(None)
+        self.dates = dates.to_numpy(dtype='datetime64[ms]').view(np.int64)
+        self.ohlcv = bundle[['open', 'high', 'low', 'close', 'volume']].to_numpy(
+            dtype=float, copy=True)
+        mark = bundle[['mark_open', 'mark_high', 'mark_low', 'mark_close']].to_numpy(
+            dtype=float, copy=True)
+        # Pairs without mark candles fall back to the trade price.
+        missing = np.isnan(mark).any(axis=1)
+        mark[missing] = self.ohlcv[missing, :4]
+        self.mark = np.column_stack([mark, np.zeros(len(mark))])
+        events = bundle['funding_event'].to_numpy(dtype=bool)
+        self.funding_dates = self.dates[events]
+        self.funding_rates = bundle['funding_rate'].to_numpy(dtype=float)[events]
+        close = self.ohlcv[:, 3]
+        reference = np.nanmedian(close) if len(close) else 1.0
+        # Six significant digits, as most futures markets quote.
+        self.price_tick = 10.0 ** (math.floor(math.log10(reference)) - 5)
+
+
+class ReplayVenue:
+    """
+    Market data of the bundled pairs as visible at the clock's current time.
+    :param datadir: Directory holding the futures feather files
+    :param timeframe: Timeframe of the bundles - the only timeframe served
+    :param pairs: Pairs to serve, defaults to all pairs with data
+    :param spread_bps: Bid/ask spread of the synthetic order book in basis points
+    :param book_depth: Levels per side of the synthetic order book
+    :param max_leverage: Leverage limit reported for every market
+    """
+
+    def __init__(self, datadir: Path, timeframe: str = '1h', pairs: Optional[List[str]] = None,
+                 spread_bps: float = 2.0, book_depth: int = 20, max_leverage: float = 20.0,
+                 maker_fee: float = 0.0002, taker_fee: float = 0.0005) -> None:
+        self.timeframe = timeframe
+        self.timeframe_ms = timeframe_to_msecs(timeframe)
+        self.spread_bps = spread_bps
+        self.book_depth = book_depth
+        self.max_leverage = max_leverage
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.clock: Optional[ReplayClock] = None
+
+        pairs = pairs or available_pairs(datadir, timeframe)
+        if not pairs:
+            raise OperationalException(f'No {timeframe} futures data in {datadir}.')
+        self._data: Dict[str, _PairData] = {
+            pair: _PairData(load_futures_bundle(datadir, pair, timeframe)) for pair in pairs}
+        logger.info(f'Replay venue serving {len(pairs)} pairs ({timeframe}).')
+
+    @property
+    def pairs(self) -> List[str]:
+        return list(self._data)
+
+    @property
+    def first_ms(self) -> int:
+        return int(min(data.dates[0] for data in self._data.values()))
+
+    @property
+    def end_ms(self) -> int:
+        """Close time of the last candle of any pair."""
+        return int(max(data.dates[-1] for data in self._data.values())) + self.timeframe_ms
+
+    def now_ms(self) -> int:
+        if self.clock is None:
+            raise OperationalException('Replay venue has no clock attached.')
+        return self.clock.milliseconds()
+
+    def _pair(self, pair: str) -> _PairData:
+        data = self._data.get(pair)
+        if data is None:
+            raise ccxt.BadSymbol(f'replay does not have market symbol {pair}')
+        return data
+
+    def _visible(self, data: _PairData, values: np.ndarray, now: int) -> np.ndarray:
+        """Candles opened at ``now`` - the last one partially formed."""
+        end = int(np.searchsorted(data.dates, now, side='right'))
+        rows = values[:end].copy()
+        if end:
+            progress = (now - data.dates[end - 1]) / self.timeframe_ms
+            if progress < 1:
+                rows[-1] = _partial_candle(rows[-1], progress)
+        return rows
+
+    def ohlcv(self, pair: str, timeframe: str, since: Optional[int] = None,
+              limit: Optional[int] = None, price: Optional[str] = None) -> List[list]:
+        """OHLCV rows as returned by ``ccxt.fetch_ohlcv`` (``price='mark'`` for mark candles)."""
+        if timeframe != self.timeframe:
+            raise ccxt.NotSupported(f'replay only serves {self.timeframe} candles, '
+                                    f'requested {timeframe}.')
+        data = self._pair(pair)
+        values = data.mark if price in ('mark', 'index') else data.ohlcv
+        now = self.now_ms()
+        rows = self._visible(data, values, now)
+        dates = data.dates[:len(rows)]
+        start, stop = _window(dates, len(rows), since, limit)
+        return [[int(date)] + row for date, row in zip(dates[start:stop],
+                                                       rows[start:stop].tolist())]
+
+    def price(self, pair: str) -> Dict[str, float]:
+        """Current candle (trade price) of ``pair`` with ``timestamp``."""
+        data = self._pair(pair)
+        now = self.now_ms()
+        end = int(np.searchsorted(data.dates, now, side='right'))
+        if not end:
+            raise ccxt.BadRequest(f'{pair} has no candles before {now}.')
+        progress = min((now - data.dates[end - 1]) / self.timeframe_ms, 1.0)
+        row = _partial_candle(data.ohlcv[end - 1].copy(), progress)
+        return {'timestamp': now, 'open': row[0], 'high': row[1], 'low': row[2],
+                'close': row[3], 'volume': row[4]}
+
+    def ticker(self, pair: str) -> Dict[str, Any]:
+        candle = self.price(pair)
+        bid, ask = self._top_of_book(pair, candle['close'])
+        return {
+            'symbol': pair, 'timestamp': candle['timestamp'],
+            'datetime': ccxt.Exchange.iso8601(candle['timestamp']),
+            'high': candle['high'], 'low': candle['low'], 'open': candle['open'],
+            'close': candle['close'], 'last': candle['close'], 'bid': bid, 'ask': ask,
+            'bidVolume': None, 'askVolume': None, 'vwap': None, 'previousClose': None,
+            'change': candle['close'] - candle['open'],
+            'percentage': (candle['close'] / candle['open'] - 1) * 100 if candle['open'] else None,
+            'average': None, 'baseVolume': candle['volume'],
+            'quoteVolume': candle['volume'] * candle['close'], 'info': {},
+        }
+
+    def _top_of_book(self, pair: str, price: float):
+        tick = self._pair(pair).price_tick
+        half = max(price * self.spread_bps / 20000, tick / 2)
+        return (math.floor((price - half) / tick) * tick, math.ceil((price + half) / tick) * tick)
+
+    def order_book(self, pair: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Synthetic order book around the current price: ``book_depth`` levels per side, one
+        tick apart, each holding 1% of the candle volume.
+        """
+        candle = self.price(pair)
+        tick = self._pair(pair).price_tick
+        bid, ask = self._top_of_book(pair, candle['close'])
+        depth = min(limit or self.book_depth, self.book_depth)
+        amount = float(max(candle['volume'], 1.0) / 100)
+        levels = np.arange(depth)
+        return {
+            'symbol': pair, 'timestamp': candle['timestamp'],
+            'datetime': ccxt.Exchange.iso8601(candle['timestamp']), 'nonce': None,
+            'bids': [[bid - i * tick, amount] for i in levels.tolist()],
+            'asks': [[ask + i * tick, amount] for i in levels.tolist()],
+        }
+
+    def funding_rate_history(self, pair: str, since: Optional[int] = None,
+                             limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        data = self._pair(pair)
+        visible = int(np.searchsorted(data.funding_dates, self.now_ms(), side='right'))
+        start, end = _window(data.funding_dates, visible, since, limit)
+        return [{'info': {}, 'symbol': pair, 'fundingRate': rate, 'timestamp': int(date),
+                 'datetime': ccxt.Exchange.iso8601(int(date))}
+                for date, rate in zip(data.funding_dates[start:end].tolist(),
+                                      data.funding_rates[start:end].tolist())]
+
+    def funding_rate(self, pair: str) -> Dict[str, Any]:
+        data = self._pair(pair)
+        now = self.now_ms()
+        history = self.funding_rate_history(pair, limit=2)
+        rate = history[-1]['fundingRate'] if history else 0.0
+        interval = (history[-1]['timestamp'] - history[0]['timestamp']
+                    if len(history) == 2 else 8 * 3600 * 1000)
+        following = data.funding_dates[data.funding_dates > now]
+        next_funding = int(following[0]) if len(following) else None
+        mark = self.ohlcv(pair, self.timeframe, limit=1, price='mark')
+        return {
+            'info': {}, 'symbol': pair, 'timestamp': now, 'datetime': ccxt.Exchange.iso8601(now),
+            'markPrice': mark[-1][4] if mark else None, 'indexPrice': None,
+            'interestRate': None, 'estimatedSettlePrice': None, 'fundingRate': rate,
+            'fundingTimestamp': next_funding, 'fundingDatetime': None,
+            'nextFundingTimestamp': next_funding, 'nextFundingRate': None,
+            'previousFundingRate': None, 'interval': f'{interval // 3600000}h',
+        }
+
+    def markets(self) -> List[Dict[str, Any]]:
+        """Linear USDT-settled swap markets in ccxt's unified format."""
+        markets = []
+        for pair, data in self._data.items():
+            base, rest = pair.split('/')
+            quote, _, settle = rest.partition(':')
+            settle = settle or quote
+            markets.append({
+                'id': f'{base}_{quote}', 'symbol': f'{base}/{quote}:{settle}',
+                'base': base, 'quote': quote, 'settle': settle,
+                'baseId': base, 'quoteId': quote, 'settleId': settle,
+                'type': 'swap', 'spot': False, 'margin': False, 'swap': True, 'future': False,
+                'option': False, 'active': True, 'contract': True, 'linear': True,
+                'inverse': False, 'contractSize': 1.0, 'expiry': None, 'expiryDatetime': None,
+                'strike': None, 'optionType': None,
+                'maker': self.maker_fee, 'taker': self.taker_fee,
+                'precision': {'amount': 0.0001, 'price': data.price_tick},
+                'limits': {'leverage': {'min': 1, 'max': self.max_leverage},
+                           'amount': {'min': 0.0001, 'max': None},
+                           'price': {'min': data.price_tick, 'max': None},
+                           'cost': {'min': 1, 'max': None}},
+                'created': None, 'info': {},
+            })
+        return markets
+
+    def leverage_tiers(self, pair: str) -> List[Dict[str, Any]]:
+        return [{'tier': 1, 'symbol': pair, 'currency': pair.split(':')[-1],
+                 'minNotional': 0, 'maxNotional': 1e9,
+                 'maintenanceMarginRate': 0.5 / self.max_leverage,
+                 'maxLeverage': self.max_leverage, 'info': {}}]
+
+    def trading_fees(self) -> Dict[str, Dict[str, Any]]:
+        return {pair: {'info': {}, 'symbol': pair, 'maker': self.maker_fee,
+                       'taker': self.taker_fee, 'percentage': True, 'tierBased': False}
+                for pair in self._data}
+
+
+def _window(dates: np.ndarray, visible: int, since: Optional[int],
+            limit: Optional[int]):
+    """
+    Slice bounds of the ``visible`` first entries like ccxt's ``since`` / ``limit``: the first
+    ``limit`` entries from ``since`` on, or the last ``limit`` entries without ``since``.
+    """
+    if since is None:
+        return (0 if limit is None else max(visible - limit, 0)), visible
+    start = min(int(np.searchsorted(dates, since, side='left')), visible)
+    return start, (visible if limit is None else min(start + limit, visible))
+
+
+def _partial_candle(candle: np.ndarray, progress: float) -> np.ndarray:
+    """
+    ``candle`` (open, high, low, close, volume) as it looked after ``progress`` (0-1) of its
+    duration: the price walks open-low-high-close (bullish) or open-high-low-close in three
+    equal legs, volume accrues linearly.
+    """
+    open_, high, low, close, volume = candle
+    first, second = (low, high) if close >= open_ else (high, low)
+    path = (open_, first, second, close)
+    leg = min(int(progress * 3), 2)
+    fraction = progress * 3 - leg
+    price = path[leg] + (path[leg + 1] - path[leg]) * fraction
+    seen = path[:leg + 1] + (price, )
+    return np.array([open_, max(seen), min(seen), price, volume * progress])
+
+
+_HAS = {
+    'fetchOHLCV': True, 'fetchTicker': True, 'fetchTickers': True, 'fetchOrderBook': True,
+    'fetchL2OrderBook': True, 'fetchFundingRate': True, 'fetchFundingRateHistory': True,
+    'fetchLeverageTiers': True, 'fetchMarketLeverageTiers': True, 'fetchTradingFees': True,
+    'fetchTime': True, 'fetchMarkOHLCV': True, 'fetchIndexOHLCV': True,
+    # Orders are simulated by freqtrade's dry run - listed for its exchange check only.
+    'createOrder': True, 'cancelOrder': True, 'fetchOrder': True, 'fetchOrders': True,
+    'fetchMyTrades': True, 'fetchTrades': True,
+    'fetchBidsAsks': False, 'fetchPositions': False, 'fetchOpenOrders': False,
+    'setLeverage': False, 'setMarginMode': False,
+    'swap': True, 'future': False, 'spot': False, 'margin': False,
+}
+
+
+def _describe(exchange_id: str, venue: ReplayVenue) -> Dict[str, Any]:
+    return {
+        'id': exchange_id, 'name': f'Replay ({exchange_id})', 'countries': [],
+        'enableRateLimit': False, 'rateLimit': 0, 'has': _HAS,
+        'timeframes': {venue.timeframe: venue.timeframe},
+        'precisionMode': ccxt.TICK_SIZE,
+        'options': {'defaultType': 'swap'},
+    }
+
+
+class ReplayExchange(ccxt.Exchange):
+    """Synchronous ccxt exchange serving ``venue`` - bound via ``exchange_classes``."""
+    venue: ReplayVenue
+
+    def describe(self):
+        return self.deep_extend(super().describe(), _describe(self.id or 'replay', self.venue))
+
+    def milliseconds(self):
+        return self.venue.now_ms()
+
+    def fetch_markets(self, params={}):
+        return self.venue.markets()
+
+    def fetch_time(self, params={}):
+        return self.venue.now_ms()
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return self.venue.ohlcv(symbol, timeframe, since, limit, params.get('price'))
+
+    def fetch_ticker(self, symbol, params={}):
+        return self.venue.ticker(symbol)
+
+    def fetch_tickers(self, symbols=None, params={}):
+        return {pair: self.venue.ticker(pair) for pair in symbols or self.venue.pairs}
+
+    def fetch_order_book(self, symbol, limit=None, params={}):
+        return self.venue.order_book(symbol, limit)
+
+    def fetch_funding_rate(self, symbol, params={}):
+        return self.venue.funding_rate(symbol)
+
+    def fetch_funding_rate_history(self, symbol=None, since=None, limit=None, params={}):
+        return self.venue.funding_rate_history(symbol, since, limit)
+
+    def fetch_leverage_tiers(self, symbols=None, params={}):
+        return {pair: self.venue.leverage_tiers(pair) for pair in symbols or self.venue.pairs}
+
+    def fetch_market_leverage_tiers(self, symbol, params={}):
+        return self.venue.leverage_tiers(symbol)
+
+    def fetch_trading_fees(self, params={}):
+        return self.venue.trading_fees()
+
+    def create_order(self, symbol, type, side, amount, price=None, params={}):
+        raise ccxt.NotSupported('replay serves market data only - run freqtrade with dry_run.')
+
+    def fetch_order(self, id, symbol=None, params={}):
+        raise ccxt.NotSupported('replay serves market data only - run freqtrade with dry_run.')
+
+    def cancel_order(self, id, symbol=None, params={}):
+        raise ccxt.NotSupported('replay serves market data only - run freqtrade with dry_run.')
+
+
+class AsyncReplayExchange(ccxt_async.Exchange):
+    """Asynchronous ccxt exchange serving ``venue`` - used by freqtrade for candle downloads."""
+    venue: ReplayVenue
+
+    def describe(self):
+        return self.deep_extend(super().describe(), _describe(self.id or 'replay', self.venue))
+
+    def milliseconds(self):
+        return self.venue.now_ms()
+
+    async def fetch_markets(self, params={}):
+        return self.venue.markets()
+
+    async def fetch_time(self, params={}):
+        return self.venue.now_ms()
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return self.venue.ohlcv(symbol, timeframe, since, limit, params.get('price'))
+
+    async def fetch_ticker(self, symbol, params={}):
+        return self.venue.ticker(symbol)
+
+    async def fetch_tickers(self, symbols=None, params={}):
+        return {pair: self.venue.ticker(pair) for pair in symbols or self.venue.pairs}
+
+    async def fetch_order_book(self, symbol, limit=None, params={}):
+        return self.venue.order_book(symbol, limit)
+
+    async def fetch_funding_rate(self, symbol, params={}):
+        return self.venue.funding_rate(symbol)
+
+    async def fetch_funding_rate_history(self, symbol=None, since=None, limit=None, params={}):
+        return self.venue.funding_rate_history(symbol, since, limit)
+
+    async def fetch_leverage_tiers(self, symbols=None, params={}):
+        return {pair: self.venue.leverage_tiers(pair) for pair in symbols or self.venue.pairs}
+
+    async def fetch_market_leverage_tiers(self, symbol, params={}):
+        return self.venue.leverage_tiers(symbol)
+
+    async def fetch_trading_fees(self, params={}):
+        return self.venue.trading_fees()
+
+
+def register(venue: ReplayVenue, exchange_name: str) -> None:
+    """
+    Install replay exchange classes bound to ``venue`` as ``ccxt.<exchange_name>`` (sync and
+    async), so freqtrade instantiates them instead of the real exchange.
+    """
+    name = exchange_name.lower()
+    for module, base in ((ccxt, ReplayExchange), (ccxt_async, AsyncReplayExchange)):
+        bound = type(base.__name__, (base, ), {'venue': venue, 'id': name})
+        setattr(module, name, bound)
+        if name not in module.exchanges:
+            module.exchanges.append(name)
+    logger.info(f'Exchange {exchange_name} replaced by the local replay venue.')
+
+
+def _stop_at_end(venue: ReplayVenue, poll_seconds: float = 1.0) -> None:
+    """Interrupt the bot once the clock has passed the last candle."""
+    def watch():
+        while venue.now_ms() < venue.end_ms:
+            _REAL_SLEEP(poll_seconds)
+        logger.info('Replay reached the end of the data, stopping the bot.')
+        os.kill(os.getpid(), signal.SIGINT)
+
+    threading.Thread(target=watch, name='replay-end', daemon=True).start()
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    args = sys.argv[1:] if args is None else list(args)
+    if '--' in args:
+        split = args.index('--')
+        args, freqtrade_args = args[:split], args[split + 1:]
+    else:
+        freqtrade_args = ['trade', '--config', 'user_data/config_dryrun.json']
+
+    parser = argparse.ArgumentParser(
+        description='Run freqtrade against a local replay of the futures data.')
+    parser.add_argument('--datadir', type=Path, default=Path('user_data/data/gateio/futures'))
+    parser.add_argument('--exchange', default='gateio',
+                        help='Exchange name used in the freqtrade config.')
+    parser.add_argument('--timeframe', default='1h')
+    parser.add_argument('--pairs', nargs='+', help='Pairs to serve. Defaults to all pairs found.')
+    parser.add_argument('--speed', type=float, default=100.0,
+                        help='Simulated seconds per real second (1 - 1000).')
+    parser.add_argument('--skip-idle', action='store_true',
+                        help='Jump the clock to the next candle whenever the bot sleeps.')
+    parser.add_argument('--start', help='Simulated start date (YYYYMMDD). Defaults to '
+                                        '--warmup candles after the first candle.')
+    parser.add_argument('--warmup', type=int, default=500,
+                        help='Candles available before the default start date.')
+    parser.add_argument('--spread-bps', type=float, default=2.0)
+    parsed = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    venue = ReplayVenue(parsed.datadir, parsed.timeframe, parsed.pairs,
+                        spread_bps=parsed.spread_bps)
+    if parsed.start:
+        start = int(pd.Timestamp(parsed.start, tz='UTC').value // 1_000_000)
+    else:
+        start = venue.first_ms + parsed.warmup * venue.timeframe_ms
+
+    # Import the bot's modules first, so the clock reaches their time lookups.
+    import freqtrade.freqtradebot  # noqa: F401
+    import freqtrade.worker  # noqa: F401
+    from freqtrade.main import main as freqtrade_main
+
+    venue.clock = ReplayClock(start, parsed.speed,
+                              venue.timeframe_ms if parsed.skip_idle else None)
+    venue.clock.install()
+    register(venue, parsed.exchange)
+    _stop_at_end(venue)
+    freqtrade_main(freqtrade_args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+"""
+Vectorized trade simulators: freqtrade's backtest exit rules on arrays, for screening.
+"""
@@ -0,0 +1,612 @@
+"""
+Vectorized signal-level backtest of futures strategies: long and short trades, leverage,
+funding payments and liquidation.
+
+``simulate_futures`` extends the long-only simulator of ``simulation.spot`` with what the
+futures backtester adds:
+
+* ``enter_short`` / ``exit_short`` signals. A candle opens a trade in the direction of its
+  (shifted) entry signal when there is no exit signal for that side and no entry signal for
+  the other side. A trade closed by a candle is reversed on the same candle when that candle
+  has an entry signal in the other direction - the backtester's second pass over the candle
+* leverage per trade, either constant or read from a precomputed column on the candle
+  before the entry (what the ``leverage`` callback sees in a backtest). Stoploss and trailing
+  percentages are divided by it, profit ratios multiplied by it
+* funding: every funding rate of the ``1h-funding_rate`` files, times the mark open of its
+  hour, is paid (by longs, for positive rates) from the trade's open date up to the candle
+  evaluated. It is part of the close value, so it moves the profit of the ROI, trailing stop
+  and exit-signal checks as it does in the backtester
+* liquidation at the isolated-margin liquidation price of the exchange (gate's formula with
+  freqtrade's ``liquidation_buffer``), checked after the stoploss. By default it is checked
+  against the ``1h-mark`` candles: the mark low (high, for shorts) of an hour is applied to
+  the candle the hour ends in. ``Liquidation(source='candle')`` checks the trade candles
+  instead, like the backtester does
+* a custom stoploss precomputed as a column (read on the previous candle, like the
+  callback's last analysed candle): the stop moves to the candle's bound at that distance
+  when it is higher, and a stop moved that way exits as ``trailing_stop_loss``
+
+``FuturesMarket`` holds the funding and mark arrays of a pair, aligned to the strategy's
+candles; build it once per pair and reuse it - in a parameter sweep the strategy's
+indicators change, the market does not::
+
+    market = FuturesMarket.from_bundle(load_futures_bundle(datadir, pair), df['date'])
+    for multiplier in np.arange(1.0, 3.0, 0.25):
+        df = signals(candles, multiplier)
+        trades = simulate_futures(df, rules, market, leverage=2.0)
+
+Not simulated: position adjustment and custom stake amounts (the trade is one entry of one
+stake), ``custom_exit`` and the other callbacks of ``spot.CALLBACKS``, ``max_open_trades``,
+maintenance-margin tiers and amount precision. ``compare_trades`` measures how closely the
+simulated trades follow a backtest of the same strategy.
+
+Usage::
+
+    python -m freqtrade_strategies.simulation.futures FSampleStrategy FAdxSmaStrategy
+    python -m freqtrade_strategies.simulation.futures VolatilitySystem --leverage 2 \\
+        --timerange 20250601-20251001 --backtest-results user_data/backtest_results
+"""
+import argparse
+import logging
+import time
+import warnings
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from freqtrade.configuration import TimeRange
+from freqtrade.strategy import IStrategy
+from freqtrade_strategies.simulation.spot import (DEFAULT_FEE, FIRST_BLOCK, SIGNAL_CACHE_COLUMNS,
+                                                  TRADE_COLUMNS, ExitRules, RoiTable,
+                                                  ScreenResult, analysed_signals,
+                                                  candle_minutes, format_results,
+                                                  ignored_callbacks, shifted_signal,
+                                                  shifted_tag, summarize, to_tick)
+
+
+logger = logging.getLogger(__name__)
+
+# Columns of the analysed dataframe the futures simulation needs, kept by the signal cache.
+FUTURES_SIGNAL_COLUMNS = SIGNAL_CACHE_COLUMNS + ['enter_short', 'exit_short']
+FUTURES_TRADE_COLUMNS = TRADE_COLUMNS + ['is_short', 'leverage', 'funding_ratio']
+MARK_TIMEFRAME = pd.Timedelta(hours=1)
+
+
+@dataclass
+class Liquidation:
+    """Isolated-margin liquidation price: gate's formula plus freqtrade's buffer."""
+    # Maintenance margin ratio of the lowest tier (``0.5 / max_leverage`` on the replay venue).
+    maintenance_margin: float = 0.025
+    taker_fee: float = 0.0005
+    # freqtrade's ``liquidation_buffer``: the price is moved this share towards the open.
+    buffer: float = 0.05
+    # 'mark' checks the mark candles, 'candle' the trade candles (the backtester's choice).
+    source: str = 'mark'
+
+    def price(self, open_rate: float, leverage: float, is_short: bool) -> float:
+        margin = open_rate / leverage
+        ratio = self.maintenance_margin + self.taker_fee
+        if is_short:
+            price = (open_rate + margin) / (1 + ratio)
+        else:
+            price = (open_rate - margin) / (1 - ratio)
+        buffer = abs(open_rate - price) * self.buffer
+        return max(price - buffer if is_short else price + buffer, 0.0)
+
+
+@dataclass
+class FuturesMarket:
+    """Funding and mark candles of one pair, aligned to the candles of a strategy."""
+    # Funding per unit paid by a long up to each candle: payments dated at or before it ...
+    paid: np.ndarray
+    # ... and dated before it - a trade opened on candle e owes paid[t] - paid_before[e].
+    paid_before: np.ndarray
+    # Lowest / highest mark price of the mark hours ending within each candle (nan: none).
+    mark_low: np.ndarray
+    mark_high: np.ndarray
+
+    @classmethod
+    def from_bundle(cls, bundle: DataFrame, dates: pd.Series) -> 'FuturesMarket':
+        """
+        :param bundle: 1h futures bundle of the pair (``data.bundle.load_futures_bundle``)
+        :param dates: Candle dates of the strategy's dataframe
+        """
+        candles = dates.dt.as_unit('ns').astype('int64').to_numpy()
+        hours = bundle['date'].dt.as_unit('ns').astype('int64').to_numpy()
+        mark_gap = bundle['mark_gap'].to_numpy(dtype=bool)
+
+        # Like freqtrade, funding rates without a mark candle of the same hour are skipped.
+        events = bundle['funding_event'].to_numpy(dtype=bool) & ~mark_gap
+        fees = (bundle['funding_rate'].to_numpy(dtype=float)
+                * bundle['mark_open'].to_numpy(dtype=float))[events]
+        paid = np.concatenate(([0.0], np.cumsum(np.nan_to_num(fees))))
+        event_dates = hours[events]
+
+        mark_low = np.full(len(candles), np.nan)
+        mark_high = np.full(len(candles), np.nan)
+        if len(candles):
+            step = int(np.diff(candles).min()) if len(candles) > 1 else MARK_TIMEFRAME.value
+            ends = hours + MARK_TIMEFRAME.value
+            index = np.searchsorted(candles, ends, side='left') - 1
+            valid = ~mark_gap & (ends > candles[0]) & (ends <= candles[-1] + step)
+            np.fmin.at(mark_low, index[valid], bundle['mark_low'].to_numpy(dtype=float)[valid])
+            np.fmax.at(mark_high, index[valid], bundle['mark_high'].to_numpy(dtype=float)[valid])
+        return cls(paid[np.searchsorted(event_dates, candles, side='right')],
+                   paid[np.searchsorted(event_dates, candles, side='left')],
+                   mark_low, mark_high)
+
+    @classmethod
+    def flat(cls, length: int) -> 'FuturesMarket':
+        """No funding and no mark candles."""
+        return cls(np.zeros(length), np.zeros(length), np.full(length, np.nan),
+                   np.full(length, np.nan))
+
+
+def shifted_values(df: DataFrame, column: Optional[str]) -> Optional[np.ndarray]:
+    """``column`` on the previous candle - what callbacks read as the last analysed candle."""
+    if column is None:
+        return None
+    values = np.full(len(df), np.nan)
+    values[1:] = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)[:-1]
+    return values
+
+
+@dataclass
+class _Candles:
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    minutes: np.ndarray
+    enter_long: np.ndarray
+    exit_long: np.ndarray
+    enter_short: np.ndarray
+    exit_short: np.ndarray
+    exit_tag: Optional[np.ndarray]
+    custom_stoploss: Optional[np.ndarray]
+    timeframe_minutes: int
+
+    @classmethod
+    def from_dataframe(cls, df: DataFrame, can_short: bool,
+                       stoploss_column: Optional[str]) -> '_Candles':
+        minutes = candle_minutes(df)
+        steps = np.diff(minutes)
+        no_short = np.zeros(len(df), dtype=bool)
+        return cls(df['open'].to_numpy(dtype=float), df['high'].to_numpy(dtype=float),
+                   df['low'].to_numpy(dtype=float), minutes,
+                   shifted_signal(df, 'enter_long'), shifted_signal(df, 'exit_long'),
+                   shifted_signal(df, 'enter_short') if can_short else no_short,
+                   shifted_signal(df, 'exit_short') if can_short else no_short,
+                   shifted_tag(df, 'exit_tag'), shifted_values(df, stoploss_column),
+                   int(steps.min()) if len(steps) else 1)
+
+
+@dataclass
+class _Trade:
+    """One trade's constants. Stops are kept signed (negated for shorts) so that for both
+    sides a higher stop is a tighter one and the stop is hit at or above the adverse price."""
+    entry: int
+    is_short: bool
+    leverage: float
+    open_value: float
+    initial_stop: float
+    liquidation: float
+
+    @property
+    def side(self) -> int:
+        return -1 if self.is_short else 1
+
+
+def _stop(prices: np.ndarray, trade: _Trade, percent: np.ndarray,
+          tick: Optional[float]) -> np.ndarray:
+    """Signed stop ``percent`` (of the margin) away from ``prices``, rounded like freqtrade."""
+    stop = prices * (1 - trade.side * percent / trade.leverage)
+    return trade.side * to_tick(stop, tick, up=not trade.is_short, down=trade.is_short)
+
+
+def _stop_candidates(rules: ExitRules, trade: _Trade, bound: np.ndarray, best: np.ndarray,
+                     custom: Optional[np.ndarray],
+                     tick: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Signed stop each candle's bound proposes, and the stoploss percentage of the proposal.
+    ``-inf`` where the stop does not move (no custom stop, trailing disabled or the offset
+    not reached).
+    """
+    candidates = np.full(len(bound), -np.inf)
+    percent = np.full(len(bound), abs(rules.stoploss))
+    if custom is not None:
+        valid = ~np.isnan(custom) & (custom != 0)
+        percent = np.where(valid, np.abs(custom), percent)
+        candidates = np.where(valid, _stop(bound, trade, percent, tick), -np.inf)
+    if not rules.trailing_stop:
+        return candidates, percent
+    offset = rules.trailing_stop_positive_offset
+    trailing_percent = percent
+    if rules.trailing_stop_positive is not None:
+        trailing_percent = np.where(best > offset, abs(rules.trailing_stop_positive), percent)
+    trailing = _stop(bound, trade, trailing_percent, tick)
+    if rules.trailing_only_offset_is_reached:
+        trailing = np.where(best < offset, -np.inf, trailing)
+    # The trailing stop is adjusted after the custom stop: its percentage is kept if higher.
+    percent = np.where(trailing > candidates, trailing_percent, percent)
+    return np.maximum(candidates, trailing), percent
+
+
+def _stop_rate(candles: _Candles, rules: ExitRules, trade: _Trade, index: int, stop: float,
+               trailing: bool, duration: int, percent: float) -> float:
+    open_, side = candles.open[index], trade.side
+    if (stop > candles.high[index]) if side == 1 else (stop < candles.low[index]):
+        # Gapped through the stop: the backtester exits at the open.
+        return open_
+    if trailing and duration == 0:
+        # Trailing stop hit on the entry candle: the backtester assumes the worst path.
+        if (candles.custom_stoploss is None and rules.trailing_only_offset_is_reached
+                and rules.trailing_stop_positive):
+            rate = open_ * (1 + side * abs(rules.trailing_stop_positive_offset)
+                            - side * abs(rules.trailing_stop_positive) / trade.leverage)
+        else:
+            rate = open_ * (1 - side * percent / trade.leverage)
+        return max(candles.low[index], rate) if side == 1 else min(candles.high[index], rate)
+    return stop
+
+
+def _roi_rate(candles: _Candles, trade: _Trade, index: int, funding: float, fee: float,
+              roi: float, roi_minutes: int, duration: int) -> float:
+    open_, side = candles.open[index], trade.side
+    on_candle_open = roi_minutes % candles.timeframe_minutes == 0
+    if roi == -1 and on_candle_open:
+        return open_
+    # freqtrade's calc_close_rate_for_roi: the close value is (1 -+ fee) * rate - funding.
+    close_rate = ((1 + side * roi / trade.leverage) * trade.open_value + funding) \
+        / (1 - side * fee)
+    if (duration > 0 and duration == roi_minutes and on_candle_open
+            and side * open_ > side * close_rate):
+        # A new ROI step starts at this candle's open, which is already beyond it.
+        return open_
+    return min(max(close_rate, candles.low[index]), candles.high[index])
+
+
+def _profit(rate: np.ndarray, trade: _Trade, funding: np.ndarray, fee: float) -> np.ndarray:
+    """freqtrade's profit ratio of the trade closed at ``rate``, funding included."""
+    close_value = rate * (1 - trade.side * fee) - funding
+    return np.round(trade.side * (close_value / trade.open_value - 1) * trade.leverage, 8)
+
+
+def _find_exit(candles: _Candles, rules: ExitRules, roi_table: RoiTable,
+               market: FuturesMarket, liquidation: Liquidation, trade: _Trade, fee: float,
+               tick: Optional[float]) -> Tuple[int, float, str]:
+    """
+    Exit of ``trade``, searched in blocks of candles like ``spot._find_exit``.
+    :return: Tuple of (exit candle, close rate, exit reason)
+    """
+    length, side, entry = len(candles.open), trade.side, trade.entry
+    stop = trade.initial_stop
+    start, size = entry, FIRST_BLOCK
+    while start < length:
+        end = min(length, start + size)
+        block = slice(start, end)
+        high, low = candles.high[block], candles.low[block]
+        bound, adverse = (low, high) if trade.is_short else (high, low)
+        duration = candles.minutes[block] - candles.minutes[entry]
+        funding = market.paid[block] - market.paid_before[entry]
+        best = _profit(bound, trade, funding, fee)
+
+        if rules.use_exit_signal:
+            enter, exit_ = ((candles.enter_short, candles.exit_short) if trade.is_short
+                            else (candles.enter_long, candles.exit_long))
+            exit_signal = exit_[block] & ~enter[block]
+            if rules.exit_profit_only:
+                current = _profit(candles.open[block], trade, funding, fee)
+                exit_signal &= current > rules.exit_profit_offset
+        else:
+            exit_signal = np.zeros(end - start, dtype=bool)
+
+        custom = candles.custom_stoploss[block] if candles.custom_stoploss is not None \
+            else None
+        candidates, percent = _stop_candidates(rules, trade, bound, best, custom, tick)
+        before = np.maximum.accumulate(np.concatenate(([stop], candidates[:-1])))
+        after = np.where(before < side * adverse,
+                         np.maximum(before, candidates), before)
+        stop_hit = after >= side * adverse
+
+        if liquidation.source == 'mark':
+            mark = market.mark_high[block] if trade.is_short else market.mark_low[block]
+        else:
+            mark = adverse
+        with np.errstate(invalid='ignore'):
+            liquidated = (side * trade.liquidation >= side * mark) & ~stop_hit
+
+        roi_minutes, roi = roi_table.lookup(duration)
+        roi_hit = best > roi
+        if rules.ignore_roi_if_entry_signal:
+            roi_hit &= ~(candles.enter_short if trade.is_short else candles.enter_long)[block]
+
+        hits = np.flatnonzero(exit_signal | stop_hit | liquidated | roi_hit)
+        if len(hits):
+            i = hits[0]
+            index = start + i
+            trailing = bool(after[i] > trade.initial_stop)
+            if exit_signal[i]:
+                tag = candles.exit_tag[index] if candles.exit_tag is not None else None
+                return index, candles.open[index], tag if isinstance(tag, str) and tag \
+                    else 'exit_signal'
+            if stop_hit[i] and not trailing:
+                return index, _stop_rate(candles, rules, trade, index, side * after[i], False,
+                                         duration[i], percent[i]), 'stop_loss'
+            if liquidated[i]:
+                return index, _stop_rate(candles, rules, trade, index, trade.liquidation,
+                                         False, duration[i], percent[i]), 'liquidation'
+            if roi_hit[i]:
+                return index, _roi_rate(candles, trade, index, funding[i], fee, roi[i],
+                                        roi_minutes[i], duration[i]), 'roi'
+            return index, _stop_rate(candles, rules, trade, index, side * after[i], True,
+                                     duration[i], percent[i]), 'trailing_stop_loss'
+        stop = after[-1]
+        start, size = end, size * 2
+    # Still open at the end of the data: force exit at the open of the last candle.
+    return length - 1, candles.open[length - 1], 'force_exit'
+
+
+def simulate_futures(df: DataFrame, rules: ExitRules, market: Optional[FuturesMarket] = None,
+                     fee: float = DEFAULT_FEE, startup_candles: int = 0,
+                     price_tick: Optional[float] = None, leverage: float = 1.0,
+                     leverage_column: Optional[str] = None, max_leverage: float = 20.0,
+                     stoploss_column: Optional[str] = None,
+                     liquidation: Optional[Liquidation] = None,
+                     can_short: bool = True) -> DataFrame:
+    """
+    Trades of a futures strategy on one pair, opened and closed as freqtrade's backtester
+    would (one trade at a time, one entry per trade).
+    :param df: Analysed dataframe with ``date``, OHLC and the entry / exit signal columns
+    :param rules: Exit settings, usually ``ExitRules.from_strategy``
+    :param market: Funding and mark candles of the pair. Without it, no funding is paid and
+        liquidation is checked against the trade candles
+    :param fee: Fee ratio paid on entry and on exit
+    :param startup_candles: Candles before the traded range (``startup_candle_count``)
+    :param price_tick: Price precision of the market, see ``spot.simulate_long``
+    :param leverage: Leverage of every trade, or of trades where ``leverage_column`` is nan
+    :param leverage_column: Column holding the leverage, read on the candle before the entry
+    :param max_leverage: Leverage is clipped to ``[1, max_leverage]`` like the callback's
+    :param stoploss_column: Column holding a custom stoploss (e.g. -0.05), read on the
+        previous candle
+    :param liquidation: Liquidation settings, ``Liquidation()`` by default
+    :param can_short: False to ignore the short signals
+    :return: DataFrame of trades with ``FUTURES_TRADE_COLUMNS``
+    """
+    df = df.reset_index(drop=True)
+    if len(df) < startup_candles + 2:
+        return DataFrame(columns=FUTURES_TRADE_COLUMNS)
+    candles = _Candles.from_dataframe(df, can_short, stoploss_column)
+    liquidation = liquidation or Liquidation()
+    if market is None or np.isnan(market.mark_low).all():
+        liquidation = replace(liquidation, source='candle')
+    market = market or FuturesMarket.flat(len(df))
+    roi_table = RoiTable(rules.minimal_roi)
+    leverages = shifted_values(df, leverage_column)
+    if leverages is None:
+        leverages = np.full(len(df), float(leverage))
+    leverages = np.clip(np.where(np.isnan(leverages), leverage, leverages), 1.0, max_leverage)
+
+    # The backtester starts one candle into the range and opens nothing on the last candle.
+    entries = []
+    for enter, exit_, other in ((candles.enter_long, candles.exit_long, candles.enter_short),
+                                (candles.enter_short, candles.exit_short, candles.enter_long)):
+        found = np.flatnonzero(enter & ~exit_ & ~other)
+        entries.append(found[(found > startup_candles) & (found < len(df) - 1)])
+
+    records = []
+    # First candle a long (short) trade may open on.
+    position = [0, 0]
+    while True:
+        k = [np.searchsorted(entries[i], position[i]) for i in (0, 1)]
+        upcoming = [entries[i][k[i]] if k[i] < len(entries[i]) else len(df) for i in (0, 1)]
+        is_short = bool(upcoming[1] < upcoming[0])
+        entry = int(upcoming[is_short])
+        if entry == len(df):
+            break
+        open_rate, trade_leverage = candles.open[entry], float(leverages[entry])
+        side = -1 if is_short else 1
+        trade = _Trade(entry, is_short, trade_leverage, open_rate * (1 + side * fee), 0.0,
+                       float(to_tick(liquidation.price(open_rate, trade_leverage, is_short),
+                                     price_tick)))
+        trade.initial_stop = float(_stop(np.array([open_rate]), trade,
+                                         np.array([abs(rules.stoploss)]), price_tick)[0])
+        index, rate, reason = _find_exit(candles, rules, roi_table, market, liquidation, trade,
+                                         fee, price_tick)
+        records.append((entry, int(index), open_rate, float(to_tick(rate, price_tick)), reason,
+                        is_short, trade_leverage,
+                        market.paid[index] - market.paid_before[entry]))
+        # A trade that was open before the candle closing it is reversed on that candle when
+        # it has an entry signal in the other direction; the same direction opens one later.
+        reverse = index if entry < index else index + 1
+        position = [reverse, index + 1] if is_short else [index + 1, reverse]
+
+    trades = DataFrame(records, columns=['open_index', 'close_index', 'open_rate',
+                                         'close_rate', 'exit_reason', 'is_short', 'leverage',
+                                         'funding'])
+    trades['open_date'] = df['date'].array.take(trades['open_index'].to_numpy())
+    trades['close_date'] = df['date'].array.take(trades['close_index'].to_numpy())
+    side = np.where(trades['is_short'], -1, 1)
+    open_value = trades['open_rate'] * (1 + side * fee)
+    close_value = trades['close_rate'] * (1 - side * fee) - trades['funding']
+    trades['profit_ratio'] = np.round(side * (close_value / open_value - 1)
+                                      * trades['leverage'], 8)
+    # Funding received, relative to the stake (margin) of the trade.
+    trades['funding_ratio'] = -side * trades['funding'] * trades['leverage'] \
+        / trades['open_rate']
+    return trades[FUTURES_TRADE_COLUMNS]
+
+
+@dataclass
+class Agreement:
+    """How closely simulated trades follow backtested ones."""
+    backtested: int = 0
+    simulated: int = 0
+    # Trades with the same pair, direction and open date in both ...
+    matched: int = 0
+    # ... of which also close on the same date for the same reason.
+    same_exit: int = 0
+    # Largest absolute profit ratio difference of the trades with the same exit.
+    max_profit_error: float = 0.0
+    profit_sum_backtested: float = 0.0
+    profit_sum_simulated: float = 0.0
+    mismatches: DataFrame = field(default_factory=DataFrame)
+
+    @property
+    def match_rate(self) -> float:
+        return self.same_exit / max(self.backtested, self.simulated, 1)
+
+    def within(self, match_rate: float = 0.95, profit_error: float = 1e-3) -> bool:
+        return self.match_rate >= match_rate and self.max_profit_error <= profit_error
+
+
+def compare_trades(simulated: DataFrame, backtested: DataFrame) -> Agreement:
+    """
+    Match the trades of ``simulate_futures`` (with a ``pair`` column) with the trades of a
+    backtest (``freqtrade.data.btanalysis.load_backtest_data``) by pair, direction and open
+    date.
+    """
+    keys = ['pair', 'is_short', 'open_date']
+    columns = keys + ['close_date', 'exit_reason', 'profit_ratio']
+    merged = simulated[columns].merge(backtested[columns], on=keys, how='outer',
+                                      suffixes=('_sim', '_bt'), indicator=True)
+    both = merged[merged['_merge'] == 'both']
+    same = both[(both['close_date_sim'] == both['close_date_bt'])
+                & (both['exit_reason_sim'] == both['exit_reason_bt'])]
+    error = (same['profit_ratio_sim'] - same['profit_ratio_bt']).abs()
+    return Agreement(
+        backtested=len(backtested), simulated=len(simulated), matched=len(both),
+        same_exit=len(same), max_profit_error=float(error.max()) if len(error) else 0.0,
+        profit_sum_backtested=float(backtested['profit_ratio'].sum()),
+        profit_sum_simulated=float(simulated['profit_ratio'].sum()),
+        mismatches=merged.drop(same.index).drop(columns='_merge'))
+
+
+def _trim(df: DataFrame, timerange: TimeRange, startup: int) -> Tuple[DataFrame, int]:
+    """Candles of ``timerange`` and up to ``startup`` candles before it."""
+    if timerange.starttype == 'date':
+        first = int(np.searchsorted(df['date'], timerange.startdt))
+        df, startup = df.iloc[max(0, first - startup):], min(first, startup)
+    if timerange.stoptype == 'date':
+        df = df[df['date'] <= timerange.stopdt]
+    return df.reset_index(drop=True), startup
+
+
+def screen_futures_strategy(strategy: IStrategy, datadir: Path, pairs: List[str],
+                            fee: float = DEFAULT_FEE, timeframe: Optional[str] = None,
+                            cache_dir: Optional[Path] = None, leverage: float = 1.0,
+                            leverage_column: Optional[str] = None,
+                            stoploss_column: Optional[str] = None,
+                            liquidation: Optional[Liquidation] = None,
+                            timerange: Optional[TimeRange] = None) -> ScreenResult:
+    """
+    Populate ``strategy`` on every pair (or read its cached signals) and simulate.
+    :param timerange: Traded range, after the strategy's startup candles - like a backtest's
+    """
+    from freqtrade_strategies.data.bundle import load_futures_bundle
+
+    timeframe = timeframe or strategy.timeframe
+    result = ScreenResult(type(strategy).__name__, timeframe,
+                          ignored=ignored_callbacks(strategy))
+    rules = ExitRules.from_strategy(strategy)
+    columns = FUTURES_SIGNAL_COLUMNS + [column for column in (leverage_column, stoploss_column)
+                                        if column]
+    trades = []
+    for pair in pairs:
+        started = time.perf_counter()
+        df = analysed_signals(strategy, datadir, pair, timeframe, cache_dir, columns)
+        simulated = time.perf_counter()
+        startup = strategy.startup_candle_count or 0
+        if timerange is not None:
+            df, startup = _trim(df, timerange, startup)
+        market = FuturesMarket.from_bundle(load_futures_bundle(datadir, pair), df['date'])
+        pair_trades = simulate_futures(
+            df, rules, market, fee, startup, leverage=leverage,
+            leverage_column=leverage_column, stoploss_column=stoploss_column,
+            liquidation=liquidation, can_short=bool(getattr(strategy, 'can_short', False)))
+        result.populate_seconds += simulated - started
+        result.simulate_seconds += time.perf_counter() - simulated
+        trades.append(pair_trades.assign(pair=pair))
+    result.trades = pd.concat(trades, ignore_index=True) if trades else DataFrame()
+    result.summary = summarize(result.trades)
+    return result
+
+
+def format_agreement(agreement: Agreement) -> str:
+    return (f'backtest {agreement.backtested} trades ({agreement.profit_sum_backtested:.2%}), '
+            f'simulation {agreement.simulated} ({agreement.profit_sum_simulated:.2%}): '
+            f'{agreement.matched} open together, {agreement.same_exit} exit together '
+            f'({agreement.match_rate:.1%}), max profit error {agreement.max_profit_error:.2e}')
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    from freqtrade_strategies.data.bundle import available_pairs
+    from freqtrade_strategies.offline import (find_strategy, load_strategy, offline_config,
+                                              quiet_stdout)
+
+    parser = argparse.ArgumentParser(
+        description='Simulate futures strategies with the vectorized futures simulator.')
+    parser.add_argument('strategies', nargs='+', help='Class names to simulate.')
+    parser.add_argument('--strategy-dir', type=Path, default=Path('user_data/strategies'))
+    parser.add_argument('--datadir', type=Path, default=Path('user_data/data/gateio/futures'))
+    parser.add_argument('--pairs', nargs='+', help='Default: every pair with 1h data.')
+    parser.add_argument('--fee', type=float, default=DEFAULT_FEE)
+    parser.add_argument('--leverage', type=float, default=1.0)
+    parser.add_argument('--leverage-column', help='Analysed column holding the leverage.')
+    parser.add_argument('--stoploss-column', help='Analysed column holding a custom stoploss.')
+    parser.add_argument('--liquidation', choices=['mark', 'candle'], default='mark',
+                        help='Prices the liquidation is checked against.')
+    parser.add_argument('--cache-dir', type=Path,
+                        default=Path('user_data/simulation/futures-signals'),
+                        help='Signals are cached here between runs.')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--timerange', help='Traded range, e.g. 20250601-20251001.')
+    parser.add_argument('--backtest-results', type=Path,
+                        help='Backtest result of the same strategies to compare with.')
+    parsed = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    warnings.simplefilter('ignore')
+    pairs = parsed.pairs or available_pairs(parsed.datadir, '1h')
+    liquidation = Liquidation(source=parsed.liquidation)
+
+    results = []
+    for name in parsed.strategies:
+        filename, class_name = find_strategy(parsed.strategy_dir, name)
+        result = ScreenResult(class_name)
+        with quiet_stdout():
+            try:
+                config = offline_config(parsed.datadir, pairs[0])
+                config['exchange']['pair_whitelist'] = list(pairs)
+                strategy = load_strategy(filename, class_name, config)
+                result = screen_futures_strategy(
+                    strategy, parsed.datadir, pairs, parsed.fee,
+                    cache_dir=None if parsed.no_cache else parsed.cache_dir,
+                    leverage=parsed.leverage, leverage_column=parsed.leverage_column,
+                    stoploss_column=parsed.stoploss_column, liquidation=liquidation,
+                    timerange=TimeRange.parse_timerange(parsed.timerange)
+                    if parsed.timerange else None)
+            except Exception as e:
+                result.error = f'{e.__class__.__name__}: {e}'
+        results.append(result)
+    print(format_results(results))
+
+    if parsed.backtest_results:
+        from freqtrade.data.btanalysis import load_backtest_data
+
+        for result in results:
+            if result.error or result.trades.empty:
+                continue
+            try:
+                backtested = load_backtest_data(parsed.backtest_results, result.strategy)
+            except ValueError as e:
+                print(f'{result.strategy}: {e}')
+                continue
+            agreement = compare_trades(result.trades, backtested)
+            print(f'{result.strategy}: {format_agreement(agreement)}')
+
+
+if __name__ == '__main__':
+    main()
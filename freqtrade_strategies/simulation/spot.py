@@ -0,0 +1,546 @@
+"""
+Vectorized signal-level backtest of long-only spot strategies.
+
+freqtrade's backtester walks every candle of every pair through the strategy's callbacks.
+Most long-only strategies only need their signals, ``minimal_roi``, ``stoploss`` and the
+trailing stop settings, and ``simulate_long`` reproduces the backtester's handling of these
+with array operations:
+
+* a trade opens at the open of the candle after an ``enter_long`` signal without
+  ``exit_long`` (the backtester's one candle shift), one trade at a time
+* from the entry candle on, the exit is the first candle with an exit signal, a stop at or
+  above the low, or a profit at the high above the ROI step of the trade's age. The stop is
+  the running maximum of the initial stop and the trailing candidates from the highs
+  (``np.maximum.accumulate``), the ROI step a ``searchsorted`` over the ``minimal_roi``
+  keys. Candles are searched in blocks doubling in size, so long trades cost a few array
+  operations instead of one Python iteration per candle
+* exits on the same candle are ranked like the backtester ranks them - exit signal,
+  stoploss, ROI, trailing stop - and close at the same rates: the open for exit signals
+  and gaps through the stop, the stop, or the ROI rate clamped to the candle
+
+Not simulated: callbacks (``custom_stoploss``, ``custom_exit``, ``custom_entry_price``,
+``confirm_trade_*``, position adjustment - ``ignored_callbacks`` lists the ones a strategy
+overrides), ``max_open_trades`` and protections (pairs trade independently), and price or
+amount precision. It is a pre-filter: run full backtests on the strategies that survive.
+
+Populating the strategies costs far more than simulating their trades, so the screening
+caches the signals per strategy and pair (``--cache-dir``); a rerun - with another fee, or
+after editing a few strategies - only simulates what is unchanged.
+
+Usage::
+
+    python -m freqtrade_strategies.simulation.spot --all
+    python -m freqtrade_strategies.simulation.spot Strategy001 BbandRsi --pairs BTC/USDT:USDT
+"""
+import argparse
+import inspect
+import logging
+import sys
+import time
+import warnings
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from freqtrade.misc import pair_to_filename
+from freqtrade.strategy import IStrategy
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEE = 0.001
+# Candles searched for the exit of a trade before the block size doubles.
+FIRST_BLOCK = 32
+# Callbacks the simulator does not run, with the attribute enabling them (if any).
+CALLBACKS = {
+    'custom_stoploss': 'use_custom_stoploss',
+    'custom_roi': 'use_custom_roi',
+    'custom_exit': None,
+    'custom_entry_price': None,
+    'custom_exit_price': None,
+    'confirm_trade_entry': None,
+    'confirm_trade_exit': None,
+    'adjust_trade_position': 'position_adjustment_enable',
+}
+# Columns of the analysed dataframe the simulation needs, kept by the signal cache.
+SIGNAL_CACHE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'enter_long', 'exit_long',
+                        'exit_tag']
+TRADE_COLUMNS = ['open_date', 'close_date', 'open_index', 'close_index', 'open_rate',
+                 'close_rate', 'profit_ratio', 'exit_reason']
+
+
+@dataclass
+class ExitRules:
+    """Exit settings of a strategy, with freqtrade's defaults."""
+    minimal_roi: Dict[int, float]
+    stoploss: float
+    trailing_stop: bool = False
+    trailing_stop_positive: Optional[float] = None
+    trailing_stop_positive_offset: float = 0.0
+    trailing_only_offset_is_reached: bool = False
+    use_exit_signal: bool = True
+    exit_profit_only: bool = False
+    exit_profit_offset: float = 0.0
+    ignore_roi_if_entry_signal: bool = False
+
+    @classmethod
+    def from_strategy(cls, strategy: IStrategy) -> 'ExitRules':
+        # Loaded without freqtrade's resolver, strategies lack the attributes it defaults.
+        def setting(name: str, default=None):
+            value = getattr(strategy, name, None)
+            return default if value is None else value
+
+        return cls(
+            minimal_roi={int(minutes): float(roi)
+                         for minutes, roi in setting('minimal_roi', {}).items()},
+            stoploss=float(strategy.stoploss),
+            trailing_stop=bool(setting('trailing_stop', False)),
+            trailing_stop_positive=setting('trailing_stop_positive'),
+            trailing_stop_positive_offset=float(setting('trailing_stop_positive_offset', 0.0)),
+            trailing_only_offset_is_reached=bool(setting('trailing_only_offset_is_reached',
+                                                         False)),
+            use_exit_signal=bool(setting('use_exit_signal', True)),
+            exit_profit_only=bool(setting('exit_profit_only', False)),
+            exit_profit_offset=float(setting('exit_profit_offset', 0.0)),
+            ignore_roi_if_entry_signal=bool(setting('ignore_roi_if_entry_signal', False)),
+        )
+
+
+def ignored_callbacks(strategy: IStrategy) -> List[str]:
+    """Callbacks ``strategy`` overrides (and enables) which the simulator does not run."""
+    ignored = []
+    for name, switch in CALLBACKS.items():
+        if getattr(type(strategy), name, None) is getattr(IStrategy, name, None):
+            continue
+        if switch is not None and not getattr(strategy, switch, False):
+            continue
+        ignored.append(name)
+    return ignored
+
+
+def shifted_signal(df: DataFrame, column: str) -> np.ndarray:
+    """``column == 1`` on the previous candle - the signal the backtester acts on."""
+    signal = np.zeros(len(df), dtype=bool)
+    if column in df.columns and len(df) > 1:
+        values = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)
+        signal[1:] = values[:-1] == 1
+    return signal
+
+
+def shifted_tag(df: DataFrame, column: str) -> Optional[np.ndarray]:
+    if column not in df.columns:
+        return None
+    tags = np.empty(len(df), dtype=object)
+    tags[1:] = df[column].to_numpy(dtype=object)[:-1]
+    return tags
+
+
+def candle_minutes(df: DataFrame) -> np.ndarray:
+    """Minutes since the first candle - trade durations as the backtester floors them."""
+    return ((df['date'] - df['date'].iloc[0]) // pd.Timedelta(minutes=1)).to_numpy(np.int64)
+
+
+class RoiTable:
+    """``minimal_roi`` as sorted arrays: the step in force after a trade duration."""
+
+    def __init__(self, minimal_roi: Dict[int, float]) -> None:
+        self.minutes = np.array(sorted(minimal_roi), dtype=np.int64)
+        self.values = np.array([minimal_roi[key] for key in self.minutes], dtype=float)
+
+    def lookup(self, duration: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param duration: Trade durations in minutes
+        :return: Tuple of (minutes key of the step, ROI) per duration, (-1, inf) before the
+            first step
+        """
+        index = np.searchsorted(self.minutes, duration, side='right') - 1
+        if not len(self.minutes):
+            return np.full(len(duration), -1), np.full(len(duration), np.inf)
+        before = index < 0
+        index[before] = 0
+        return (np.where(before, -1, self.minutes[index]),
+                np.where(before, np.inf, self.values[index]))
+
+
+@dataclass
+class _Candles:
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    minutes: np.ndarray
+    enter: np.ndarray
+    exit: np.ndarray
+    exit_tag: Optional[np.ndarray]
+    timeframe_minutes: int
+
+    @classmethod
+    def from_dataframe(cls, df: DataFrame) -> '_Candles':
+        minutes = candle_minutes(df)
+        steps = np.diff(minutes)
+        return cls(df['open'].to_numpy(dtype=float), df['high'].to_numpy(dtype=float),
+                   df['low'].to_numpy(dtype=float), minutes,
+                   shifted_signal(df, 'enter_long'), shifted_signal(df, 'exit_long'),
+                   shifted_tag(df, 'exit_tag'), int(steps.min()) if len(steps) else 1)
+
+
+def to_tick(prices, tick: Optional[float], up: bool = False, down: bool = False):
+    """
+    ``prices`` rounded to the nearest multiple of ``tick`` - or up (down) to the next one, as
+    the backtester rounds long (short) stops. Like freqtrade, a price is compared in its
+    decimal representation: ``9.3 * 0.9`` is 8.370000000000001 and rounds up to 8.38 on a
+    0.01 tick.
+    """
+    if not tick:
+        return prices
+    decimals = max(0, -Decimal(str(tick)).as_tuple().exponent)
+    prices = np.asarray(prices, dtype=float)
+    nearest = np.round(prices / tick)
+    if up:
+        nearest = np.where(prices > np.round(nearest * tick, decimals), nearest + 1, nearest)
+    elif down:
+        nearest = np.where(prices < np.round(nearest * tick, decimals), nearest - 1, nearest)
+    return np.round(nearest * tick, decimals)
+
+
+def _trailing_candidates(rules: ExitRules, high: np.ndarray, best: np.ndarray,
+                         tick: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stop each candle's high proposes, and the stoploss percentage it uses.
+    ``-inf`` where the trailing stop does not move (disabled, or the offset is not reached).
+    """
+    percent = np.full(len(high), abs(rules.stoploss))
+    if not rules.trailing_stop:
+        return np.full(len(high), -np.inf), percent
+    offset = rules.trailing_stop_positive_offset
+    if rules.trailing_stop_positive is not None:
+        percent = np.where(best > offset, abs(rules.trailing_stop_positive), percent)
+    candidates = to_tick(high * (1 - percent), tick, up=True)
+    if rules.trailing_only_offset_is_reached:
+        candidates = np.where(best < offset, -np.inf, candidates)
+    return candidates, percent
+
+
+def _stop_rate(candles: _Candles, rules: ExitRules, index: int, stop: float, trailing: bool,
+               duration: int, percent: float) -> float:
+    if stop > candles.high[index]:
+        # Gapped through the stop: the backtester exits at the open.
+        return candles.open[index]
+    if trailing and duration == 0:
+        # Trailing stop hit on the entry candle: the backtester assumes the worst path.
+        open_ = candles.open[index]
+        if rules.trailing_only_offset_is_reached and rules.trailing_stop_positive:
+            rate = open_ * (1 + abs(rules.trailing_stop_positive_offset)
+                            - abs(rules.trailing_stop_positive))
+        else:
+            rate = open_ * (1 - percent)
+        return max(candles.low[index], rate)
+    return stop
+
+
+def _roi_rate(candles: _Candles, index: int, open_value: float, fee: float, roi: float,
+              roi_minutes: int, duration: int) -> float:
+    open_ = candles.open[index]
+    on_candle_open = roi_minutes % candles.timeframe_minutes == 0
+    if roi == -1 and on_candle_open:
+        return open_
+    close_rate = open_value * (1 + roi) / (1 - fee)
+    if duration > 0 and duration == roi_minutes and on_candle_open and open_ > close_rate:
+        # A new ROI step starts at this candle's open, which is already above it.
+        return open_
+    return min(max(close_rate, candles.low[index]), candles.high[index])
+
+
+def _find_exit(candles: _Candles, rules: ExitRules, roi_table: RoiTable, entry: int,
+               fee: float, tick: Optional[float]) -> Tuple[int, float, str]:
+    """
+    Exit of the trade opened at the open of candle ``entry``.
+    :return: Tuple of (exit candle, close rate, exit reason)
+    """
+    length = len(candles.open)
+    open_value = candles.open[entry] * (1 + fee)
+    # Stops are rounded up to the price tick, like the backtester does for long trades.
+    initial_stop = float(to_tick(candles.open[entry] * (1 - abs(rules.stoploss)), tick,
+                                 up=True))
+    stop = initial_stop
+    start, size = entry, FIRST_BLOCK
+    while start < length:
+        end = min(length, start + size)
+        block = slice(start, end)
+        high, low = candles.high[block], candles.low[block]
+        duration = candles.minutes[block] - candles.minutes[entry]
+        best = np.round(high * (1 - fee) / open_value - 1, 8)
+
+        if rules.use_exit_signal:
+            exit_signal = candles.exit[block] & ~candles.enter[block]
+            if rules.exit_profit_only:
+                current = np.round(candles.open[block] * (1 - fee) / open_value - 1, 8)
+                exit_signal &= current > rules.exit_profit_offset
+        else:
+            exit_signal = np.zeros(end - start, dtype=bool)
+
+        # The stop moves up with the high of every candle its previous value is below the
+        # low of - i.e. every candle until it is hit.
+        candidates, percent = _trailing_candidates(rules, high, best, tick)
+        before = np.maximum.accumulate(np.concatenate(([stop], candidates[:-1])))
+        after = np.where(before < low, np.maximum(before, candidates), before)
+        stop_hit = after >= low
+
+        roi_minutes, roi = roi_table.lookup(duration)
+        roi_hit = best > roi
+        if rules.ignore_roi_if_entry_signal:
+            roi_hit &= ~candles.enter[block]
+
+        hits = np.flatnonzero(exit_signal | stop_hit | roi_hit)
+        if len(hits):
+            i = hits[0]
+            index = start + i
+            trailing = bool(after[i] > initial_stop)
+            if exit_signal[i]:
+                tag = candles.exit_tag[index] if candles.exit_tag is not None else None
+                return index, candles.open[index], tag if isinstance(tag, str) and tag \
+                    else 'exit_signal'
+            if stop_hit[i] and not trailing:
+                return index, _stop_rate(candles, rules, index, after[i], False, duration[i],
+                                         percent[i]), 'stop_loss'
+            if roi_hit[i]:
+                return index, _roi_rate(candles, index, open_value, fee, roi[i],
+                                        roi_minutes[i], duration[i]), 'roi'
+            return index, _stop_rate(candles, rules, index, after[i], True, duration[i],
+                                     percent[i]), 'trailing_stop_loss'
+        stop = after[-1]
+        start, size = end, size * 2
+    # Still open at the end of the data: force exit at the open of the last candle.
+    return length - 1, candles.open[length - 1], 'force_exit'
+
+
+def simulate_long(df: DataFrame, rules: ExitRules, fee: float = DEFAULT_FEE,
+                  startup_candles: int = 0, price_tick: Optional[float] = None) -> DataFrame:
+    """
+    Trades of a long-only strategy on one pair, opened and closed as freqtrade's backtester
+    would (one trade at a time, no callbacks).
+    :param df: Analysed dataframe with ``date``, OHLC and ``enter_long`` / ``exit_long``
+    :param rules: Exit settings, usually ``ExitRules.from_strategy``
+    :param fee: Fee ratio paid on entry and on exit
+    :param startup_candles: Candles before the traded range (``startup_candle_count``)
+    :param price_tick: Price precision of the market. Stops and close rates are rounded to
+        it when given - needed to match backtests to the last digit, not for screening
+    :return: DataFrame of trades with ``TRADE_COLUMNS``
+    """
+    df = df.reset_index(drop=True)
+    if len(df) < startup_candles + 2:
+        return DataFrame(columns=TRADE_COLUMNS)
+    candles = _Candles.from_dataframe(df)
+    roi_table = RoiTable(rules.minimal_roi)
+    # The backtester starts one candle into the range and opens nothing on the last candle.
+    entries = np.flatnonzero(candles.enter & ~candles.exit)
+    entries = entries[(entries > startup_candles) & (entries < len(df) - 1)]
+
+    records = []
+    position = 0
+    while True:
+        k = np.searchsorted(entries, position)
+        if k == len(entries):
+            break
+        entry = int(entries[k])
+        index, rate, reason = _find_exit(candles, rules, roi_table, entry, fee, price_tick)
+        records.append((entry, int(index), candles.open[entry],
+                        float(to_tick(rate, price_tick)), reason))
+        # The exit is processed after the entries of its candle: next entry one candle later.
+        position = index + 1
+
+    trades = DataFrame(records, columns=['open_index', 'close_index', 'open_rate',
+                                         'close_rate', 'exit_reason'])
+    # ``take`` on the array keeps the timezone-aware dtype (``to_numpy`` boxes Timestamps).
+    trades['open_date'] = df['date'].array.take(trades['open_index'].to_numpy())
+    trades['close_date'] = df['date'].array.take(trades['close_index'].to_numpy())
+    trades['profit_ratio'] = np.round(trades['close_rate'] * (1 - fee)
+                                      / (trades['open_rate'] * (1 + fee)) - 1, 8)
+    return trades[TRADE_COLUMNS]
+
+
+@dataclass
+class SimulationSummary:
+    trades: int = 0
+    wins: int = 0
+    # Mean and sum of the per trade profit ratios.
+    profit_mean: float = 0.0
+    profit_sum: float = 0.0
+    # Largest drop of the summed profit ratios, trades ordered by close date.
+    max_drawdown: float = 0.0
+    profit_factor: float = 0.0
+    mean_candles: float = 0.0
+    exit_reasons: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.trades if self.trades else 0.0
+
+
+def summarize(trades: DataFrame) -> SimulationSummary:
+    """Summary metrics of the trades of one or several pairs."""
+    if trades.empty:
+        return SimulationSummary()
+    trades = trades.sort_values('close_date', kind='stable')
+    profit = trades['profit_ratio'].to_numpy(dtype=float)
+    equity = np.concatenate(([0.0], np.cumsum(profit)))
+    gains, losses = profit[profit > 0].sum(), -profit[profit < 0].sum()
+    return SimulationSummary(
+        trades=len(profit), wins=int((profit > 0).sum()), profit_mean=float(profit.mean()),
+        profit_sum=float(profit.sum()),
+        max_drawdown=float((np.maximum.accumulate(equity) - equity).max()),
+        profit_factor=float(gains / losses) if losses else float('inf') if gains else 0.0,
+        mean_candles=float((trades['close_index'] - trades['open_index']).mean()),
+        exit_reasons=dict(Counter(trades['exit_reason'])))
+
+
+@dataclass
+class ScreenResult:
+    strategy: str
+    timeframe: str = ''
+    trades: DataFrame = field(default_factory=DataFrame)
+    summary: SimulationSummary = field(default_factory=SimulationSummary)
+    populate_seconds: float = 0.0
+    simulate_seconds: float = 0.0
+    ignored: List[str] = field(default_factory=list)
+    error: str = ''
+
+
+def signal_cache_file(cache_dir: Path, strategy: str, pair: str, timeframe: str) -> Path:
+    return Path(cache_dir) / strategy / f'{pair_to_filename(pair)}-{timeframe}.feather'
+
+
+def analysed_signals(strategy: IStrategy, datadir: Path, pair: str, timeframe: str,
+                     cache_dir: Optional[Path] = None,
+                     columns: List[str] = SIGNAL_CACHE_COLUMNS) -> DataFrame:
+    """
+    Candles and signal columns of ``strategy`` on ``pair``. With ``cache_dir``, they are
+    read from there when the cache is newer than the strategy file and the candle data, and
+    written there otherwise - populating is what makes screening slow, not the simulation.
+    :param columns: Columns kept (when present) in the result and the cache
+    """
+    from freqtrade_strategies.offline import load_candles
+
+    cached = None
+    if cache_dir is not None:
+        cached = signal_cache_file(cache_dir, type(strategy).__name__, pair, timeframe)
+        sources = [Path(inspect.getfile(type(strategy))),
+                   *Path(datadir).glob(f'{pair_to_filename(pair)}-*-futures.feather')]
+        if cached.is_file() and all(cached.stat().st_mtime >= source.stat().st_mtime
+                                    for source in sources):
+            return pd.read_feather(cached)
+    candles, _ = load_candles(datadir, pair, timeframe)
+    metadata = {'pair': pair}
+    df = IStrategy.advise_indicators(strategy, candles, metadata)
+    df = IStrategy.advise_exit(strategy, IStrategy.advise_entry(strategy, df, metadata),
+                               metadata)
+    df = df[[column for column in columns if column in df.columns]]
+    if cached is not None:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        df.reset_index(drop=True).to_feather(cached)
+    return df
+
+
+def screen_strategy(strategy: IStrategy, datadir: Path, pairs: List[str],
+                    fee: float = DEFAULT_FEE, timeframe: Optional[str] = None,
+                    cache_dir: Optional[Path] = None) -> ScreenResult:
+    """Populate ``strategy`` on every pair (or read its cached signals) and simulate."""
+    timeframe = timeframe or strategy.timeframe
+    result = ScreenResult(type(strategy).__name__, timeframe,
+                          ignored=ignored_callbacks(strategy))
+    rules = ExitRules.from_strategy(strategy)
+    trades = []
+    for pair in pairs:
+        started = time.perf_counter()
+        df = analysed_signals(strategy, datadir, pair, timeframe, cache_dir)
+        simulated = time.perf_counter()
+        pair_trades = simulate_long(df, rules, fee, strategy.startup_candle_count or 0)
+        result.populate_seconds += simulated - started
+        result.simulate_seconds += time.perf_counter() - simulated
+        trades.append(pair_trades.assign(pair=pair))
+    result.trades = pd.concat(trades, ignore_index=True) if trades else DataFrame()
+    result.summary = summarize(result.trades)
+    return result
+
+
+def format_results(results: List[ScreenResult]) -> str:
+    lines = [f'{"strategy":<36} {"tf":>4} {"trades":>7} {"win%":>6} {"mean%":>7} '
+             f'{"sum%":>9} {"maxDD%":>8} {"PF":>6} {"populate":>9} {"simulate":>9}  notes']
+    ranked = sorted(results, key=lambda result: (bool(result.error),
+                                                 -result.summary.profit_sum))
+    for result in ranked:
+        if result.error:
+            lines.append(f'{result.strategy:<36} {result.timeframe:>4}  ERROR {result.error}')
+            continue
+        summary = result.summary
+        notes = f'ignores {", ".join(result.ignored)}' if result.ignored else ''
+        lines.append(
+            f'{result.strategy:<36} {result.timeframe:>4} {summary.trades:>7} '
+            f'{summary.win_rate:>6.1%} {summary.profit_mean:>7.2%} {summary.profit_sum:>9.1%} '
+            f'{summary.max_drawdown:>8.1%} {summary.profit_factor:>6.2f} '
+            f'{result.populate_seconds:>8.2f}s {result.simulate_seconds:>8.3f}s  {notes}')
+    lines.append(f'{len(results)} strategies: populate (or cached signals) '
+                 f'{sum(result.populate_seconds for result in results):.1f}s, simulate '
+                 f'{sum(result.simulate_seconds for result in results):.2f}s')
+    return '\n'.join(lines)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    from freqtrade_strategies.data.bundle import available_pairs
+    from freqtrade_strategies.offline import (discover_strategies, find_strategy, load_strategy,
+                                              offline_config, quiet_stdout)
+
+    parser = argparse.ArgumentParser(
+        description='Screen long-only strategies with the vectorized spot simulator.')
+    parser.add_argument('strategies', nargs='*', help='Class names to screen.')
+    parser.add_argument('--all', action='store_true',
+                        help='Screen every strategy found that cannot short, outside of '
+                             'futures/.')
+    parser.add_argument('--strategy-dir', type=Path, default=Path('user_data/strategies'))
+    parser.add_argument('--datadir', type=Path, default=Path('user_data/data/gateio/futures'))
+    parser.add_argument('--pairs', nargs='+', help='Default: every pair with 1h data.')
+    parser.add_argument('--fee', type=float, default=DEFAULT_FEE)
+    parser.add_argument('--cache-dir', type=Path, default=Path('user_data/simulation/signals'),
+                        help='Signals are cached here between runs.')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--default-timeframe', default='5m',
+                        help='Timeframe of strategies that do not define one.')
+    parsed = parser.parse_args(args)
+    if not parsed.all and not parsed.strategies:
+        parser.error('Name strategies to screen or pass --all.')
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    warnings.simplefilter('ignore')
+    pairs = parsed.pairs or available_pairs(parsed.datadir, '1h')
+    if parsed.all:
+        found = discover_strategies(parsed.strategy_dir)
+    else:
+        found = [find_strategy(parsed.strategy_dir, name) for name in parsed.strategies]
+
+    results = []
+    for filename, class_name in found:
+        cls = getattr(sys.modules.get(filename.stem), class_name, None)
+        if parsed.all and (getattr(cls, 'can_short', False) or 'futures' in filename.parts):
+            continue
+        timeframe = getattr(cls, 'timeframe', None) or parsed.default_timeframe
+        result = ScreenResult(class_name, timeframe)
+        with quiet_stdout():
+            try:
+                config = offline_config(parsed.datadir, pairs[0], timeframe=timeframe)
+                config['exchange']['pair_whitelist'] = list(pairs)
+                strategy = load_strategy(filename, class_name, config)
+                result = screen_strategy(strategy, parsed.datadir, pairs, parsed.fee, timeframe,
+                                         None if parsed.no_cache else parsed.cache_dir)
+            except Exception as e:
+                result.error = f'{e.__class__.__name__}: {e}'
+        results.append(result)
+    print(format_results(results))
+
+
+if __name__ == '__main__':
+    main()
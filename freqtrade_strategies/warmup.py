@@ -0,0 +1,287 @@
+"""
+Warmup-length analyzer: the smallest safe ``startup_candle_count`` of a strategy.
+
+Recursive indicators (EMA, ADX, ATR, SAR, Supertrend, ...) depend on every earlier candle,
+with an influence that decays with distance. Started ``w`` candles before the candles that
+are traded, they differ from their fully warmed-up values by an amount shrinking with
+``w``. ``analyze_warmup`` runs the populate methods on the last ``window`` candles preceded
+by ``w`` warmup candles and compares every column on those ``window`` candles with a
+reference run preceded by ``max_warmup`` candles:
+
+* per column, the smallest ``w`` within ``tolerance`` (relative to the column's typical
+  magnitude) is found by doubling ``w`` and bisecting - runs are cached and shared by all
+  columns
+* the recommendation is the largest of these, over the columns that converge at all
+  (cumulative columns such as OBV levels depend on the first candle forever)
+* columns constant over the reference window are reported as not analysable: they match
+  any warmup trivially, and usually point at an indicator that is not computed at all
+* entry and exit signals with the recommended warmup are verified identical to those of
+  the reference run; if they are not, the warmup is doubled until they are
+
+Usage::
+
+    python -m freqtrade_strategies.warmup Supertrend FSupertrendStrategy VolatilitySystem
+    python -m freqtrade_strategies.warmup VolatilitySystemV5 --tolerance 1e-4 --window 1000
+"""
+import argparse
+import logging
+import sys
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from freqtrade.strategy import IStrategy
+
+from freqtrade_strategies.columns import CANDLE_COLUMNS, SIGNAL_COLUMNS
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 500
+DEFAULT_MAX_WARMUP = 2000
+DEFAULT_TOLERANCE = 1e-5
+
+
+@dataclass
+class ColumnWarmup:
+    column: str
+    # Warmup candles after which the column stays within tolerance, None if it never does.
+    candles: Optional[int]
+    # Largest difference left at the recommended warmup, relative to the column's magnitude.
+    error: float = 0.0
+    # False if the column is constant over the reference window - no warmup can be derived.
+    analysable: bool = True
+
+
+@dataclass
+class WarmupReport:
+    strategy: str
+    startup_candle_count: int
+    window: int
+    max_warmup: int
+    columns: List[ColumnWarmup] = field(default_factory=list)
+    recommended: int = 0
+    # Signals of the window with these warmups equal those of the reference run.
+    signals_identical: Dict[int, bool] = field(default_factory=dict)
+    runs: int = 0
+
+    @property
+    def unconverged(self) -> List[str]:
+        return [column.column for column in self.columns
+                if column.analysable and column.candles is None]
+
+    @property
+    def constant(self) -> List[str]:
+        return [column.column for column in self.columns if not column.analysable]
+
+
+def relative_error(reference: pd.Series, values: pd.Series) -> np.ndarray:
+    """
+    Per candle difference of ``values`` to ``reference``, relative to the median magnitude of
+    ``reference``. A value missing on one side only counts as infinitely wrong.
+    """
+    left = pd.to_numeric(reference, errors='coerce').to_numpy(dtype=float)
+    right = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    left_na, right_na = np.isnan(left), np.isnan(right)
+    scale = np.nanmedian(np.abs(left)) if not left_na.all() else 0.0
+    with np.errstate(invalid='ignore'):
+        error = np.abs(left - right) / (scale if scale > 0 else 1.0)
+    error[left_na & right_na] = 0.0
+    error[left_na != right_na] = np.inf
+    return error
+
+
+def _differs(reference: pd.Series, values: pd.Series) -> bool:
+    """Exact comparison for non-numeric columns (tags, "up"/"down" flags)."""
+    left, right = reference.to_numpy(), values.to_numpy()
+    left_na, right_na = pd.isna(left), pd.isna(right)
+    different = np.asarray(left != right, dtype=bool) & ~left_na & ~right_na
+    return bool(((left_na != right_na) | different).any())
+
+
+def _constant(series: pd.Series) -> bool:
+    """True if ``series`` holds at most one distinct value, missing values included."""
+    return series.nunique(dropna=False) <= 1
+
+
+def _numeric(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)
+
+
+class _WarmupRuns:
+    """Populate runs on the last ``window`` candles after ``w`` warmup candles, cached by w."""
+
+    def __init__(self, strategy: IStrategy, candles: DataFrame, metadata: dict,
+                 window: int) -> None:
+        self.strategy = strategy
+        self.candles = candles
+        self.metadata = metadata
+        self.window = window
+        self._results: Dict[int, DataFrame] = {}
+
+    def __call__(self, warmup: int) -> DataFrame:
+        if warmup not in self._results:
+            df = self.candles.iloc[-(self.window + warmup):].reset_index(drop=True)
+            strategy, metadata = self.strategy, self.metadata
+            df = IStrategy.advise_indicators(strategy, df, metadata)
+            df = IStrategy.advise_exit(strategy, IStrategy.advise_entry(strategy, df, metadata),
+                                       metadata)
+            self._results[warmup] = df.iloc[-self.window:].reset_index(drop=True)
+        return self._results[warmup]
+
+    @property
+    def runs(self) -> int:
+        return len(self._results)
+
+
+def _column_error(runs: _WarmupRuns, column: str, warmup: int, max_warmup: int) -> float:
+    """Largest relative error of ``column`` on the window after ``warmup`` candles."""
+    result, reference = runs(warmup), runs(max_warmup)
+    if column not in result.columns:
+        return np.inf
+    if not _numeric(reference[column]):
+        return np.inf if _differs(reference[column], result[column]) else 0.0
+    error = relative_error(reference[column], result[column])
+    return float(error.max()) if len(error) else 0.0
+
+
+def _signals_identical(runs: _WarmupRuns, warmup: int, max_warmup: int) -> bool:
+    result, reference = runs(warmup), runs(max_warmup)
+    for column in SIGNAL_COLUMNS:
+        if column not in reference.columns:
+            continue
+        if column not in result.columns or _differs(reference[column], result[column]):
+            return False
+    return True
+
+
+def analyze_warmup(strategy: IStrategy, candles: DataFrame, metadata: dict,
+                   window: int = DEFAULT_WINDOW, max_warmup: int = DEFAULT_MAX_WARMUP,
+                   tolerance: float = DEFAULT_TOLERANCE) -> WarmupReport:
+    """
+    Warmup every column of ``strategy`` needs, and the smallest warmup with unchanged signals.
+    :param candles: History, oldest first. Needs ``window`` + ``max_warmup`` candles
+    :param window: Candles the columns and signals are compared on
+    :param max_warmup: Warmup of the reference run
+    :param tolerance: Largest accepted difference, relative to each column's median magnitude
+    :return: Report with per column convergence and the recommended startup_candle_count
+    """
+    max_warmup = min(max_warmup, len(candles) - window)
+    if max_warmup <= 0:
+        raise ValueError(f'{len(candles)} candles cannot hold a window of {window} candles '
+                         f'and a warmup.')
+    report = WarmupReport(type(strategy).__name__, strategy.startup_candle_count or 0, window,
+                          max_warmup)
+    runs = _WarmupRuns(strategy, candles, metadata, window)
+    columns = [column for column in runs(max_warmup).columns
+               if column not in CANDLE_COLUMNS and column not in SIGNAL_COLUMNS]
+
+    def converged(column: str, warmup: int) -> bool:
+        return _column_error(runs, column, warmup, max_warmup) <= tolerance
+
+    for column in columns:
+        if _constant(runs(max_warmup)[column]):
+            report.columns.append(ColumnWarmup(column, None, analysable=False))
+            continue
+        if not converged(column, max_warmup // 2):
+            # Still off with half the reference warmup: cumulative, or looking at the start.
+            report.columns.append(ColumnWarmup(column, None))
+            continue
+        # Double up to a converged warmup, then bisect below it.
+        low, high = 0, 1
+        while high < max_warmup // 2 and not converged(column, high):
+            low, high = high, min(high * 2, max_warmup // 2)
+        if low == 0 and converged(column, 0):
+            high = 0
+        while high - low > 1:
+            middle = (low + high) // 2
+            if converged(column, middle):
+                high = middle
+            else:
+                low = middle
+        report.columns.append(ColumnWarmup(column, high))
+
+    recommended = max((column.candles for column in report.columns
+                       if column.analysable and column.candles is not None), default=0)
+    while recommended < max_warmup and not _signals_identical(runs, recommended, max_warmup):
+        recommended = min(max(recommended * 2, 1), max_warmup)
+    report.recommended = recommended
+    for column in report.columns:
+        if column.analysable:
+            column.error = _column_error(runs, column.column, recommended, max_warmup)
+    for warmup in sorted({recommended, report.startup_candle_count}):
+        report.signals_identical[warmup] = _signals_identical(runs, warmup, max_warmup)
+    report.columns.sort(key=lambda column: (not column.analysable,
+                                            -1 if column.candles is None else -column.candles))
+    report.runs = runs.runs
+    return report
+
+
+def format_report(report: WarmupReport, top: int = 15) -> str:
+    def identical(warmup: int) -> str:
+        return 'identical' if report.signals_identical.get(warmup) else 'DIFFERENT'
+
+    lines = [f'{report.strategy}: startup_candle_count {report.startup_candle_count} '
+             f'(signals {identical(report.startup_candle_count)}), recommended '
+             f'{report.recommended} (signals {identical(report.recommended)}) - '
+             f'{report.window} candles compared against {report.max_warmup} warmup candles, '
+             f'{report.runs} populate runs']
+    if report.columns and not any(column.analysable for column in report.columns):
+        lines.append('  no column varies over the window - recommendation rests on the '
+                     'signals only')
+    for column in report.columns[:top]:
+        if not column.analysable:
+            lines.append(f'  {column.column:<32} not analysable (constant over the window)')
+            continue
+        candles = 'never' if column.candles is None else f'{column.candles:>5}'
+        lines.append(f'  {column.column:<32} converges after {candles} candles  '
+                     f'(error at recommended: {column.error:.1e})')
+    if len(report.columns) > top:
+        lines.append(f'  ... {len(report.columns) - top} more columns')
+    return '\n'.join(lines)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    from freqtrade_strategies.offline import (find_strategy, load_candles, load_strategy,
+                                              offline_config, quiet_stdout)
+
+    parser = argparse.ArgumentParser(
+        description='Recommend the smallest safe startup_candle_count of strategies.')
+    parser.add_argument('strategies', nargs='+')
+    parser.add_argument('--strategy-dir', type=Path, default=Path('user_data/strategies'))
+    parser.add_argument('--datadir', type=Path, default=Path('user_data/data/gateio/futures'))
+    parser.add_argument('--pair', default='BTC/USDT:USDT')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW)
+    parser.add_argument('--max-warmup', type=int, default=DEFAULT_MAX_WARMUP)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--default-timeframe', default='5m',
+                        help='Timeframe of strategies that do not define one.')
+    parsed = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    warnings.simplefilter('ignore')
+    for name in parsed.strategies:
+        with quiet_stdout():
+            try:
+                filename, class_name = find_strategy(parsed.strategy_dir, name)
+                timeframe = (getattr(getattr(sys.modules[filename.stem], class_name), 'timeframe',
+                                     None) or parsed.default_timeframe)
+                config = offline_config(parsed.datadir, parsed.pair, timeframe=timeframe)
+                strategy = load_strategy(filename, class_name, config)
+                candles, _ = load_candles(parsed.datadir, parsed.pair, timeframe)
+                text = format_report(analyze_warmup(strategy, candles, {'pair': parsed.pair},
+                                                    parsed.window, parsed.max_warmup,
+                                                    parsed.tolerance), parsed.top)
+            except Exception as e:
+                text = f'{name}: ERROR {e.__class__.__name__}: {e}'
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
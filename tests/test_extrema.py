@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+
+from freqtrade_strategies.indicators.extrema import (RollingExtrema, rolling_max,
+                                                     rolling_max_bank, rolling_min,
+                                                     rolling_min_bank)
+
+WINDOWS = [1, 2, 3, 7, 20, 100]
+
+
+def make_prices(count: int = 2000, seed: int = 1, nans: bool = True) -> np.ndarray:
+    """Rounded random walk (so extremes tie), with leading, scattered and a run of NaNs."""
+    rng = np.random.default_rng(seed)
+    prices = np.round(100 + np.cumsum(rng.normal(0, 1, count)))
+    if nans:
+        prices[:5] = np.nan
+        prices[rng.choice(count, count // 20, replace=False)] = np.nan
+        prices[1000:1030] = np.nan
+    return prices
+
+
+@pytest.mark.parametrize('window, min_periods', [
+    (window, min_periods) for window in WINDOWS for min_periods in (None, 1, 5)
+    if min_periods is None or min_periods <= window])
+def test_rolling_extrema_match_pandas(window, min_periods):
+    prices = make_prices()
+    rolling = pd.Series(prices).rolling(window, min_periods=min_periods)
+    np.testing.assert_array_equal(rolling_max(prices, window, min_periods), rolling.max())
+    np.testing.assert_array_equal(rolling_min(prices, window, min_periods), rolling.min())
+
+
+def test_rolling_extrema_rows():
+    rows = np.array([make_prices(seed=seed) for seed in (1, 2, 3)])
+    expected = pd.DataFrame(rows.T).rolling(20)
+    np.testing.assert_array_equal(rolling_max(rows, 20), expected.max().to_numpy().T)
+    np.testing.assert_array_equal(rolling_min(rows, 20), expected.min().to_numpy().T)
+
+
+@pytest.mark.parametrize('window', [2, 20, 100])
+def test_rolling_extrema_match_talib(window):
+    prices = make_prices(nans=False)
+    np.testing.assert_array_equal(rolling_max(prices, window), talib.MAX(prices, window))
+    np.testing.assert_array_equal(rolling_min(prices, window), talib.MIN(prices, window))
+
+
+def test_rolling_extrema_banks():
+    prices = make_prices()
+    highs, lows = rolling_max_bank(prices, WINDOWS), rolling_min_bank(prices, WINDOWS)
+    for window in WINDOWS:
+        np.testing.assert_array_equal(highs[window], pd.Series(prices).rolling(window).max())
+        np.testing.assert_array_equal(lows[window], pd.Series(prices).rolling(window).min())
+
+
+@pytest.mark.parametrize('window, min_periods', [(1, None), (3, None), (20, None), (20, 5)])
+def test_streaming_extrema_match_pandas(window, min_periods):
+    prices = make_prices()
+    stream = RollingExtrema(window, min_periods)
+    lows, highs = np.array([stream.update(price) for price in prices]).T
+    rolling = pd.Series(prices).rolling(window, min_periods=min_periods)
+    np.testing.assert_array_equal(highs, rolling.max())
+    np.testing.assert_array_equal(lows, rolling.min())
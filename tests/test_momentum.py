@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import talib
+
+from freqtrade_strategies.indicators.momentum import cci_bank, directional_bank, rsi_bank
+
+PERIODS = list(range(2, 40)) + [100, 200]
+
+# Largest absolute differences of the DIs, DX, ADX and RSI to TA-Lib on the 0-100 scale,
+# measured on these random walks and on ten futures pairs (1h and 5m), were ~2e-13.
+TOLERANCE = 1e-12
+
+
+def make_candles(count: int = 3000, seed: int = 1, case: str = 'random'):
+    """Random walk of high, low and close, optionally with TA-Lib's special cases."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    high = close * np.exp(np.abs(rng.normal(0, 0.004, count)))
+    low = close * np.exp(-np.abs(rng.normal(0, 0.004, count)))
+    if case == 'flat':
+        high[500:700] = low[500:700] = close[500:700] = close[500]
+    elif case == 'leading_nan':
+        for values in (high, low, close):
+            values[:30] = np.nan
+    elif case == 'interior_nan':
+        high[1500] = close[2000] = np.nan
+    return high, low, close
+
+
+def assert_matches(bank, function, *arrays, tolerance=TOLERANCE):
+    for period in bank.periods:
+        expected = function(*arrays, period)
+        np.testing.assert_array_equal(np.isnan(bank[period]), np.isnan(expected),
+                                      err_msg=f'period {period}')
+        np.testing.assert_allclose(bank[period], expected, rtol=0, atol=tolerance,
+                                   err_msg=f'period {period}')
+
+
+@pytest.mark.parametrize('case', ['random', 'flat', 'leading_nan', 'interior_nan'])
+def test_directional_bank_matches_talib(case):
+    candles = make_candles(case=case)
+    bank = directional_bank(*candles, PERIODS)
+    assert_matches(bank.plus_di, talib.PLUS_DI, *candles)
+    assert_matches(bank.minus_di, talib.MINUS_DI, *candles)
+    assert_matches(bank.dx, talib.DX, *candles)
+    assert_matches(bank.adx, talib.ADX, *candles)
+
+
+def test_directional_bank_short_history():
+    # ADX of the longer periods needs more candles than there are.
+    candles = make_candles(150)
+    bank = directional_bank(*candles, PERIODS)
+    assert_matches(bank.adx, talib.ADX, *candles)
+    assert_matches(bank.dx, talib.DX, *candles)
+    assert np.isnan(bank.adx[100]).all()
+
+
+@pytest.mark.parametrize('case', ['random', 'flat', 'leading_nan', 'interior_nan'])
+def test_rsi_bank_matches_talib(case):
+    close = make_candles(case=case)[2]
+    assert_matches(rsi_bank(close, PERIODS), talib.RSI, close)
+
+
+# CCI divides by the mean deviation, so nearly flat windows amplify rounding: 2e-10 was
+# measured on random walks, 1e-8 next to a flat stretch and 9.8e-8 on ten futures pairs.
+@pytest.mark.parametrize('case, tolerance', [('random', 1e-9), ('flat', 1e-7),
+                                             ('leading_nan', 1e-9), ('interior_nan', 1e-9)])
+def test_cci_bank_matches_talib(case, tolerance):
+    candles = make_candles(case=case)
+    assert_matches(cci_bank(*candles, PERIODS), talib.CCI, *candles, tolerance=tolerance)
+
+
+def test_momentum_banks_short_history():
+    high, low, close = make_candles(150)
+    assert_matches(rsi_bank(close, PERIODS), talib.RSI, close)
+    assert_matches(cci_bank(high, low, close, PERIODS), talib.CCI, high, low, close,
+                   tolerance=1e-9)
@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+import pytest
+import talib
+
+from freqtrade_strategies.indicators.moving_averages import ema_bank, sma_bank, tema_bank
+
+PERIODS = list(range(1, 40)) + [100, 200]
+
+
+def make_prices(count: int = 3000, seed: int = 1, case: str = 'random') -> np.ndarray:
+    """Random walk around 30000 (BTC-like), optionally with leading or interior NaNs."""
+    rng = np.random.default_rng(seed)
+    prices = 30000 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    if case == 'leading_nan':
+        prices[:30] = np.nan
+    elif case == 'interior_nan':
+        prices[1500] = np.nan
+    return prices
+
+
+def assert_matches(bank, function, prices, tolerance):
+    for period in bank.periods:
+        expected = function(prices, period)
+        np.testing.assert_array_equal(np.isnan(bank[period]), np.isnan(expected),
+                                      err_msg=f'period {period}')
+        np.testing.assert_allclose(bank[period], expected, rtol=tolerance, atol=0,
+                                   err_msg=f'period {period}')
+
+
+# Largest relative difference to talib.EMA measured on ten futures pairs: 6.4e-15.
+@pytest.mark.parametrize('case', ['random', 'leading_nan', 'interior_nan'])
+def test_ema_bank_matches_talib(case):
+    prices = make_prices(case=case)
+    assert_matches(ema_bank(prices, PERIODS), talib.EMA, prices, 1e-13)
+
+
+def test_ema_bank_short_history():
+    prices = make_prices(150)
+    bank = ema_bank(prices, PERIODS)
+    assert_matches(bank, talib.EMA, prices, 1e-13)
+    assert np.isnan(bank[200]).all()
+
+
+# Largest relative differences to talib.SMA measured on ten futures pairs: 1.6e-12 for plain
+# prefix sums, 3.5e-14 for compensated ones.
+@pytest.mark.parametrize('case', ['random', 'leading_nan', 'interior_nan'])
+@pytest.mark.parametrize('compensated, tolerance', [(False, 1e-11), (True, 1e-13)])
+def test_sma_bank_matches_talib(case, compensated, tolerance):
+    prices = make_prices(case=case)
+    assert_matches(sma_bank(prices, PERIODS, compensated), talib.SMA, prices, tolerance)
+
+
+def test_sma_bank_compensated_is_exact():
+    # On long histories the compensated window sums stay exact, where TA-Lib drifts by 1e-12.
+    prices = make_prices(100_000)
+    bank = sma_bank(prices, [2, 30, 200], compensated=True)
+    for period in bank.periods:
+        for candle in range(period - 1, len(prices), 997):
+            exact = math.fsum(prices[candle - period + 1:candle + 1]) / period
+            assert bank[period][candle] == pytest.approx(exact, rel=1e-15, abs=0)
+
+
+# Largest relative difference to talib.TEMA measured on ten futures pairs: 9.7e-15.
+@pytest.mark.parametrize('case', ['random', 'leading_nan', 'interior_nan'])
+def test_tema_bank_matches_talib(case):
+    prices = make_prices(case=case)
+    periods = PERIODS[1:]
+    assert_matches(tema_bank(prices, periods), talib.TEMA, prices, 1e-13)
+
+
+def test_tema_bank_short_history():
+    # The cascade needs 3 * (period - 1) candles: 150 fit period 50 but not 51.
+    prices = make_prices(150)
+    bank = tema_bank(prices, [2, 50, 51, 100])
+    assert_matches(bank, talib.TEMA, prices, 1e-13)
+    assert not np.isnan(bank[50][-1])
+    assert np.isnan(bank[51]).all()
@@ -0,0 +1,48 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from freqtrade_strategies.indicators.moving_averages import ema
+from freqtrade_strategies.indicators.panel import Panel, PanelIndicatorsMixin
+
+
+def make_candles(count: int = 1000, seed: int = 1, start: str = '2024-01-01') -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    return pd.DataFrame({
+        'date': pd.date_range(start, periods=count, freq='1h', tz='UTC'),
+        'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+        'volume': rng.random(count)})
+
+
+class Base:
+    def advise_all_indicators(self, data):
+        return {pair: self.merge_panel_indicators(df.copy(), {'pair': pair})
+                for pair, df in data.items()}
+
+
+class Strategy(PanelIndicatorsMixin, Base):
+    timeframe = '1h'
+    dp = None
+
+    def populate_panel_indicators(self, panel: Panel) -> Dict[str, np.ndarray]:
+        return {'ema_200': ema(panel.close, 200)}
+
+
+def test_panel_matches_per_pair():
+    data = {'BTC': make_candles(), 'ETH': make_candles(800, seed=2, start='2024-01-09 08:00')}
+    result = Strategy().advise_all_indicators(data)
+    for pair, df in data.items():
+        np.testing.assert_array_equal(result[pair]['ema_200'].to_numpy(), ema(df['close'], 200))
+
+
+def test_shorter_history_rebuilds_panel():
+    # Prefixes and later starts (warmup and lookahead runs) see their own history only.
+    candles = make_candles()
+    strategy = Strategy()
+    strategy.advise_all_indicators({'BTC': candles})
+    for part in (candles.iloc[:600], candles.iloc[300:], candles.iloc[300:600]):
+        part = part.reset_index(drop=True)
+        result = strategy.merge_panel_indicators(part.copy(), {'pair': 'BTC'})
+        np.testing.assert_array_equal(result['ema_200'].to_numpy(), ema(part['close'], 200))
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+import talib.abstract as ta
+
+from freqtrade_strategies.indicators.patterns import add_patterns, all_patterns, pattern_matrix
+
+
+def make_candles(count: int = 3000, seed: int = 1) -> pd.DataFrame:
+    """Random walk with frequent dojis, gaps and equal prices, so most patterns occur."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    open_ = np.roll(close, 1) * np.exp(rng.normal(0, 0.003, count))
+    open_[0] = close[0]
+    doji = rng.random(count) < 0.1
+    open_[doji] = close[doji]
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 0.004, count)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 0.004, count)))
+    shaved = rng.random(count) < 0.1
+    high[shaved] = np.maximum(open_, close)[shaved]
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close,
+                         'volume': rng.random(count)})
+
+
+def talib_outputs(candles: pd.DataFrame, name: str) -> np.ndarray:
+    return getattr(talib, name)(*(candles[column].to_numpy(dtype=float)
+                                  for column in ('open', 'high', 'low', 'close')))
+
+
+def test_all_patterns():
+    patterns = all_patterns()
+    assert len(patterns) == 61
+    assert patterns[0] == 'CDL2CROWS'
+
+
+@pytest.mark.parametrize('seed', [1, 2])
+def test_pattern_matrix_matches_talib(seed):
+    candles = make_candles(seed=seed)
+    values = pattern_matrix(candles['open'], candles['high'], candles['low'], candles['close'])
+    assert values.dtype == np.int16
+    assert values.shape == (61, len(candles))
+    for name, row in zip(all_patterns(), values):
+        np.testing.assert_array_equal(row, talib_outputs(candles, name), err_msg=name)
+
+
+def test_pattern_matrix_leading_nan():
+    candles = make_candles(500)
+    candles.iloc[:20, :4] = np.nan
+    patterns = ['CDLDOJI', 'CDLENGULFING', 'CDLHAMMER', 'CDLHIKKAKE', 'CDLMORNINGSTAR']
+    values = pattern_matrix(candles['open'], candles['high'], candles['low'], candles['close'],
+                            patterns)
+    for name, row in zip(patterns, values):
+        np.testing.assert_array_equal(row, talib_outputs(candles, name), err_msg=name)
+
+
+def test_pattern_matrix_empty():
+    empty = np.array([], dtype=float)
+    assert pattern_matrix(empty, empty, empty, empty, ['CDLDOJI']).shape == (1, 0)
+
+
+def test_add_patterns_matches_abstract_api():
+    candles = make_candles(1000)
+    patterns = ['CDLDOJI', 'CDLENGULFING', 'CDLHARAMI', 'CDL3WHITESOLDIERS']
+    result = add_patterns(candles, patterns)
+    assert list(result.columns) == list(candles.columns) + patterns
+    pd.testing.assert_frame_equal(result[list(candles.columns)], candles)
+    for name in patterns:
+        np.testing.assert_array_equal(result[name].to_numpy(),
+                                      getattr(ta, name)(candles).to_numpy(), err_msg=name)
+
+
+def test_add_patterns_replaces_columns():
+    candles = make_candles(200).assign(CDLDOJI=7)
+    result = add_patterns(candles, ['CDLDOJI'])
+    assert list(result.columns).count('CDLDOJI') == 1
+    np.testing.assert_array_equal(result['CDLDOJI'].to_numpy(),
+                                  talib_outputs(candles, 'CDLDOJI'))
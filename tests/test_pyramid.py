@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+from technical.util import resample_to_interval
+
+from freqtrade_strategies.data.pyramid import OhlcvPyramid, PyramidResampleMixin
+
+
+def make_candles(count: int = 5000, minutes: int = 5, seed: int = 1) -> pd.DataFrame:
+    """Random walk starting mid-day, with a few missing candles."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2024-01-01 07:35', periods=count, freq=f'{minutes}min',
+                          tz='UTC').as_unit('ns')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    candles = pd.DataFrame({
+        'date': dates, 'open': open_,
+        'high': np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 0.003, count))),
+        'low': np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 0.003, count))),
+        'close': close, 'volume': rng.random(count) * 1000})
+    return candles.drop(index=rng.choice(count, count // 50, replace=False)).reset_index(drop=True)
+
+
+class Strategy(PyramidResampleMixin):
+    timeframe = '5m'
+
+
+@pytest.mark.parametrize('interval', [15, 60, 180, 1440])
+@pytest.mark.parametrize('start, stop', [(0, None), (7, None), (1, -5), (100, 3001), (5, 8)])
+def test_resample_matches_pandas(interval, start, stop):
+    candles = make_candles()
+    pyramid = OhlcvPyramid.from_dataframe(candles, '5m', [f'{interval}m'])
+    stop = len(candles) + stop if stop is not None and stop < 0 else stop or len(candles)
+    expected = resample_to_interval(candles.iloc[start:stop].reset_index(drop=True), interval)
+    pd.testing.assert_frame_equal(pyramid.resample(f'{interval}m', start, stop), expected,
+                                  check_exact=True)
+
+
+def test_locate():
+    candles = make_candles(500)
+    pyramid = OhlcvPyramid.from_dataframe(candles.iloc[:400], '5m', ['1h'])
+    assert pyramid.locate(candles) == 0
+    assert pyramid.locate(candles.iloc[50:]) == 50
+    assert pyramid.locate(candles.iloc[450:]) is None
+    changed = candles.copy()
+    changed.loc[10, 'close'] += 1
+    assert pyramid.locate(changed) is None
+
+
+def test_mixin_sliding_windows():
+    # Dry / live runs: a window moving by one candle per call.
+    candles = make_candles(1500)
+    strategy = Strategy()
+    metadata = {'pair': 'BTC/USDT:USDT'}
+    for start in range(0, 300, 7):
+        window = candles.iloc[start:start + 1000].reset_index(drop=True)
+        for interval in (60, 180):
+            pd.testing.assert_frame_equal(
+                strategy.resample_to_interval(window, interval, metadata),
+                resample_to_interval(window, interval), check_exact=True)
+    assert strategy._pyramids[metadata['pair']].locate(candles.iloc[:1290]) == 0
+
+
+@pytest.mark.parametrize('window', [slice(None, 800), slice(200, None), slice(None)])
+def test_mixin_other_histories(window):
+    # Prefixes, later starts and changed candles never see candles outside the dataframe.
+    candles = make_candles(2000)
+    strategy = Strategy()
+    metadata = {'pair': 'ETH/USDT:USDT'}
+    strategy.resample_to_interval(candles, 60, metadata)
+    for other in (candles.iloc[window], make_candles(2000, seed=2).iloc[window]):
+        other = other.reset_index(drop=True)
+        pd.testing.assert_frame_equal(strategy.resample_to_interval(other, 60, metadata),
+                                      resample_to_interval(other, 60), check_exact=True)
+
+
+def test_mixin_keeps_date_resolution():
+    candles = make_candles(1000)
+    candles['date'] = candles['date'].dt.as_unit('us')
+    resampled = Strategy().resample_to_interval(candles, 60, {'pair': 'BTC/USDT:USDT'})
+    pd.testing.assert_frame_equal(resampled, resample_to_interval(candles, 60), check_exact=True)
+
+
+def test_mixin_falls_back_to_pandas():
+    candles = make_candles(3000, minutes=60)
+    strategy = Strategy()
+    strategy.timeframe = '1h'
+    pd.testing.assert_frame_equal(
+        strategy.resample_to_interval(candles, 2880, {'pair': 'BTC/USDT:USDT'}),
+        resample_to_interval(candles, 2880))
+    assert not strategy._pyramids
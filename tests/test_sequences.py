@@ -0,0 +1,68 @@
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from freqtrade_strategies.indicators.sequences import (falling, falling_run, green_run, red_run,
+                                                       rising, rising_run, run_before,
+                                                       run_length)
+
+
+def make_candles(count: int = 5000, seed: int = 1) -> pd.DataFrame:
+    """Coarsely rounded random walk, so equal prices occur, with scattered NaNs."""
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 1, count)))
+    open_ = np.round(close + rng.normal(0, 1, count))
+    for values in (open_, close):
+        values[rng.choice(count, count // 100, replace=False)] = np.nan
+    return pd.DataFrame({'open': open_, 'close': close})
+
+
+def chain(term, count: int) -> pd.Series:
+    """The shift chain ``term(0) & term(1) & ... & term(count - 1)``."""
+    return reduce(lambda left, right: left & right, (term(shift) for shift in range(count)))
+
+
+@pytest.mark.parametrize('count', [1, 2, 4, 8, 9])
+def test_candle_runs_match_shift_chains(count):
+    candles = make_candles()
+    open_, close = candles['open'], candles['close']
+    green = chain(lambda shift: open_.shift(shift) < close.shift(shift), count)
+    red = chain(lambda shift: open_.shift(shift) > close.shift(shift), count)
+    np.testing.assert_array_equal(green_run(open_, close) >= count, green)
+    np.testing.assert_array_equal(red_run(open_, close) >= count, red)
+
+
+@pytest.mark.parametrize('count', [1, 2, 5])
+def test_value_runs_match_shift_chains(count):
+    values = make_candles()['close']
+    rises = chain(lambda shift: values.shift(shift + 1) < values.shift(shift), count)
+    falls = chain(lambda shift: values.shift(shift + 1) > values.shift(shift), count)
+    np.testing.assert_array_equal(rising_run(values) >= count, rises)
+    np.testing.assert_array_equal(falling_run(values) >= count, falls)
+
+
+def test_run_before_matches_v_bottom_chain():
+    # SmoothOperator's entry: four falling averages, then a rising one.
+    values = make_candles()['close']
+    expected = ((values.shift(5) > values.shift(4)) & (values.shift(4) > values.shift(3))
+                & (values.shift(3) > values.shift(2)) & (values.shift(2) > values.shift(1))
+                & (values.shift(1) < values.shift(0)))
+    np.testing.assert_array_equal(run_before(falling(values), rising(values)) >= 4, expected)
+
+
+@pytest.mark.parametrize('count', [2, 4])
+def test_run_before_matches_candle_chains(count):
+    # four_green_one_red_candle and four_red_one_green_candle of SmoothOperator's helper.
+    candles = make_candles()
+    open_, close = candles['open'], candles['close']
+    green, red = open_ < close, open_ > close
+    expected = red & chain(lambda shift: open_.shift(shift + 1) < close.shift(shift + 1), count)
+    np.testing.assert_array_equal(run_before(green, red) >= count, expected)
+
+
+def test_run_length_rows():
+    condition = np.array([[True, True, False, True], [False, True, True, True]])
+    np.testing.assert_array_equal(run_length(condition), [[1, 2, 0, 1], [0, 1, 2, 3]])
+    np.testing.assert_array_equal(run_before(condition, ~condition), [[0, 0, 2, 0], [0, 0, 0, 0]])
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from freqtrade_strategies.indicators.volatility import rolling_moments
+
+WINDOWS = [2, 3, 20, 100]
+
+# pandas' online update is off by up to 2.7e-4 on BTC 5m closes at window 2, and leaves up to
+# 8e-4 instead of 0 on constant windows at BTC prices: the bound the results are held to.
+PANDAS_TOLERANCE = 1e-3
+
+
+def make_prices(count: int = 8000, seed: int = 1, gaps: bool = False) -> np.ndarray:
+    """BTC-like 5m closes (price ~30000, 0.1 tick), optionally with NaNs and a flat stretch."""
+    rng = np.random.default_rng(seed)
+    prices = np.round(30000 * np.exp(np.cumsum(rng.normal(0, 0.002, count))), 1)
+    if gaps:
+        prices[:5] = np.nan
+        prices[rng.choice(count, count // 100, replace=False)] = np.nan
+        prices[3000:3100] = prices[2999]
+    return prices
+
+
+@pytest.mark.parametrize('gaps', [False, True])
+@pytest.mark.parametrize('min_periods', [None, 1])
+def test_rolling_moments_match_pandas(gaps, min_periods):
+    prices = make_prices(gaps=gaps)
+    moments = rolling_moments(prices, WINDOWS, min_periods)
+    for window in WINDOWS:
+        rolling = pd.Series(prices).rolling(window, min_periods=min_periods)
+        mean, std = rolling.mean().to_numpy(), rolling.std().to_numpy()
+        np.testing.assert_array_equal(np.isnan(moments.mean[window]), np.isnan(mean))
+        np.testing.assert_array_equal(np.isnan(moments.std[window]), np.isnan(std))
+        np.testing.assert_allclose(moments.mean[window], mean, rtol=1e-14, atol=0)
+        np.testing.assert_allclose(moments.std[window], std, rtol=0, atol=PANDAS_TOLERANCE)
+
+
+@pytest.mark.parametrize('window, tolerance', [(2, 1e-6), (3, 1e-8), (20, 1e-8), (100, 1e-8)])
+def test_rolling_std_matches_two_pass(window, tolerance):
+    # The documented bounds: 8.8e-7 at window 2 and 1.9e-9 at 20 on BTC closes.
+    prices = make_prices()
+    expected = sliding_window_view(prices, window).std(axis=-1, ddof=1)
+    std = rolling_moments(prices, [window]).std[window]
+    np.testing.assert_allclose(std[window - 1:], expected, rtol=0, atol=tolerance)
+
+
+def test_rolling_std_constant_windows():
+    prices = make_prices(gaps=True)
+    std = rolling_moments(prices, WINDOWS).std
+    for window in WINDOWS:
+        assert (std[window][3000 + window - 1:3100] == 0).all()
+    assert (rolling_moments(np.full(50, 30000.1), [20], ddof=0).std[20][19:] == 0).all()
@@ -4,6 +4,8 @@ import pandas as pd
 from functools import reduce
 from pandas import DataFrame
 import freqtrade.vendor.qtpylib.indicators as qtpylib
+from freqtrade_strategies.indicators.moving_averages import ema_bank
+from freqtrade_strategies.indicators.volatility import rolling_moments
 from freqtrade.strategy import IStrategy, CategoricalParameter, DecimalParameter, IntParameter, RealParameter
 
 __author__ = "Robert Roman"
@@ -69,34 +71,19 @@ class Bandtastic(IStrategy):
         dataframe['rsi'] = ta.RSI(dataframe)
         dataframe['mfi'] = ta.MFI(dataframe)
 
-        # Bollinger Bands 1,2,3 and 4
-        bollinger1 = qtpylib.bollinger_bands(qtpylib.typical_price(dataframe), window=20, stds=1)
-        dataframe['bb_lowerband1'] = bollinger1['lower']
-        dataframe['bb_middleband1'] = bollinger1['mid']
-        dataframe['bb_upperband1'] = bollinger1['upper']
-
-        bollinger2 = qtpylib.bollinger_bands(qtpylib.typical_price(dataframe), window=20, stds=2)
-        dataframe['bb_lowerband2'] = bollinger2['lower']
-        dataframe['bb_middleband2'] = bollinger2['mid']
-        dataframe['bb_upperband2'] = bollinger2['upper']
-
-        bollinger3 = qtpylib.bollinger_bands(qtpylib.typical_price(dataframe), window=20, stds=3)
-        dataframe['bb_lowerband3'] = bollinger3['lower']
-        dataframe['bb_middleband3'] = bollinger3['mid']
-        dataframe['bb_upperband3'] = bollinger3['upper']
-
-        bollinger4 = qtpylib.bollinger_bands(qtpylib.typical_price(dataframe), window=20, stds=4)
-        dataframe['bb_lowerband4'] = bollinger4['lower']
-        dataframe['bb_middleband4'] = bollinger4['mid']
-        dataframe['bb_upperband4'] = bollinger4['upper']
-        # Build EMA rows - combine all ranges to a single set to avoid duplicate calculations.
-        for period in set(
-                list(self.buy_fastema.range)
-                + list(self.buy_slowema.range)
-                + list(self.sell_fastema.range)
-                + list(self.sell_slowema.range)
-            ):
-            dataframe[f'EMA_{period}'] = ta.EMA(dataframe, timeperiod=period)
+        # Bollinger Bands 1,2,3 and 4 - mean and std of the typical price computed once
+        moments = rolling_moments(qtpylib.typical_price(dataframe), [20], min_periods=1)
+        for stds in range(1, 5):
+            upper, mid, lower = moments.bands(20, stds)
+            dataframe[f'bb_lowerband{stds}'] = lower
+            dataframe[f'bb_middleband{stds}'] = mid
+            dataframe[f'bb_upperband{stds}'] = upper
+        # Build EMA rows - combine all ranges to a single set, computed in one pass.
+        emas = ema_bank(dataframe['close'], [
+            *self.buy_fastema.range, *self.buy_slowema.range,
+            *self.sell_fastema.range, *self.sell_slowema.range,
+        ])
+        dataframe = emas.assign(dataframe, 'EMA_{}')
 
         return dataframe
 
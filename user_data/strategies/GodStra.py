@@ -22,11 +22,13 @@ from freqtrade.strategy import IStrategy
 from numpy.lib import math
 from pandas import DataFrame
 # import talib.abstract as ta
-from ta import add_all_ta_features
-from ta.utils import dropna
+from freqtrade_strategies.imports import lazy_function
+add_all_ta_features = lazy_function('ta', 'add_all_ta_features')
+dropna = lazy_function('ta.utils', 'dropna')
 
 # --------------------------------
 
+logger = logging.getLogger(__name__)
 
 
 class GodStra(IStrategy):
@@ -75,7 +77,9 @@ class GodStra(IStrategy):
     trailing_only_offset_is_reached = True
     # Buy hypers
     timeframe = '12h'
-    print('Add {\n\t"method": "AgeFilter",\n\t"min_days_listed": 30\n},\n to your pairlists in config (Under StaticPairList)')
+
+    def bot_start(self, **kwargs) -> None:
+        logger.info('Add {\n\t"method": "AgeFilter",\n\t"min_days_listed": 30\n},\n to your pairlists in config (Under StaticPairList)')
 
     def dna_size(self, dct: dict):
         def int_from_str(st: str):
@@ -18,11 +18,13 @@ from pandas import DataFrame
 # Add your lib to import here
 # import talib.abstract as ta
 import pandas as pd
-import ta
-from ta.utils import dropna
+from freqtrade_strategies.imports import lazy_function, lazy_import
+ta = lazy_import('ta')
+dropna = lazy_function('ta.utils', 'dropna')
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from functools import reduce
 import numpy as np
+from freqtrade_strategies.indicators.extrema import channel_position
 
 
 class Heracles(IStrategy):
@@ -77,13 +79,11 @@ class Heracles(IStrategy):
             original_version=True
         )
 
-        dataframe['volatility_dcp'] = ta.volatility.donchian_channel_pband(
+        dataframe['volatility_dcp'] = channel_position(
             dataframe['high'],
             dataframe['low'],
             dataframe['close'],
-            window=10,
-            offset=0,
-            fillna=False
+            window=10
         )
 
         return dataframe
@@ -1,6 +1,6 @@
 
 # --- Do not remove these libs ---
-from freqtrade.strategy import IStrategy, merge_informative_pair
+from freqtrade.strategy import IStrategy
 from typing import Dict, List
 from functools import reduce
 from pandas import DataFrame
@@ -9,8 +9,10 @@ from pandas import DataFrame
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 
+from freqtrade_strategies.informative import MarketContextMixin
 
-class InformativeSample(IStrategy):
+
+class InformativeSample(MarketContextMixin, IStrategy):
     """
     Sample strategy implementing Informative Pairs - compares stake_currency with USDT.
     Not performing very well - but should serve as an example how to use a referential pair against USDT.
@@ -85,21 +87,23 @@ class InformativeSample(IStrategy):
         dataframe['ema50'] = ta.EMA(dataframe, timeperiod=50)
         dataframe['ema100'] = ta.EMA(dataframe, timeperiod=100)
         if self.dp:
-            # Get ohlcv data for informative pair at 15m interval.
-            inf_tf = '15m'
-            informative = self.dp.get_pair_dataframe(pair=f"BTC/USDT",
-                                                     timeframe=inf_tf)
-
-            # calculate SMA20 on informative pair
-            informative['sma20'] = informative['close'].rolling(20).mean()
-
-            # Combine the 2 dataframe
-            # This will result in a column named 'closeETH' or 'closeBTC' - depending on stake_currency.
-            dataframe = merge_informative_pair(dataframe, informative,
-                                               self.timeframe, inf_tf, ffill=True)
+            # Get ohlcv data for informative pair at 15m interval and calculate SMA20 on it.
+            # The market context does this once per 15m candle for all traded pairs.
+            # This will result in columns named 'close_15m', 'sma20_15m', ...
+            dataframe = self.market_context.merge(dataframe, "BTC/USDT", '15m',
+                                                  self.populate_informative_btc)
 
         return dataframe
 
+    @staticmethod
+    def populate_informative_btc(informative: DataFrame) -> DataFrame:
+        """
+        Indicators of the informative pair - shared by all traded pairs.
+        """
+        # calculate SMA20 on informative pair
+        informative['sma20'] = informative['close'].rolling(20).mean()
+        return informative
+
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Based on TA indicators, populates the buy signal for the given dataframe
@@ -9,9 +9,9 @@ from pandas import DataFrame
 # --------------------------------
 
 # Add your lib to import here
-import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from functools import reduce
+from freqtrade_strategies.indicators.moving_averages import tema_bank
 
 
 class MultiMa(IStrategy):
@@ -60,13 +60,21 @@ class MultiMa(IStrategy):
     sell_ma_gap = IntParameter(1, gap_max, default=94, space="sell")
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        for count in range(self.count_max):
-            for gap in range(self.gap_max):
-                if count*gap > 1 and count*gap not in dataframe.keys():
-                    dataframe[count*gap] = ta.TEMA(
-                        dataframe, timeperiod=int(count*gap)
-                    )
-        print(" ", metadata['pair'], end="\t\r")
+        # Only the distinct count*gap products the entry/exit loops can look up: all of the
+        # parameter ranges while hyperopting, just the current values otherwise.
+        reachable = {
+            count*gap for count in range(self.count_max) for gap in range(self.gap_max)
+        }
+        needed = set()
+        for ma_count, ma_gap in ((self.buy_ma_count, self.buy_ma_gap),
+                                 (self.sell_ma_count, self.sell_ma_gap)):
+            needed.update(
+                count*gap for counts in ma_count.range for count in range(counts)
+                for gap in ma_gap.range
+            )
+        periods = sorted(period for period in reachable & needed if period > 1)
+        tema = tema_bank(dataframe['close'], periods)
+        dataframe = tema.assign(dataframe, {period: period for period in tema})
 
         return dataframe
 
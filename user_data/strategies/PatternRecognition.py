@@ -12,8 +12,7 @@ from freqtrade.strategy import (BooleanParameter, CategoricalParameter, DecimalP
 # --------------------------------
 # Add your lib to import here
 import talib
-import talib.abstract as ta
-import pandas_ta as pta
+from freqtrade_strategies.indicators.patterns import add_patterns
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from technical.util import resample_to_interval, resampled_merge
 
@@ -62,10 +61,8 @@ class PatternRecognition(IStrategy):
 
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        for pr in self.prs:
-            dataframe[pr] = getattr(ta, pr)(dataframe)
-
-        return dataframe
+        # All patterns from the same float64 arrays, added as one block
+        return add_patterns(dataframe, self.prs)
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         dataframe.loc[
@@ -190,7 +190,7 @@ class Supertrend(IStrategy):
     
         # 6. fillna
         result = pd.DataFrame({'ST': st, 'STX': stx}, index=df.index)
-        result.fillna(0, inplace=True)
+        result['ST'] = result['ST'].fillna(0)
       
         return result
 
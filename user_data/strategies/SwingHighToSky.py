@@ -12,11 +12,11 @@ status      = "Live"
 from freqtrade.strategy import IStrategy
 from freqtrade.strategy import IntParameter
 from functools import reduce
-from pandas import DataFrame
+from pandas import DataFrame, concat
 
-import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 import numpy
+from freqtrade_strategies.indicators.momentum import cci_bank, rsi_bank
 
 
 
@@ -73,19 +73,18 @@ class SwingHighToSky(IStrategy):
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        for val in self.buy_cciTime.range:
-            dataframe[f'cci-{val}'] = ta.CCI(dataframe, timeperiod=val)
-
-        for val in self.sell_cciTime.range:
-            dataframe[f'cci-sell-{val}'] = ta.CCI(dataframe, timeperiod=val)
-
-        for val in self.buy_rsiTime.range:
-            dataframe[f'rsi-{val}'] = ta.RSI(dataframe, timeperiod=val)
-
-        for val in self.sell_rsiTime.range:
-            dataframe[f'rsi-sell-{val}'] = ta.RSI(dataframe, timeperiod=val)
-
-        return dataframe
+        # Every distinct period once (buy and sell ranges overlap), added as one block.
+        cci = cci_bank(dataframe['high'], dataframe['low'], dataframe['close'],
+                       [*self.buy_cciTime.range, *self.sell_cciTime.range])
+        rsi = rsi_bank(dataframe['close'], [*self.buy_rsiTime.range, *self.sell_rsiTime.range])
+
+        return concat([
+            dataframe,
+            cci.frame('cci-{}', self.buy_cciTime.range, dataframe.index),
+            cci.frame('cci-sell-{}', self.sell_cciTime.range, dataframe.index),
+            rsi.frame('rsi-{}', self.buy_rsiTime.range, dataframe.index),
+            rsi.frame('rsi-sell-{}', self.sell_rsiTime.range, dataframe.index),
+        ], axis=1)
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
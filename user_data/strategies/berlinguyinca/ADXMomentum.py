@@ -2,6 +2,7 @@
 from freqtrade.strategy import IStrategy
 from pandas import DataFrame
 import talib.abstract as ta
+from freqtrade_strategies.indicators.momentum import directional_bank
 
 
 # --------------------------------
@@ -36,9 +37,11 @@ class ADXMomentum(IStrategy):
     startup_candle_count: int = 20
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        dataframe['adx'] = ta.ADX(dataframe, timeperiod=14)
-        dataframe['plus_di'] = ta.PLUS_DI(dataframe, timeperiod=25)
-        dataframe['minus_di'] = ta.MINUS_DI(dataframe, timeperiod=25)
+        directional = directional_bank(dataframe['high'], dataframe['low'], dataframe['close'],
+                                       [14, 25])
+        dataframe['adx'] = directional.adx[14]
+        dataframe['plus_di'] = directional.plus_di[25]
+        dataframe['minus_di'] = directional.minus_di[25]
         dataframe['sar'] = ta.SAR(dataframe)
         dataframe['mom'] = ta.MOM(dataframe, timeperiod=14)
 
@@ -5,8 +5,8 @@ from freqtrade.strategy import CategoricalParameter, DecimalParameter, IntParame
 from pandas import DataFrame
 # --------------------------------
 
-import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
+from freqtrade_strategies.indicators.moving_averages import ema_bank
 
 
 class AverageStrategy(IStrategy):
@@ -37,9 +37,10 @@ class AverageStrategy(IStrategy):
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        # Combine all ranges ... to avoid duplicate calculation
-        for val in list(set(list(self.buy_range_short.range) + list(self.buy_range_long.range))):
-            dataframe[f'ema{val}'] = ta.EMA(dataframe, timeperiod=val)
+        # Combine all ranges ... to avoid duplicate calculation, computed in one pass
+        emas = ema_bank(dataframe['close'],
+                        [*self.buy_range_short.range, *self.buy_range_long.range])
+        dataframe = emas.assign(dataframe, 'ema{}')
 
         return dataframe
 
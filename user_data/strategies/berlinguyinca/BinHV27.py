@@ -6,6 +6,7 @@ from pandas import DataFrame
 
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
+from freqtrade_strategies.indicators.momentum import directional_bank
 from typing import Dict, List
 from functools import reduce
 from pandas import DataFrame, DatetimeIndex, merge
@@ -34,11 +35,13 @@ class BinHV27(IStrategy):
         dataframe['rsi'] = numpy.nan_to_num(ta.RSI(dataframe, timeperiod=5))
         rsiframe = DataFrame(dataframe['rsi']).rename(columns={'rsi': 'close'})
         dataframe['emarsi'] = numpy.nan_to_num(ta.EMA(rsiframe, timeperiod=5))
-        dataframe['adx'] = numpy.nan_to_num(ta.ADX(dataframe))
-        dataframe['minusdi'] = numpy.nan_to_num(ta.MINUS_DI(dataframe))
+        directional = directional_bank(dataframe['high'], dataframe['low'], dataframe['close'],
+                                       [14])
+        dataframe['adx'] = numpy.nan_to_num(directional.adx[14])
+        dataframe['minusdi'] = numpy.nan_to_num(directional.minus_di[14])
         minusdiframe = DataFrame(dataframe['minusdi']).rename(columns={'minusdi': 'close'})
         dataframe['minusdiema'] = numpy.nan_to_num(ta.EMA(minusdiframe, timeperiod=25))
-        dataframe['plusdi'] = numpy.nan_to_num(ta.PLUS_DI(dataframe))
+        dataframe['plusdi'] = numpy.nan_to_num(directional.plus_di[14])
         plusdiframe = DataFrame(dataframe['plusdi']).rename(columns={'plusdi': 'close'})
         dataframe['plusdiema'] = numpy.nan_to_num(ta.EMA(plusdiframe, timeperiod=5))
         dataframe['lowsma'] = numpy.nan_to_num(ta.EMA(dataframe, timeperiod=60))
@@ -6,13 +6,12 @@ import numpy as np
 # --------------------------------
 
 import talib.abstract as ta
-import freqtrade.vendor.qtpylib.indicators as qtpylib
+from freqtrade_strategies.indicators.volatility import rolling_moments
 
 
 def bollinger_bands(stock_price, window_size, num_of_std):
-    rolling_mean = stock_price.rolling(window=window_size).mean()
-    rolling_std = stock_price.rolling(window=window_size).std()
-    lower_band = rolling_mean - (rolling_std * num_of_std)
+    _, rolling_mean, lower_band = rolling_moments(stock_price, [window_size]).bands(
+        window_size, num_of_std)
 
     return rolling_mean, lower_band
 
@@ -39,11 +38,11 @@ class BinHV45(IStrategy):
     }
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        bollinger = qtpylib.bollinger_bands(dataframe['close'], window=40, stds=2)
+        upper, mid, lower = rolling_moments(dataframe['close'], [40], min_periods=1).bands(40, 2)
 
-        dataframe['upper'] = bollinger['upper']
-        dataframe['mid'] = bollinger['mid']
-        dataframe['lower'] = bollinger['lower']
+        dataframe['upper'] = upper
+        dataframe['mid'] = mid
+        dataframe['lower'] = lower
         dataframe['bbdelta'] = (dataframe['mid'] - dataframe['lower']).abs()
         dataframe['pricedelta'] = (dataframe['open'] - dataframe['close']).abs()
         dataframe['closedelta'] = (dataframe['close'] - dataframe['close'].shift()).abs()
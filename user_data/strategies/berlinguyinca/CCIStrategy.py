@@ -7,6 +7,7 @@ from pandas import DataFrame, Series, DatetimeIndex, merge
 
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
+from freqtrade_strategies.indicators.moving_averages import sma_bank
 
 
 class CCIStrategy(IStrategy):
@@ -107,10 +108,13 @@ class CCIStrategy(IStrategy):
             'close': 'last'
         }
         df = df.resample(str(int(interval[:-1]) * factor) + 'min', label="right").agg(ohlc_dict)
-        df['resample_sma'] = ta.SMA(df, timeperiod=100, price='close')
-        df['resample_medium'] = ta.SMA(df, timeperiod=50, price='close')
-        df['resample_short'] = ta.SMA(df, timeperiod=25, price='close')
-        df['resample_long'] = ta.SMA(df, timeperiod=200, price='close')
+        smas = sma_bank(df['close'], [25, 50, 100, 200])
+        df = smas.assign(df, {
+            'resample_sma': 100,
+            'resample_medium': 50,
+            'resample_short': 25,
+            'resample_long': 200,
+        })
         df = df.drop(columns=['open', 'high', 'low', 'close'])
         df = df.resample(interval[:-1] + 'min')
         df = df.interpolate(method='time')
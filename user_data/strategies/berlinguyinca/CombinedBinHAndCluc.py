@@ -5,12 +5,12 @@ import numpy as np
 import talib.abstract as ta
 from freqtrade.strategy import IStrategy
 from pandas import DataFrame
+from freqtrade_strategies.indicators.volatility import rolling_moments
 
 
 def bollinger_bands(stock_price, window_size, num_of_std):
-    rolling_mean = stock_price.rolling(window=window_size).mean()
-    rolling_std = stock_price.rolling(window=window_size).std()
-    lower_band = rolling_mean - (rolling_std * num_of_std)
+    _, rolling_mean, lower_band = rolling_moments(stock_price, [window_size]).bands(
+        window_size, num_of_std)
     return np.nan_to_num(rolling_mean), np.nan_to_num(lower_band)
 
 
@@ -39,11 +39,12 @@ class CombinedBinHAndCluc(IStrategy):
         dataframe['closedelta'] = (dataframe['close'] - dataframe['close'].shift()).abs()
         dataframe['tail'] = (dataframe['close'] - dataframe['low']).abs()
         # strategy ClucMay72018
-        bollinger = qtpylib.bollinger_bands(qtpylib.typical_price(dataframe), window=20, stds=2)
-        dataframe['bb_lowerband'] = bollinger['lower']
-        dataframe['bb_middleband'] = bollinger['mid']
+        _, mid, lower = rolling_moments(qtpylib.typical_price(dataframe), [20],
+                                        min_periods=1).bands(20, 2)
+        dataframe['bb_lowerband'] = lower
+        dataframe['bb_middleband'] = mid
         dataframe['ema_slow'] = ta.EMA(dataframe, timeperiod=50)
-        dataframe['volume_mean_slow'] = dataframe['volume'].rolling(window=30).mean()
+        dataframe['volume_mean_slow'] = rolling_moments(dataframe['volume'], [30]).mean[30]
 
         return dataframe
 
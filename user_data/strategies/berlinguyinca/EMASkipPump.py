@@ -7,6 +7,7 @@ from pandas import DataFrame
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 import numpy  # noqa
+from freqtrade_strategies.indicators.extrema import rolling_max, rolling_min
 
 
 class EMASkipPump(IStrategy):
@@ -55,8 +56,8 @@ class EMASkipPump(IStrategy):
         dataframe['bb_middleband'] = bollinger['mid']
         dataframe['bb_upperband'] = bollinger['upper']
 
-        dataframe['min'] = ta.MIN(dataframe, timeperiod=self.EMA_MEDIUM_TERM)
-        dataframe['max'] = ta.MAX(dataframe, timeperiod=self.EMA_MEDIUM_TERM)
+        dataframe['min'] = rolling_min(dataframe['close'], self.EMA_MEDIUM_TERM)
+        dataframe['max'] = rolling_max(dataframe['close'], self.EMA_MEDIUM_TERM)
 
         return dataframe
 
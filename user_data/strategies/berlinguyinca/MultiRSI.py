@@ -3,10 +3,12 @@ from freqtrade.strategy import IStrategy
 from pandas import DataFrame
 # --------------------------------
 import talib.abstract as ta
-from technical.util import resample_to_interval, resampled_merge
+from technical.util import resampled_merge
 
+from freqtrade_strategies.data.pyramid import PyramidResampleMixin
 
-class MultiRSI(IStrategy):
+
+class MultiRSI(PyramidResampleMixin, IStrategy):
     """
 
     author@: Gert Wohlgemuth
@@ -34,8 +36,10 @@ class MultiRSI(IStrategy):
         dataframe['sma200'] = ta.SMA(dataframe, timeperiod=200)
 
         # resample our dataframes
-        dataframe_short = resample_to_interval(dataframe, self.get_ticker_indicator() * 2)
-        dataframe_long = resample_to_interval(dataframe, self.get_ticker_indicator() * 8)
+        dataframe_short = self.resample_to_interval(
+            dataframe, self.get_ticker_indicator() * 2, metadata)
+        dataframe_long = self.resample_to_interval(
+            dataframe, self.get_ticker_indicator() * 8, metadata)
 
         # compute our RSI's
         dataframe_short['rsi'] = ta.RSI(dataframe_short, timeperiod=14)
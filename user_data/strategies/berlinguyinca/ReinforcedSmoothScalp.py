@@ -4,14 +4,16 @@ from freqtrade.strategy import IStrategy
 from freqtrade.strategy import timeframe_to_minutes
 from freqtrade.strategy import BooleanParameter, IntParameter
 from pandas import DataFrame
-from technical.util import resample_to_interval, resampled_merge
+from technical.util import resampled_merge
+
+from freqtrade_strategies.data.pyramid import PyramidResampleMixin
 import numpy  # noqa
 # --------------------------------
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 
 
-class ReinforcedSmoothScalp(IStrategy):
+class ReinforcedSmoothScalp(PyramidResampleMixin, IStrategy):
     """
         this strategy is based around the idea of generating a lot of potentatils buys and make tiny profits on each trade
 
@@ -59,7 +61,7 @@ class ReinforcedSmoothScalp(IStrategy):
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         tf_res = timeframe_to_minutes(self.timeframe) * 5
-        df_res = resample_to_interval(dataframe, tf_res)
+        df_res = self.resample_to_interval(dataframe, tf_res, metadata)
         df_res['sma'] = ta.SMA(df_res, 50, price='close')
         dataframe = resampled_merge(dataframe, df_res, fill_na=True)
         dataframe['resample_sma'] = dataframe[f'resample_{tf_res}_sma']
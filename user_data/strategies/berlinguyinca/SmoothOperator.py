@@ -2,12 +2,14 @@
 from freqtrade.strategy import IStrategy
 from typing import Dict, List
 from functools import reduce
-from pandas import DataFrame
+from pandas import DataFrame, Series
 # --------------------------------
 
 import talib.abstract as ta
-import freqtrade.vendor.qtpylib.indicators as qtpylib
 import numpy  # noqa
+from freqtrade_strategies.indicators.sequences import (falling, green_run, red_run, rising,
+                                                       run_before)
+from freqtrade_strategies.indicators.volatility import rolling_moments
 
 # DO NOT USE, just playing with smooting and graphs!
 
@@ -52,10 +54,12 @@ class SmoothOperator(IStrategy):
 
         ##################################################################################
         # required for graphing
-        bollinger = qtpylib.bollinger_bands(dataframe['close'], window=20, stds=2)
-        dataframe['bb_lowerband'] = bollinger['lower']
-        dataframe['bb_upperband'] = bollinger['upper']
-        dataframe['bb_middleband'] = bollinger['mid']
+        # mean and std of both band sets computed once
+        moments = rolling_moments(dataframe['close'], [20], min_periods=1)
+        upper, mid, lower = moments.bands(20, 2)
+        dataframe['bb_lowerband'] = lower
+        dataframe['bb_upperband'] = upper
+        dataframe['bb_middleband'] = mid
 
         # MACD
         macd = ta.MACD(dataframe)
@@ -65,10 +69,10 @@ class SmoothOperator(IStrategy):
 
         ##################################################################################
         # required for entry
-        bollinger = qtpylib.bollinger_bands(dataframe['close'], window=20, stds=1.6)
-        dataframe['entry_bb_lowerband'] = bollinger['lower']
-        dataframe['entry_bb_upperband'] = bollinger['upper']
-        dataframe['entry_bb_middleband'] = bollinger['mid']
+        upper, mid, lower = moments.bands(20, 1.6)
+        dataframe['entry_bb_lowerband'] = lower
+        dataframe['entry_bb_upperband'] = upper
+        dataframe['entry_bb_middleband'] = mid
 
         dataframe['bpercent'] = (dataframe['close'] - dataframe['bb_lowerband']) / (
                 dataframe['bb_upperband'] - dataframe['bb_lowerband']) * 100
@@ -133,11 +137,9 @@ class SmoothOperator(IStrategy):
                     # which has to be below a very slow average
                     # this pattern only catches a few, but normally very good buy points
                     (
-                            (dataframe['average'].shift(5) > dataframe['average'].shift(4))
-                            & (dataframe['average'].shift(4) > dataframe['average'].shift(3))
-                            & (dataframe['average'].shift(3) > dataframe['average'].shift(2))
-                            & (dataframe['average'].shift(2) > dataframe['average'].shift(1))
-                            & (dataframe['average'].shift(1) < dataframe['average'].shift(0))
+                            # four falling averages, then a rising one
+                            (run_before(falling(dataframe['average']),
+                                        rising(dataframe['average'])) >= 4)
                             & (dataframe['low'].shift(1) < dataframe['bb_middleband'])
                             & (dataframe['cci'].shift(1) < -100)
                             & (dataframe['rsi'].shift(1) < 30)
@@ -181,9 +183,9 @@ class SmoothOperator(IStrategy):
                     #   the top of the peak
                     (
                         (dataframe['mfi_rsi_cci_smooth'] > 100)
-                        & (dataframe['mfi_rsi_cci_smooth'].shift(1) > dataframe['mfi_rsi_cci_smooth'])
-                        & (dataframe['mfi_rsi_cci_smooth'].shift(2) < dataframe['mfi_rsi_cci_smooth'].shift(1))
-                        & (dataframe['mfi_rsi_cci_smooth'].shift(3) < dataframe['mfi_rsi_cci_smooth'].shift(2))
+                        # two rises, then a fall
+                        & (run_before(rising(dataframe['mfi_rsi_cci_smooth']),
+                                      falling(dataframe['mfi_rsi_cci_smooth'])) >= 2)
                     )
                     |
                     #   This helps with very long, sideways trends, to get out of a market before
@@ -219,16 +221,8 @@ class StrategyHelper:
         :param dataframe:
         :return:
         """
-        return (
-                (dataframe['open'] < dataframe['close']) &
-                (dataframe['open'].shift(1) < dataframe['close'].shift(1)) &
-                (dataframe['open'].shift(2) < dataframe['close'].shift(2)) &
-                (dataframe['open'].shift(3) < dataframe['close'].shift(3)) &
-                (dataframe['open'].shift(4) < dataframe['close'].shift(4)) &
-                (dataframe['open'].shift(5) < dataframe['close'].shift(5)) &
-                (dataframe['open'].shift(6) < dataframe['close'].shift(6)) &
-                (dataframe['open'].shift(7) < dataframe['close'].shift(7))
-        )
+        return Series(green_run(dataframe['open'], dataframe['close']) >= 8,
+                      index=dataframe.index)
 
     @staticmethod
     def eight_green_candles(dataframe):
@@ -238,17 +232,8 @@ class StrategyHelper:
         :param dataframe:
         :return:
         """
-        return (
-                (dataframe['open'] < dataframe['close']) &
-                (dataframe['open'].shift(1) < dataframe['close'].shift(1)) &
-                (dataframe['open'].shift(2) < dataframe['close'].shift(2)) &
-                (dataframe['open'].shift(3) < dataframe['close'].shift(3)) &
-                (dataframe['open'].shift(4) < dataframe['close'].shift(4)) &
-                (dataframe['open'].shift(5) < dataframe['close'].shift(5)) &
-                (dataframe['open'].shift(6) < dataframe['close'].shift(6)) &
-                (dataframe['open'].shift(7) < dataframe['close'].shift(7)) &
-                (dataframe['open'].shift(8) < dataframe['close'].shift(8))
-        )
+        return Series(green_run(dataframe['open'], dataframe['close']) >= 9,
+                      index=dataframe.index)
 
     @staticmethod
     def eight_red_candles(dataframe, shift=0):
@@ -259,17 +244,8 @@ class StrategyHelper:
         :param shift: shift the pattern by n
         :return:
         """
-        return (
-                (dataframe['open'].shift(shift) > dataframe['close'].shift(shift)) &
-                (dataframe['open'].shift(1 + shift) > dataframe['close'].shift(1 + shift)) &
-                (dataframe['open'].shift(2 + shift) > dataframe['close'].shift(2 + shift)) &
-                (dataframe['open'].shift(3 + shift) > dataframe['close'].shift(3 + shift)) &
-                (dataframe['open'].shift(4 + shift) > dataframe['close'].shift(4 + shift)) &
-                (dataframe['open'].shift(5 + shift) > dataframe['close'].shift(5 + shift)) &
-                (dataframe['open'].shift(6 + shift) > dataframe['close'].shift(6 + shift)) &
-                (dataframe['open'].shift(7 + shift) > dataframe['close'].shift(7 + shift)) &
-                (dataframe['open'].shift(8 + shift) > dataframe['close'].shift(8 + shift))
-        )
+        red = Series(red_run(dataframe['open'], dataframe['close']), index=dataframe.index)
+        return red.shift(shift) >= 9
 
     @staticmethod
     def four_green_one_red_candle(dataframe):
@@ -279,13 +255,9 @@ class StrategyHelper:
         :param dataframe:
         :return:
         """
-        return (
-                (dataframe['open'] > dataframe['close']) &
-                (dataframe['open'].shift(1) < dataframe['close'].shift(1)) &
-                (dataframe['open'].shift(2) < dataframe['close'].shift(2)) &
-                (dataframe['open'].shift(3) < dataframe['close'].shift(3)) &
-                (dataframe['open'].shift(4) < dataframe['close'].shift(4))
-        )
+        green = dataframe['open'] < dataframe['close']
+        red = dataframe['open'] > dataframe['close']
+        return Series(run_before(green, red) >= 4, index=dataframe.index)
 
     @staticmethod
     def four_red_one_green_candle(dataframe):
@@ -295,10 +267,6 @@ class StrategyHelper:
         :param dataframe:
         :return:
         """
-        return (
-                (dataframe['open'] < dataframe['close']) &
-                (dataframe['open'].shift(1) > dataframe['close'].shift(1)) &
-                (dataframe['open'].shift(2) > dataframe['close'].shift(2)) &
-                (dataframe['open'].shift(3) > dataframe['close'].shift(3)) &
-                (dataframe['open'].shift(4) > dataframe['close'].shift(4))
-        )
+        green = dataframe['open'] < dataframe['close']
+        red = dataframe['open'] > dataframe['close']
+        return Series(run_before(red, green) >= 4, index=dataframe.index)
@@ -17,8 +17,9 @@ from freqtrade.strategy import (
 
 # --------------------------------
 # Add your lib to import here
-import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
+from freqtrade_strategies.indicators.momentum import directional_bank
+from freqtrade_strategies.indicators.moving_averages import sma_bank
 
 
 # This class is a sample. Feel free to customize it.
@@ -59,17 +60,18 @@ class FAdxSmaStrategy(IStrategy):
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        # Calculate all adx values
-        for val in self.adx_period.range:
-            dataframe[f"adx_{val}"] = ta.ADX(dataframe, timeperiod=val)
-
-        # Calculate all sma_short values
-        for val in self.sma_short_period.range:
-            dataframe[f"sma_short_{val}"] = ta.SMA(dataframe, timeperiod=val)
+        # Calculate all adx values, sharing true range and directional movement
+        directional = directional_bank(
+            dataframe["high"], dataframe["low"], dataframe["close"], self.adx_period.range
+        )
+        dataframe = directional.adx.assign(dataframe, "adx_{}")
 
-        # Calculate all sma_long values
-        for val in self.sma_long_period.range:
-            dataframe[f"sma_long_{val}"] = ta.SMA(dataframe, timeperiod=val)
+        # Calculate all sma_short and sma_long values from one prefix sum
+        smas = sma_bank(
+            dataframe["close"], [*self.sma_short_period.range, *self.sma_long_period.range]
+        )
+        dataframe = smas.assign(dataframe, "sma_short_{}", self.sma_short_period.range)
+        dataframe = smas.assign(dataframe, "sma_long_{}", self.sma_long_period.range)
 
         return dataframe
 
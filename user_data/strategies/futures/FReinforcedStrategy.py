@@ -20,11 +20,14 @@ from freqtrade.strategy import (
 import talib.abstract as ta
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from freqtrade.exchange import timeframe_to_minutes
-from technical.util import resample_to_interval, resampled_merge
+from technical.util import resampled_merge
+from freqtrade_strategies.data.pyramid import PyramidResampleMixin
+from freqtrade_strategies.indicators.momentum import directional_bank
+from freqtrade_strategies.indicators.moving_averages import ema_bank
 
 
 # This class is a sample. Feel free to customize it.
-class FReinforcedStrategy(IStrategy):
+class FReinforcedStrategy(PyramidResampleMixin, IStrategy):
 
     INTERFACE_VERSION = 3
     timeframe = "5m"
@@ -61,17 +64,18 @@ class FReinforcedStrategy(IStrategy):
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
-        # Calculate all adx values
-        for val in self.adx_period.range:
-            dataframe[f"adx_{val}"] = ta.ADX(dataframe, timeperiod=val)
-
-        # Calculate all ema_short values
-        for val in self.ema_short_period.range:
-            dataframe[f"ema_short_{val}"] = ta.EMA(dataframe, timeperiod=val)
+        # Calculate all adx values, sharing true range and directional movement
+        directional = directional_bank(
+            dataframe["high"], dataframe["low"], dataframe["close"], self.adx_period.range
+        )
+        dataframe = directional.adx.assign(dataframe, "adx_{}")
 
-        # Calculate all ema_long values
-        for val in self.ema_long_period.range:
-            dataframe[f"ema_long_{val}"] = ta.EMA(dataframe, timeperiod=val)
+        # Calculate all ema_short and ema_long values in one pass
+        emas = ema_bank(
+            dataframe["close"], [*self.ema_short_period.range, *self.ema_long_period.range]
+        )
+        dataframe = emas.assign(dataframe, "ema_short_{}", self.ema_short_period.range)
+        dataframe = emas.assign(dataframe, "ema_long_{}", self.ema_long_period.range)
 
         # required for graphing
         bollinger = qtpylib.bollinger_bands(dataframe["close"], window=20, stds=2)
@@ -80,7 +84,7 @@ class FReinforcedStrategy(IStrategy):
         dataframe["bb_middleband"] = bollinger["mid"]
 
         self.resample_interval = timeframe_to_minutes(self.timeframe) * 12
-        dataframe_long = resample_to_interval(dataframe, self.resample_interval)
+        dataframe_long = self.resample_to_interval(dataframe, self.resample_interval, metadata)
         dataframe_long["sma"] = ta.SMA(dataframe_long, timeperiod=50, price="close")
         dataframe = resampled_merge(dataframe, dataframe_long, fill_na=True)
 
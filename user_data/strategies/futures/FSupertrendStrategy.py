@@ -18,8 +18,11 @@ from pandas import DataFrame
 import talib.abstract as ta
 import numpy as np
 
+from freqtrade_strategies.columns import ColumnCompactionMixin
+from freqtrade_strategies.parameters import range_indicators
 
-class FSupertrendStrategy(IStrategy):
+
+class FSupertrendStrategy(ColumnCompactionMixin, IStrategy):
     # Buy params, Sell params, ROI, Stoploss and Trailing Stop are values generated by 'freqtrade hyperopt --strategy Supertrend --hyperopt-loss ShortTradeDurHyperOptLoss --timerange=20210101- --timeframe=1h --spaces all'
     # It's encourage you find the values that better suites your needs and risk management strategies
 
@@ -75,43 +78,14 @@ class FSupertrendStrategy(IStrategy):
     sell_p2 = IntParameter(7, 21, default=10)
     sell_p3 = IntParameter(7, 21, default=10)
 
+    # Each distinct (multiplier, period) is computed once, and only for the current values
+    # outside hyperopt, however many of the six indicators read it.
+    @range_indicators("supertrend_direction", {
+        f"supertrend_{index}_{side}_{{}}_{{}}": (f"{side}_m{index}", f"{side}_p{index}")
+        for side in ("buy", "sell")
+        for index in (1, 2, 3)
+    })
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        for multiplier in self.buy_m1.range:
-            for period in self.buy_p1.range:
-                dataframe[f"supertrend_1_buy_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
-
-        for multiplier in self.buy_m2.range:
-            for period in self.buy_p2.range:
-                dataframe[f"supertrend_2_buy_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
-
-        for multiplier in self.buy_m3.range:
-            for period in self.buy_p3.range:
-                dataframe[f"supertrend_3_buy_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
-
-        for multiplier in self.sell_m1.range:
-            for period in self.sell_p1.range:
-                dataframe[f"supertrend_1_sell_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
-
-        for multiplier in self.sell_m2.range:
-            for period in self.sell_p2.range:
-                dataframe[f"supertrend_2_sell_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
-
-        for multiplier in self.sell_m3.range:
-            for period in self.sell_p3.range:
-                dataframe[f"supertrend_3_sell_{multiplier}_{period}"] = self.supertrend(
-                    dataframe, multiplier, period
-                )["STX"]
-
         return dataframe
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
@@ -183,6 +157,9 @@ class FSupertrendStrategy(IStrategy):
 
         return dataframe
 
+    def supertrend_direction(self, dataframe: DataFrame, multiplier, period):
+        return self.supertrend(dataframe, multiplier, period)["STX"]
+
     """
         Supertrend Indicator; adapted for freqtrade
         from: https://github.com/freqtrade/freqtrade-strategies/issues/30
@@ -198,52 +175,45 @@ class FSupertrendStrategy(IStrategy):
         stx = "STX_" + str(period) + "_" + str(multiplier)
 
         # Compute basic upper and lower bands
-        df["basic_ub"] = (df["high"] + df["low"]) / 2 + multiplier * df["ATR"]
-        df["basic_lb"] = (df["high"] + df["low"]) / 2 - multiplier * df["ATR"]
-
-        # Compute final upper and lower bands
-        df["final_ub"] = 0.00
-        df["final_lb"] = 0.00
+        basic_ub = ((df["high"] + df["low"]) / 2 + multiplier * df["ATR"]).to_numpy()
+        basic_lb = ((df["high"] + df["low"]) / 2 - multiplier * df["ATR"]).to_numpy()
+        close = df["close"].to_numpy()
+
+        # Compute final upper and lower bands. The recursions run on numpy arrays: writes
+        # through df[column].iat[i] are lost under copy-on-write.
+        final_ub = np.zeros(len(df))
+        final_lb = np.zeros(len(df))
         for i in range(period, len(df)):
-            df["final_ub"].iat[i] = (
-                df["basic_ub"].iat[i]
-                if df["basic_ub"].iat[i] < df["final_ub"].iat[i - 1]
-                or df["close"].iat[i - 1] > df["final_ub"].iat[i - 1]
-                else df["final_ub"].iat[i - 1]
+            final_ub[i] = (
+                basic_ub[i]
+                if basic_ub[i] < final_ub[i - 1] or close[i - 1] > final_ub[i - 1]
+                else final_ub[i - 1]
             )
-            df["final_lb"].iat[i] = (
-                df["basic_lb"].iat[i]
-                if df["basic_lb"].iat[i] > df["final_lb"].iat[i - 1]
-                or df["close"].iat[i - 1] < df["final_lb"].iat[i - 1]
-                else df["final_lb"].iat[i - 1]
+            final_lb[i] = (
+                basic_lb[i]
+                if basic_lb[i] > final_lb[i - 1] or close[i - 1] < final_lb[i - 1]
+                else final_lb[i - 1]
             )
 
         # Set the Supertrend value
-        df[st] = 0.00
+        supertrend = np.zeros(len(df))
         for i in range(period, len(df)):
-            df[st].iat[i] = (
-                df["final_ub"].iat[i]
-                if df[st].iat[i - 1] == df["final_ub"].iat[i - 1]
-                and df["close"].iat[i] <= df["final_ub"].iat[i]
-                else df["final_lb"].iat[i]
-                if df[st].iat[i - 1] == df["final_ub"].iat[i - 1]
-                and df["close"].iat[i] > df["final_ub"].iat[i]
-                else df["final_lb"].iat[i]
-                if df[st].iat[i - 1] == df["final_lb"].iat[i - 1]
-                and df["close"].iat[i] >= df["final_lb"].iat[i]
-                else df["final_ub"].iat[i]
-                if df[st].iat[i - 1] == df["final_lb"].iat[i - 1]
-                and df["close"].iat[i] < df["final_lb"].iat[i]
+            supertrend[i] = (
+                final_ub[i]
+                if supertrend[i - 1] == final_ub[i - 1] and close[i] <= final_ub[i]
+                else final_lb[i]
+                if supertrend[i - 1] == final_ub[i - 1] and close[i] > final_ub[i]
+                else final_lb[i]
+                if supertrend[i - 1] == final_lb[i - 1] and close[i] >= final_lb[i]
+                else final_ub[i]
+                if supertrend[i - 1] == final_lb[i - 1] and close[i] < final_lb[i]
                 else 0.00
             )
-        # Mark the trend direction up/down
+        df[st] = supertrend
+        # Mark the trend direction up/down; undefined directions stay missing
         df[stx] = np.where(
             (df[st] > 0.00), np.where((df["close"] < df[st]), "down", "up"), None
         )
-
-        # Remove basic and final bands from the columns
-        df.drop(["basic_ub", "basic_lb", "final_ub", "final_lb"], inplace=True, axis=1)
-
-        df.fillna(0, inplace=True)
+        df[st] = df[st].fillna(0)
 
         return DataFrame(index=df.index, data={"ST": df[st], "STX": df[stx]})
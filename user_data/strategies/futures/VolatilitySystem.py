@@ -15,10 +15,17 @@ from freqtrade.strategy import (CategoricalParameter, DecimalParameter,
 from freqtrade.exchange import date_minus_candles
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 
-from technical.util import resample_to_interval, resampled_merge
+from technical.util import resampled_merge
 
+from freqtrade_strategies.data.pyramid import PyramidResampleMixin
+from freqtrade_strategies.instrumentation.callbacks import (CallbackLatencyMixin,
+                                                            timed_callback)
+from freqtrade_strategies.columns import ColumnCompactionMixin
+from freqtrade_strategies.instrumentation.indicators import IndicatorProfilingMixin
 
-class VolatilitySystem(IStrategy):
+
+class VolatilitySystem(PyramidResampleMixin, IndicatorProfilingMixin, ColumnCompactionMixin,
+                       CallbackLatencyMixin, IStrategy):
     """
     Volatility System strategy.
     Based on https://www.tradingview.com/script/3hhs0XbR/
@@ -57,7 +64,7 @@ class VolatilitySystem(IStrategy):
         are worth adding.
         """
         resample_int = 60 * 3
-        resampled = resample_to_interval(dataframe, resample_int)
+        resampled = self.resample_to_interval(dataframe, resample_int, metadata)
         # Average True Range (ATR)
         resampled['atr'] = ta.ATR(resampled, timeperiod=14) * 2.0
         # Absolute close change
@@ -108,6 +115,7 @@ class VolatilitySystem(IStrategy):
             'exit_long'] = 1
         return dataframe
 
+    @timed_callback
     def custom_stake_amount(self, pair: str, current_time: datetime, current_rate: float,
                             proposed_stake: float, min_stake: Optional[float], max_stake: float,
                             leverage: float, entry_tag: Optional[str], side: str,
@@ -117,6 +125,7 @@ class VolatilitySystem(IStrategy):
 
     position_adjustment_enable = True
 
+    @timed_callback
     def adjust_trade_position(self, trade: Trade, current_time: datetime,
                               current_rate: float, current_profit: float,
                               min_stake: Optional[float], max_stake: float,
@@ -139,6 +148,7 @@ class VolatilitySystem(IStrategy):
                 return trade.stake_amount
         return None
 
+    @timed_callback
     def leverage(self, pair: str, current_time: datetime, current_rate: float,
                  proposed_leverage: float, max_leverage: float, side: str,
                  **kwargs) -> float:
@@ -15,10 +15,17 @@ from freqtrade.strategy import (CategoricalParameter, DecimalParameter,
 from freqtrade.exchange import date_minus_candles
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 
-from technical.util import resample_to_interval, resampled_merge
+from technical.util import resampled_merge
 
+from freqtrade_strategies.data.pyramid import PyramidResampleMixin
+from freqtrade_strategies.instrumentation.callbacks import (CallbackLatencyMixin,
+                                                            timed_callback)
+from freqtrade_strategies.columns import ColumnCompactionMixin
+from freqtrade_strategies.indicators.volatility import rolling_moments
 
-class VolatilitySystemV13_Opt1(IStrategy):
+
+class VolatilitySystemV13_Opt1(PyramidResampleMixin, ColumnCompactionMixin, CallbackLatencyMixin,
+                               IStrategy):
     """
     V13-Opt1: 加仓质量控制 — adjust_trade_position 中也要求 MACD 夹角 < 100°
     
@@ -55,7 +62,7 @@ class VolatilitySystemV13_Opt1(IStrategy):
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # 3H 重采样（与 V7-E 一致）
         resample_int = 60 * 3
-        resampled = resample_to_interval(dataframe, resample_int)
+        resampled = self.resample_to_interval(dataframe, resample_int, metadata)
         resampled['atr'] = ta.ATR(resampled, timeperiod=14) * 2.0
         resampled['close_change'] = resampled['close'].diff()
         dataframe = resampled_merge(dataframe, resampled, fill_na=True)
@@ -75,8 +82,9 @@ class VolatilitySystemV13_Opt1(IStrategy):
         dataframe['vwap'] = qtpylib.rolling_vwap(dataframe, window=14)
         dataframe['high_volume'] = dataframe['volume'] > dataframe['volume_ma']
 
-        dataframe['atr_std'] = dataframe['atr_local'].rolling(window=20).std()
-        dataframe['atr_ma'] = dataframe['atr_local'].rolling(window=20).mean()
+        atr_moments = rolling_moments(dataframe['atr_local'], [20])
+        dataframe['atr_std'] = atr_moments.std[20]
+        dataframe['atr_ma'] = atr_moments.mean[20]
         dataframe['volatility_spike'] = dataframe['atr_local'] > (dataframe['atr_ma'] + 2 * dataframe['atr_std'])
 
         # 市场状态分类（与 V7-E 一致）
@@ -232,6 +240,7 @@ class VolatilitySystemV13_Opt1(IStrategy):
 
         return dataframe
 
+    @timed_callback
     def custom_stake_amount(self, pair: str, current_time: datetime, current_rate: float,
                             proposed_stake: float, min_stake: Optional[float], max_stake: float,
                             leverage: float, entry_tag: Optional[str], side: str,
@@ -253,6 +262,7 @@ class VolatilitySystemV13_Opt1(IStrategy):
 
     position_adjustment_enable = True
 
+    @timed_callback
     def adjust_trade_position(self, trade: Trade, current_time: datetime,
                               current_rate: float, current_profit: float,
                               min_stake: Optional[float], max_stake: float,
@@ -294,6 +304,7 @@ class VolatilitySystemV13_Opt1(IStrategy):
 
         return None
 
+    @timed_callback
     def leverage(self, pair: str, current_time: datetime, current_rate: float,
                  proposed_leverage: float, max_leverage: float, side: str,
                  **kwargs) -> float:
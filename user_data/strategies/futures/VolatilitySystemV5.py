@@ -2,7 +2,7 @@
 # isort: skip_file
 # --- Do not remove these libs ---
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 import numpy as np  # noqa
 import pandas as pd  # noqa
@@ -15,10 +15,20 @@ from freqtrade.strategy import (CategoricalParameter, DecimalParameter,
 from freqtrade.exchange import date_minus_candles
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 
-from technical.util import resample_to_interval, resampled_merge
+from technical.util import resampled_merge
 
+from freqtrade_strategies.data.pyramid import PyramidResampleMixin
+from freqtrade_strategies.instrumentation.callbacks import (CallbackLatencyMixin,
+                                                            timed_callback)
+from freqtrade_strategies.columns import ColumnCompactionMixin
+from freqtrade_strategies.indicators.momentum import adx, rsi
+from freqtrade_strategies.indicators.moving_averages import ema, sma
+from freqtrade_strategies.indicators.panel import Panel, PanelIndicatorsMixin
+from freqtrade_strategies.indicators.volatility import atr, rolling_moments
 
-class VolatilitySystemV5(IStrategy):
+
+class VolatilitySystemV5(PyramidResampleMixin, PanelIndicatorsMixin, ColumnCompactionMixin,
+                         CallbackLatencyMixin, IStrategy):
     """
     Volatility System V5 - Advanced Market Microstructure
     
@@ -51,12 +61,26 @@ class VolatilitySystemV5(IStrategy):
     # Optimal ticker interval for the strategy
     timeframe = '1h'
 
+    def populate_panel_indicators(self, panel: Panel) -> Dict[str, np.ndarray]:
+        """
+        Trend, EMA and volume indicators of every whitelisted pair, one call per indicator
+        """
+        return {
+            'atr_local': atr(panel.high, panel.low, panel.close, 14),
+            'adx': adx(panel.high, panel.low, panel.close, 14),
+            'rsi': rsi(panel.close, 14),
+            'ema_20': ema(panel.close, 20),
+            'ema_50': ema(panel.close, 50),
+            'ema_200': ema(panel.close, 200),
+            'volume_ma': sma(panel.volume, 20),
+        }
+
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Advanced indicators including Volume and Volatility Clustering
         """
         resample_int = 60 * 3
-        resampled = resample_to_interval(dataframe, resample_int)
+        resampled = self.resample_to_interval(dataframe, resample_int, metadata)
         
         # Average True Range (ATR)
         resampled['atr'] = ta.ATR(resampled, timeperiod=14) * 2.0
@@ -67,20 +91,11 @@ class VolatilitySystemV5(IStrategy):
         dataframe['atr'] = dataframe[f'resample_{resample_int}_atr']
         dataframe['close_change'] = dataframe[f'resample_{resample_int}_close_change']
         
-        # === 1. Basic Trend Indicators ===
-        dataframe['atr_local'] = ta.ATR(dataframe, timeperiod=14)
-        dataframe['adx'] = ta.ADX(dataframe, timeperiod=14)
-        dataframe['rsi'] = ta.RSI(dataframe, timeperiod=14)
-        
-        # EMAs
-        dataframe['ema_20'] = ta.EMA(dataframe, timeperiod=20)
-        dataframe['ema_50'] = ta.EMA(dataframe, timeperiod=50)
-        dataframe['ema_200'] = ta.EMA(dataframe, timeperiod=200)
+        # === 1. Basic Trend Indicators, EMAs and Volume MA ===
+        # Computed for the whole whitelist at once, see populate_panel_indicators
+        dataframe = self.merge_panel_indicators(dataframe, metadata)
         
         # === 2. Volume Analysis ===
-        # Volume MA
-        dataframe['volume_ma'] = ta.SMA(dataframe, timeperiod=20, price='volume')
-        
         # VWAP (Approximation)
         dataframe['vwap'] = qtpylib.rolling_vwap(dataframe, window=14)
         
@@ -90,8 +105,9 @@ class VolatilitySystemV5(IStrategy):
         
         # === 3. Volatility Clustering ===
         # Calculate standard deviation of ATR to detect volatility spikes
-        dataframe['atr_std'] = dataframe['atr_local'].rolling(window=20).std()
-        dataframe['atr_ma'] = dataframe['atr_local'].rolling(window=20).mean()
+        atr_moments = rolling_moments(dataframe['atr_local'], [20])
+        dataframe['atr_std'] = atr_moments.std[20]
+        dataframe['atr_ma'] = atr_moments.mean[20]
         
         # Volatility Spike: ATR is 2 standard deviations above mean
         dataframe['volatility_spike'] = dataframe['atr_local'] > (dataframe['atr_ma'] + 2 * dataframe['atr_std'])
@@ -220,6 +236,7 @@ class VolatilitySystemV5(IStrategy):
             
         return dataframe
 
+    @timed_callback
     def custom_stake_amount(self, pair: str, current_time: datetime, current_rate: float,
                             proposed_stake: float, min_stake: Optional[float], max_stake: float,
                             leverage: float, entry_tag: Optional[str], side: str,
@@ -228,6 +245,7 @@ class VolatilitySystemV5(IStrategy):
 
     position_adjustment_enable = True
 
+    @timed_callback
     def adjust_trade_position(self, trade: Trade, current_time: datetime,
                               current_rate: float, current_profit: float,
                               min_stake: Optional[float], max_stake: float,
@@ -250,6 +268,7 @@ class VolatilitySystemV5(IStrategy):
                 return trade.stake_amount
         return None
         
+    @timed_callback
     def custom_stoploss(self, pair: str, trade: Trade, current_time: datetime,
                         current_rate: float, current_profit: float, **kwargs) -> float:
         """
@@ -270,6 +289,7 @@ class VolatilitySystemV5(IStrategy):
         # Default fallback
         return -0.10
 
+    @timed_callback
     def leverage(self, pair: str, current_time: datetime, current_rate: float,
                  proposed_leverage: float, max_leverage: float, side: str,
                  **kwargs) -> float:
@@ -15,10 +15,17 @@ from freqtrade.strategy import (CategoricalParameter, DecimalParameter,
 from freqtrade.exchange import date_minus_candles
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 
-from technical.util import resample_to_interval, resampled_merge
+from technical.util import resampled_merge
 
+from freqtrade_strategies.data.pyramid import PyramidResampleMixin
+from freqtrade_strategies.instrumentation.callbacks import (CallbackLatencyMixin,
+                                                            timed_callback)
+from freqtrade_strategies.columns import ColumnCompactionMixin
+from freqtrade_strategies.indicators.volatility import rolling_moments
 
-class VolatilitySystemV5_Opt2(IStrategy):
+
+class VolatilitySystemV5_Opt2(PyramidResampleMixin, ColumnCompactionMixin, CallbackLatencyMixin,
+                              IStrategy):
     """
     Volatility System V5 - Optimization 2: Short Position Exit Optimization
     
@@ -53,7 +60,7 @@ class VolatilitySystemV5_Opt2(IStrategy):
         Advanced indicators including Volume and Volatility Clustering
         """
         resample_int = 60 * 3
-        resampled = resample_to_interval(dataframe, resample_int)
+        resampled = self.resample_to_interval(dataframe, resample_int, metadata)
         
         # Average True Range (ATR)
         resampled['atr'] = ta.ATR(resampled, timeperiod=14) * 2.0
@@ -87,8 +94,9 @@ class VolatilitySystemV5_Opt2(IStrategy):
         
         # === 3. Volatility Clustering ===
         # Calculate standard deviation of ATR to detect volatility spikes
-        dataframe['atr_std'] = dataframe['atr_local'].rolling(window=20).std()
-        dataframe['atr_ma'] = dataframe['atr_local'].rolling(window=20).mean()
+        atr_moments = rolling_moments(dataframe['atr_local'], [20])
+        dataframe['atr_std'] = atr_moments.std[20]
+        dataframe['atr_ma'] = atr_moments.mean[20]
         
         # Volatility Spike: ATR is 2 standard deviations above mean
         dataframe['volatility_spike'] = dataframe['atr_local'] > (dataframe['atr_ma'] + 2 * dataframe['atr_std'])
@@ -236,6 +244,7 @@ class VolatilitySystemV5_Opt2(IStrategy):
             
         return dataframe
 
+    @timed_callback
     def custom_stake_amount(self, pair: str, current_time: datetime, current_rate: float,
                             proposed_stake: float, min_stake: Optional[float], max_stake: float,
                             leverage: float, entry_tag: Optional[str], side: str,
@@ -244,6 +253,7 @@ class VolatilitySystemV5_Opt2(IStrategy):
 
     position_adjustment_enable = True
 
+    @timed_callback
     def adjust_trade_position(self, trade: Trade, current_time: datetime,
                               current_rate: float, current_profit: float,
                               min_stake: Optional[float], max_stake: float,
@@ -266,6 +276,7 @@ class VolatilitySystemV5_Opt2(IStrategy):
                 return trade.stake_amount
         return None
         
+    @timed_callback
     def custom_stoploss(self, pair: str, trade: Trade, current_time: datetime,
                         current_rate: float, current_profit: float, **kwargs) -> float:
         """
@@ -286,6 +297,7 @@ class VolatilitySystemV5_Opt2(IStrategy):
         # Default fallback
         return -0.10
 
+    @timed_callback
     def leverage(self, pair: str, current_time: datetime, current_rate: float,
                  proposed_leverage: float, max_leverage: float, side: str,
                  **kwargs) -> float:
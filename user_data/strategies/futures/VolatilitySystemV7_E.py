@@ -15,10 +15,17 @@ from freqtrade.strategy import (CategoricalParameter, DecimalParameter,
 from freqtrade.exchange import date_minus_candles
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 
-from technical.util import resample_to_interval, resampled_merge
+from technical.util import resampled_merge
 
+from freqtrade_strategies.data.pyramid import PyramidResampleMixin
+from freqtrade_strategies.instrumentation.callbacks import (CallbackLatencyMixin,
+                                                            timed_callback)
+from freqtrade_strategies.columns import ColumnCompactionMixin
+from freqtrade_strategies.indicators.volatility import rolling_moments
 
-class VolatilitySystemV7_E(IStrategy):
+
+class VolatilitySystemV7_E(PyramidResampleMixin, ColumnCompactionMixin, CallbackLatencyMixin,
+                           IStrategy):
     """
     V7-E: 最佳组合 — V7-A(出场放宽) + V7-B(动态仓位)
     
@@ -42,7 +49,7 @@ class VolatilitySystemV7_E(IStrategy):
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         resample_int = 60 * 3
-        resampled = resample_to_interval(dataframe, resample_int)
+        resampled = self.resample_to_interval(dataframe, resample_int, metadata)
         resampled['atr'] = ta.ATR(resampled, timeperiod=14) * 2.0
         resampled['close_change'] = resampled['close'].diff()
         dataframe = resampled_merge(dataframe, resampled, fill_na=True)
@@ -61,8 +68,9 @@ class VolatilitySystemV7_E(IStrategy):
         dataframe['vwap'] = qtpylib.rolling_vwap(dataframe, window=14)
         dataframe['high_volume'] = dataframe['volume'] > dataframe['volume_ma']
         
-        dataframe['atr_std'] = dataframe['atr_local'].rolling(window=20).std()
-        dataframe['atr_ma'] = dataframe['atr_local'].rolling(window=20).mean()
+        atr_moments = rolling_moments(dataframe['atr_local'], [20])
+        dataframe['atr_std'] = atr_moments.std[20]
+        dataframe['atr_ma'] = atr_moments.mean[20]
         dataframe['volatility_spike'] = dataframe['atr_local'] > (dataframe['atr_ma'] + 2 * dataframe['atr_std'])
         
         dataframe['ema_slope'] = (dataframe['ema_20'] - dataframe['ema_20'].shift(5)) / dataframe['ema_20'].shift(5) * 100
@@ -169,6 +177,7 @@ class VolatilitySystemV7_E(IStrategy):
             
         return dataframe
 
+    @timed_callback
     def custom_stake_amount(self, pair: str, current_time: datetime, current_rate: float,
                             proposed_stake: float, min_stake: Optional[float], max_stake: float,
                             leverage: float, entry_tag: Optional[str], side: str,
@@ -192,6 +201,7 @@ class VolatilitySystemV7_E(IStrategy):
 
     position_adjustment_enable = True
 
+    @timed_callback
     def adjust_trade_position(self, trade: Trade, current_time: datetime,
                               current_rate: float, current_profit: float,
                               min_stake: Optional[float], max_stake: float,
@@ -214,6 +224,7 @@ class VolatilitySystemV7_E(IStrategy):
                 return trade.stake_amount
         return None
         
+    @timed_callback
     def custom_stoploss(self, pair: str, trade: Trade, current_time: datetime,
                         current_rate: float, current_profit: float, **kwargs) -> float:
         dataframe, _ = self.dp.get_analyzed_dataframe(pair, self.timeframe)
@@ -225,6 +236,7 @@ class VolatilitySystemV7_E(IStrategy):
                 return -0.15
         return -0.10
 
+    @timed_callback
     def leverage(self, pair: str, current_time: datetime, current_rate: float,
                  proposed_leverage: float, max_leverage: float, side: str,
                  **kwargs) -> float:
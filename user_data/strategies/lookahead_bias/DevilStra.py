@@ -25,6 +25,8 @@ from freqtrade.strategy import CategoricalParameter, IStrategy
 from numpy.lib import math
 from pandas import DataFrame
 
+from freqtrade_strategies.columns import ColumnCompactionMixin
+
 # ########################## SETTINGS ##############################
 # pairlist lenght(use exact count of pairs you used in whitelist size+1):
 PAIR_LIST_LENGHT = 269
@@ -532,7 +534,7 @@ def condition_generator(dataframe, operator, indicator, crossed_indicator, real_
     return condition, dataframe
 
 
-class DevilStra(IStrategy):
+class DevilStra(ColumnCompactionMixin, IStrategy):
     # #################### RESULT PASTE PLACE ####################
     # 16/16:    108 trades. 75/18/15 Wins/Draws/Losses. Avg profit   7.77%. Median profit   8.89%. Total profit  0.08404983 BTC (  84.05Σ%). Avg duration 3 days, 6:49:00 min. Objective: -11.22849
 
@@ -16,11 +16,12 @@ from pandas import DataFrame
 # Add your lib to import here
 # import talib.abstract as ta
 import pandas as pd
-import ta
-from ta.utils import dropna
+from freqtrade_strategies.imports import lazy_import
+ta = lazy_import('ta')
 import freqtrade.vendor.qtpylib.indicators as qtpylib
 from functools import reduce
 import numpy as np
+from freqtrade_strategies.indicators.extrema import ichimoku_lines
 
 
 class Zeus(IStrategy):
@@ -72,13 +73,11 @@ class Zeus(IStrategy):
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # Add all ta features
 
-        dataframe['trend_ichimoku_base'] = ta.trend.ichimoku_base_line(
+        _, dataframe['trend_ichimoku_base'] = ichimoku_lines(
             dataframe['high'],
             dataframe['low'],
             window1=9,
-            window2=26,
-            visual=False,
-            fillna=False
+            window2=26
         )
         KST = ta.trend.KSTIndicator(
             close=dataframe['close'],
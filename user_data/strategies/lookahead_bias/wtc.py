@@ -22,7 +22,8 @@ from pandas import DataFrame
 # --- Do not remove these libs ---
 import numpy as np  # noqa
 import pandas as pd  # noqa
-from sklearn import preprocessing
+from freqtrade_strategies.imports import lazy_import
+preprocessing = lazy_import('sklearn.preprocessing')
 
 # --------------------------------
 # Add your lib to import here
@@ -9,7 +9,7 @@ from pandas import DataFrame
 # --------------------------------
 
 # Add your lib to import here
-import talib.abstract as ta
+from freqtrade_strategies.indicators.moving_averages import sma_bank
 
 
 class mabStra(IStrategy):
@@ -49,20 +49,17 @@ class mabStra(IStrategy):
         0, 2, decimals=4, default=2.81436, space='sell')
 
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        # SMA - ex Moving Average
-        dataframe['buy-mojoMA'] = ta.SMA(dataframe,
-                                         timeperiod=self.buy_mojo_ma_timeframe.value)
-        dataframe['buy-fastMA'] = ta.SMA(dataframe,
-                                         timeperiod=self.buy_fast_ma_timeframe.value)
-        dataframe['buy-slowMA'] = ta.SMA(dataframe,
-                                         timeperiod=self.buy_slow_ma_timeframe.value)
-        dataframe['sell-mojoMA'] = ta.SMA(dataframe,
-                                          timeperiod=self.sell_mojo_ma_timeframe.value)
-        dataframe['sell-fastMA'] = ta.SMA(dataframe,
-                                          timeperiod=self.sell_fast_ma_timeframe.value)
-        dataframe['sell-slowMA'] = ta.SMA(dataframe,
-                                          timeperiod=self.sell_slow_ma_timeframe.value)
-        return dataframe
+        # SMA - ex Moving Average, all six from one prefix sum
+        columns = {
+            'buy-mojoMA': self.buy_mojo_ma_timeframe.value,
+            'buy-fastMA': self.buy_fast_ma_timeframe.value,
+            'buy-slowMA': self.buy_slow_ma_timeframe.value,
+            'sell-mojoMA': self.sell_mojo_ma_timeframe.value,
+            'sell-fastMA': self.sell_fast_ma_timeframe.value,
+            'sell-slowMA': self.sell_slow_ma_timeframe.value,
+        }
+        smas = sma_bank(dataframe['close'], columns.values())
+        return smas.assign(dataframe, columns)
 
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
 
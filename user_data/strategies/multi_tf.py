@@ -5,16 +5,18 @@ from freqtrade.strategy import (IStrategy, informative)
 from pandas import DataFrame, Series
 import talib.abstract as ta
 import math
-import pandas_ta as pta
 # from finta import TA as fta
 import logging
 from logging import FATAL
 
+from freqtrade_strategies.informative import MarketContextMixin
+
 logger = logging.getLogger(__name__)
 
 # NOT TO BE USED FOR LIVE!!!!!!
 
-class multi_tf (IStrategy):
+# MarketContextMixin populates the BTC/ETH informative pairs once for all traded pairs.
+class multi_tf (MarketContextMixin, IStrategy):
 
     def version(self) -> str:
         return "v1"